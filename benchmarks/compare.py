@@ -0,0 +1,81 @@
+"""Compare two benchmark result files produced by ``benchmarks.run``."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+# Metrics where larger numbers are better; every other numeric metric is a latency.
+_HIGHER_IS_BETTER = ("runs_per_second", "load_records_per_second")
+
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    """Flatten nested result dictionaries into ``a.b.c`` metric names."""
+    flat: dict[str, float] = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[tuple[str, float, float, float, bool]]:
+    """Return ``(metric, base, head, change, regressed)`` rows for metrics present in both runs."""
+    base_flat = flatten(base.get("results", {}))
+    head_flat = flatten(head.get("results", {}))
+    rows = []
+    for metric in sorted(base_flat.keys() & head_flat.keys()):
+        if metric.endswith(".count") or metric.endswith(".calls") or metric.endswith("iterations"):
+            continue
+        before, after = base_flat[metric], head_flat[metric]
+        change = (after - before) / before if before else 0.0
+        higher_is_better = metric.endswith(_HIGHER_IS_BETTER)
+        regressed = change < -threshold if higher_is_better else change > threshold
+        rows.append((metric, before, after, change, regressed))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON files.")
+    parser.add_argument("base", help="Baseline results (e.g., from main)")
+    parser.add_argument("head", help="Candidate results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative change treated as a regression (default 0.10 = 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    head = json.loads(Path(args.head).read_text(encoding="utf-8"))
+    rows = compare(base, head, args.threshold)
+
+    console = Console()
+    table = Table(
+        title=f"{base.get('meta', {}).get('commit') or args.base} → {head.get('meta', {}).get('commit') or args.head}"
+    )
+    table.add_column("Metric", style="bold")
+    table.add_column("Base", justify="right")
+    table.add_column("Head", justify="right")
+    table.add_column("Change", justify="right")
+    for metric, before, after, change, regressed in rows:
+        style = "red" if regressed else ("green" if abs(change) > args.threshold else "")
+        table.add_row(metric, f"{before:.3f}", f"{after:.3f}", f"[{style}]{change:+.1%}[/{style}]" if style else f"{change:+.1%}")
+    console.print(table)
+
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        console.print(f"[red]{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}.[/red]")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
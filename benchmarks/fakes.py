@@ -0,0 +1,177 @@
+"""Deterministic offline stand-ins for the chat model, embedder and web search session."""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+import time
+from typing import Any, Iterable
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+from srl_agents.context_packer import approximate_tokens
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_RULE = re.compile(r"^Rule (\d+):", re.MULTILINE)
+
+
+def _last_user_text(messages: list[BaseMessage]) -> str:
+    for message in reversed(messages):
+        if message.type == "human":
+            return str(message.content)
+    return str(messages[-1].content) if messages else ""
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers every prompt deterministically, optionally with simulated latency.
+
+    ``with_structured_output`` is supported for the SRL schemas so the full graph can
+    run offline; responses go through the regular LangChain callback path and report
+    ``usage_metadata`` so profiling and caching behave as with a real provider.
+    """
+
+    latency_ms: float = 0.0
+    decision: str = "APPROVE"
+    impact_score: int = 4
+
+    @property
+    def _llm_type(self) -> str:
+        return "srl-fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"latency_ms": self.latency_ms, "decision": self.decision}
+
+    def with_structured_output(self, schema, **kwargs):  # type: ignore[override]
+        bound = self.bind(response_schema=schema.__name__)
+        return bound | RunnableLambda(lambda message: schema.model_validate_json(message.content))
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager=None,
+        response_schema: str | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        prompt = "\n".join(str(message.content) for message in messages)
+        content = self._respond(response_schema, _last_user_text(messages))
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": approximate_tokens(prompt),
+                "output_tokens": approximate_tokens(content),
+                "total_tokens": approximate_tokens(prompt) + approximate_tokens(content),
+            },
+            response_metadata={"model_name": self._llm_type},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _respond(self, schema: str | None, user_text: str) -> str:
+        subject = " ".join(_TOKEN.findall(user_text)[:12]) or "the question"
+        if schema in ("LearningContext", "FusedLearningContext"):
+            payload = {
+                "learning_goal": f"Understand {subject}",
+                "success_criteria": f"Can explain {subject} with an example",
+                "prior_knowledge": "Knows the basics",
+            }
+            if schema == "FusedLearningContext":
+                payload["search_query"] = subject
+        elif schema == "ActorOutput":
+            payload = {
+                "thoughts": [f"[GOAL] Address {subject}", "[MEMORY] Reuse prior rules"],
+                "answer": f"Here is how to approach {subject}.",
+            }
+        elif schema == "ReflectionOutput":
+            payload = {
+                "topic": "General",
+                "insight": f"Break down {subject} into steps",
+                "reasoning": "Structured steps transfer to similar questions",
+                "should_store": True,
+            }
+        elif schema == "CriticOutput":
+            payload = {"decision": self.decision, "feedback": "", "impact_score": self.impact_score}
+        elif schema == "CriticBatchOutput":
+            payload = {
+                "reviews": [
+                    {"index": int(index), "decision": self.decision, "feedback": "", "impact_score": self.impact_score}
+                    for index in _RULE.findall(user_text)
+                ]
+            }
+        elif schema is None:
+            return subject
+        else:
+            raise ValueError(f"FakeChatModel has no canned response for schema {schema!r}")
+        return json.dumps(payload)
+
+
+class HashingEmbedder(Embeddings):
+    """Bag-of-words feature-hashing embedder producing unit-length vectors.
+
+    Texts sharing vocabulary land close together, so retrieval quality comparisons
+    remain meaningful offline.
+    """
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+        self.calls = 0
+
+    def embed_query(self, text: str) -> list[float]:
+        self.calls += 1
+        return self._embed(text)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for token in _TOKEN.findall(text.lower()):
+            digest = _digest(token)
+            vector[digest % self.dimensions] += 1.0 if (digest >> 32) & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector))
+        if not norm:
+            vector[_digest(text) % self.dimensions] = 1.0
+            return vector
+        return [value / norm for value in vector]
+
+
+class FakeSearchSession:
+    """Context-managed stand-in for ``DDGS`` returning synthetic hits."""
+
+    def __init__(self, results: int = 5, latency_ms: float = 0.0):
+        self.results = results
+        self.latency_ms = latency_ms
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def text(self, query: str, *, max_results: int) -> Iterable[dict]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        slug = "-".join(_TOKEN.findall(query.lower())[:4]) or "query"
+        return [
+            {
+                "title": f"Result {idx} for {query}",
+                "href": f"https://example.com/{slug}/{idx}",
+                "body": f"Synthetic snippet {idx} discussing {query}. " * 6,
+            }
+            for idx in range(min(max_results, self.results))
+        ]
+
+
+__all__ = ["FakeChatModel", "FakeSearchSession", "HashingEmbedder"]
@@ -0,0 +1,168 @@
+"""Sweep HNSW parameters for the memory collection: recall@k against query latency.
+
+Synthetic clustered unit vectors are loaded into a real local Chroma collection
+per ``(M, ef_construction)`` pair; the collection is then reopened through
+``MemoryStore`` with each ``ef_search`` value and scored against exact
+(brute-force) neighbours.
+
+Usage::
+
+    python -m benchmarks.hnsw_sweep                               # 20k vectors, default grid
+    python -m benchmarks.hnsw_sweep --size 200000 --m 16,32 --ef-search 20,50,100,200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+from chromadb import PersistentClient
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.run import latency_stats
+from srl_agents.memory import MemoryStore
+from srl_agents.vector_index import SPACES, HnswSettings
+
+progress = Console(stderr=True)
+
+
+def synthetic_vectors(
+    size: int, queries: int, dimensions: int, *, clusters: int = 32, seed: int = 7
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return unit-length ``(corpus, queries)`` drawn around shared cluster centres."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dimensions))
+
+    def sample(count: int) -> np.ndarray:
+        vectors = centres[rng.integers(0, clusters, count)] + 0.6 * rng.standard_normal((count, dimensions))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors.astype(np.float32)
+
+    return sample(size), sample(queries)
+
+
+def exact_neighbours(corpus: np.ndarray, queries: np.ndarray, k: int) -> list[set[int]]:
+    # Unit vectors: cosine, inner-product and L2 orderings coincide.
+    scores = queries @ corpus.T
+    top = np.argpartition(-scores, kth=min(k, corpus.shape[0] - 1), axis=1)[:, :k]
+    return [set(row.tolist()) for row in top]
+
+
+def _open(path: str, settings: HnswSettings):
+    # A loaded HNSW segment keeps the ef_search it was opened with, so each setting
+    # reopens the collection the way a fresh process would (MemoryStore applies it).
+    PersistentClient(path=path).clear_system_cache()
+    return MemoryStore(
+        embedder=None,
+        client=PersistentClient(path=path),
+        collection_name="hnsw-sweep",
+        hnsw=settings,
+    ).collection
+
+
+def sweep(
+    *,
+    size: int = 20000,
+    queries: int = 200,
+    dimensions: int = 128,
+    k: int = 3,
+    space: str = "cosine",
+    m_values: Sequence[int] = (16,),
+    ef_construction_values: Sequence[int] = (100,),
+    ef_search_values: Sequence[int] = (10, 50, 100),
+) -> list[dict]:
+    """Return one row per parameter combination with build time, recall@k and query latency."""
+    corpus, probes = synthetic_vectors(size, queries, dimensions)
+    truth = exact_neighbours(corpus, probes, k)
+    rows: list[dict] = []
+    for m in m_values:
+        for ef_construction in ef_construction_values:
+            progress.print(f"[dim]hnsw: building M={m} ef_construction={ef_construction} ({size} vectors)...[/dim]")
+            with tempfile.TemporaryDirectory() as tmp:
+                collection = _open(tmp, HnswSettings(space, m, ef_construction, ef_search_values[0]))
+                start = time.perf_counter()
+                for offset in range(0, size, 5000):
+                    batch = corpus[offset : offset + 5000]
+                    collection.add(
+                        ids=[str(offset + idx) for idx in range(len(batch))],
+                        embeddings=batch.tolist(),
+                    )
+                build_ms = (time.perf_counter() - start) * 1000
+                for ef_search in ef_search_values:
+                    collection = _open(tmp, HnswSettings(space, m, ef_construction, ef_search))
+                    collection.query(query_embeddings=[probes[0].tolist()], n_results=k, include=[])
+                    samples: list[float] = []
+                    found = 0
+                    for vector, expected in zip(probes, truth):
+                        start = time.perf_counter()
+                        result = collection.query(query_embeddings=[vector.tolist()], n_results=k, include=[])
+                        samples.append((time.perf_counter() - start) * 1000)
+                        found += len(expected & {int(mem_id) for mem_id in result["ids"][0]})
+                    rows.append(
+                        {
+                            "space": space,
+                            "m": m,
+                            "ef_construction": ef_construction,
+                            "ef_search": ef_search,
+                            "build_ms": build_ms,
+                            f"recall_at_{k}": found / (k * len(truth)),
+                            "query": latency_stats(samples),
+                        }
+                    )
+    return rows
+
+
+def _ints(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="HNSW recall vs latency sweep for the memory collection.")
+    parser.add_argument("--size", type=int, default=20000, help="Vectors to index")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per ef_search value")
+    parser.add_argument("--dimensions", type=int, default=128)
+    parser.add_argument("-k", type=int, default=3, help="Neighbours per query (MemoryStore top_k)")
+    parser.add_argument("--space", default="cosine", choices=SPACES)
+    parser.add_argument("--m", default="16,32", help="Comma-separated M (max_neighbors) values")
+    parser.add_argument("--ef-construction", default="100,200", help="Comma-separated ef_construction values")
+    parser.add_argument("--ef-search", default="10,25,50,100,200", help="Comma-separated ef_search values")
+    parser.add_argument("--output", help="Optional path for JSON results")
+    args = parser.parse_args(argv)
+
+    rows = sweep(
+        size=args.size,
+        queries=args.queries,
+        dimensions=args.dimensions,
+        k=args.k,
+        space=args.space,
+        m_values=_ints(args.m),
+        ef_construction_values=_ints(args.ef_construction),
+        ef_search_values=_ints(args.ef_search),
+    )
+
+    table = Table(title=f"HNSW sweep ({args.size} vectors, {args.space} space)")
+    for column in ("M", "ef_construction", "ef_search", "Build s", f"Recall@{args.k}", "p50 ms", "p95 ms"):
+        table.add_column(column, justify="right")
+    for row in rows:
+        table.add_row(
+            str(row["m"]),
+            str(row["ef_construction"]),
+            str(row["ef_search"]),
+            f"{row['build_ms'] / 1000:.1f}",
+            f"{row[f'recall_at_{args.k}']:.3f}",
+            f"{row['query']['p50_ms']:.2f}",
+            f"{row['query']['p95_ms']:.2f}",
+        )
+    progress.print(table)
+    if args.output:
+        Path(args.output).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+        progress.print(f"[green]HNSW sweep written to {args.output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Two-stage (IVF) retrieval against flat search and Chroma's HNSW index.
+
+The same synthetic clustered unit vectors are searched three ways: exact flat
+search (NumPy matrix product over every vector), the memory collection's HNSW
+query, and ``IVFIndex`` at several ``nprobe`` values. Reports build time,
+recall@k against the flat results and per-query latency.
+
+Usage::
+
+    python -m benchmarks.ivf_bench                                   # 100k vectors
+    python -m benchmarks.ivf_bench --size 500000 --nprobe 4,8,16,32 --dimensions 768
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Sequence
+
+import numpy as np
+from chromadb import PersistentClient
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.hnsw_sweep import synthetic_vectors
+from benchmarks.run import latency_stats
+from srl_agents.ivf_index import IVFIndex
+from srl_agents.memory import MemoryStore
+
+progress = Console(stderr=True)
+
+
+def _score(search: Callable[[np.ndarray], list[str]], probes: np.ndarray, truth: list[set[str]], k: int) -> dict:
+    samples: list[float] = []
+    found = 0
+    for vector, expected in zip(probes, truth):
+        start = time.perf_counter()
+        ids = search(vector)
+        samples.append((time.perf_counter() - start) * 1000)
+        found += len(expected & set(ids))
+    return {f"recall_at_{k}": found / (k * len(truth)), "query": latency_stats(samples)}
+
+
+def bench_ivf(
+    *,
+    size: int = 100000,
+    queries: int = 200,
+    dimensions: int = 384,
+    k: int = 3,
+    n_clusters: int = 0,
+    nprobe_values: Sequence[int] = (4, 8, 16),
+    hnsw: bool = True,
+) -> dict:
+    """Return ``{"flat": ..., "hnsw": ..., "ivf": {nprobe: ...}}`` rows for one corpus size."""
+    corpus, probes = synthetic_vectors(size, queries, dimensions, clusters=max(32, int(size**0.5) // 4))
+    ids = [str(idx) for idx in range(size)]
+
+    def flat(vector: np.ndarray) -> list[str]:
+        scores = corpus @ vector
+        top = np.argpartition(-scores, k)[:k]
+        return [ids[idx] for idx in top]
+
+    truth = [set(flat(vector)) for vector in probes]
+    results: dict = {"size": size, "dimensions": dimensions, "flat": _score(flat, probes, truth, k)}
+
+    progress.print(f"[dim]ivf: fitting centroids over {size} vectors...[/dim]")
+    index = IVFIndex(n_clusters=n_clusters)
+    start = time.perf_counter()
+    index.build(ids, corpus)
+    results["ivf_build_ms"] = (time.perf_counter() - start) * 1000
+    results["ivf_clusters"] = len(index.centroids)
+    results["ivf"] = {
+        str(nprobe): _score(
+            lambda vector, nprobe=nprobe: [mem_id for mem_id, _ in index.search(vector, k, nprobe=nprobe)],
+            probes,
+            truth,
+            k,
+        )
+        for nprobe in nprobe_values
+    }
+
+    if hnsw:
+        progress.print(f"[dim]ivf: loading {size} vectors into Chroma for the HNSW baseline...[/dim]")
+        with tempfile.TemporaryDirectory() as tmp:
+            collection = MemoryStore(
+                embedder=None, client=PersistentClient(path=tmp), collection_name="ivf-bench"
+            ).collection
+            start = time.perf_counter()
+            for offset in range(0, size, 5000):
+                collection.add(ids=ids[offset : offset + 5000], embeddings=corpus[offset : offset + 5000].tolist())
+            results["hnsw_build_ms"] = (time.perf_counter() - start) * 1000
+            results["hnsw"] = _score(
+                lambda vector: collection.query(query_embeddings=[vector.tolist()], n_results=k, include=[])["ids"][0],
+                probes,
+                truth,
+                k,
+            )
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Two-stage IVF retrieval vs flat and HNSW search.")
+    parser.add_argument("--size", type=int, default=100000, help="Vectors to index")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, default=384)
+    parser.add_argument("-k", type=int, default=3, help="Neighbours per query (MemoryStore top_k)")
+    parser.add_argument("--clusters", type=int, default=0, help="IVF clusters (0 = sqrt(size))")
+    parser.add_argument("--nprobe", default="4,8,16", help="Comma-separated nprobe values")
+    parser.add_argument("--skip-hnsw", action="store_true", help="Skip the (slow to load) Chroma baseline")
+    parser.add_argument("--output", help="Optional path for JSON results")
+    args = parser.parse_args(argv)
+
+    results = bench_ivf(
+        size=args.size,
+        queries=args.queries,
+        dimensions=args.dimensions,
+        k=args.k,
+        n_clusters=args.clusters,
+        nprobe_values=[int(item) for item in args.nprobe.split(",") if item.strip()],
+        hnsw=not args.skip_hnsw,
+    )
+
+    recall = f"recall_at_{args.k}"
+    table = Table(title=f"Two-stage retrieval ({args.size} x {args.dimensions}, {results['ivf_clusters']} clusters)")
+    table.add_column("Index", style="bold")
+    for column in ("Build s", f"Recall@{args.k}", "p50 ms", "p95 ms"):
+        table.add_column(column, justify="right")
+    rows = [("flat", None, results["flat"])]
+    rows += [(f"ivf nprobe={nprobe}", results["ivf_build_ms"], row) for nprobe, row in results["ivf"].items()]
+    if "hnsw" in results:
+        rows.append(("chroma hnsw", results["hnsw_build_ms"], results["hnsw"]))
+    for name, build_ms, row in rows:
+        table.add_row(
+            name,
+            "-" if build_ms is None else f"{build_ms / 1000:.1f}",
+            f"{row[recall]:.3f}",
+            f"{row['query']['p50_ms']:.3f}",
+            f"{row['query']['p95_ms']:.3f}",
+        )
+    progress.print(table)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        progress.print(f"[green]IVF benchmark written to {args.output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Compare memory retrieval hit rate and latency across query refiners.
+
+Every fixture memory is embedded through the refiner under test (as
+``MemoryStore.add`` does), then each fixture query is refined, embedded and
+matched against a real local Chroma collection. Reports hit@k, MRR and the mean
+refinement latency per refiner.
+
+Usage::
+
+    python -m benchmarks.refiner_eval                        # none vs local, offline
+    python -m benchmarks.refiner_eval --refiner llm --embedder openai
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from chromadb import PersistentClient
+from langchain_core.embeddings import Embeddings
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.fakes import HashingEmbedder
+from srl_agents.query_refiner import build_query_refiner
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "refiner_eval.json"
+progress = Console(stderr=True)
+
+
+def load_fixture(path: str | Path = FIXTURE) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def evaluate_refiner(
+    refiner: Callable[[str], str] | None,
+    embedder: Embeddings,
+    fixture: dict,
+    *,
+    k: int = 3,
+) -> dict:
+    """Return hit@1, hit@k, MRR and refinement latency for one refiner."""
+    refine_ms: list[float] = []
+
+    def refine(text: str) -> str:
+        if refiner is None:
+            return text
+        start = time.perf_counter()
+        refined = refiner(text) or text
+        refine_ms.append((time.perf_counter() - start) * 1000)
+        return refined
+
+    memories = fixture["memories"]
+    documents = [
+        refine(". ".join(filter(None, [m["topic"], m["insight"], m["reasoning"], m.get("source_query")])))
+        for m in memories
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        collection = PersistentClient(path=tmp).get_or_create_collection("refiner-eval")
+        collection.add(
+            ids=[m["id"] for m in memories],
+            embeddings=embedder.embed_documents(documents),
+            documents=documents,
+        )
+        hits_at_1 = hits_at_k = 0
+        reciprocal_ranks: list[float] = []
+        for case in fixture["queries"]:
+            vector = embedder.embed_query(refine(case["query"]))
+            result = collection.query(query_embeddings=[vector], n_results=len(memories), include=[])
+            ranked = result["ids"][0]
+            expected = set(case["expected"])
+            rank = next((idx for idx, mem_id in enumerate(ranked, start=1) if mem_id in expected), None)
+            hits_at_1 += rank == 1
+            hits_at_k += rank is not None and rank <= k
+            reciprocal_ranks.append(1 / rank if rank else 0.0)
+
+    total = len(fixture["queries"])
+    return {
+        "queries": total,
+        "hit_at_1": hits_at_1 / total,
+        f"hit_at_{k}": hits_at_k / total,
+        "mrr": statistics.fmean(reciprocal_ranks),
+        "refine_mean_ms": statistics.fmean(refine_ms) if refine_ms else 0.0,
+    }
+
+
+def _embedder(kind: str) -> Embeddings:
+    if kind == "openai":
+        from srl_agents.config import get_embeddings
+
+        return get_embeddings()
+    return HashingEmbedder()
+
+
+def _refiner(kind: str) -> Callable[[str], str] | None:
+    if kind == "llm":
+        from srl_agents.config import get_llm
+
+        return build_query_refiner("llm", get_llm("query_refiner"))
+    return build_query_refiner(kind)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Query refiner retrieval evaluation.")
+    parser.add_argument(
+        "--refiner",
+        action="append",
+        choices=["none", "local", "llm"],
+        help="Refiner(s) to compare; repeat the flag. Defaults to none and local (offline).",
+    )
+    parser.add_argument(
+        "--embedder",
+        default="hashing",
+        choices=["hashing", "openai"],
+        help="hashing = offline bag-of-words embedder; openai = the configured embedding model",
+    )
+    parser.add_argument("--fixture", default=str(FIXTURE), help="JSON file with memories and queries")
+    parser.add_argument("-k", type=int, default=3, help="Cut-off for hit@k")
+    parser.add_argument("--output", help="Optional path for JSON results")
+    args = parser.parse_args(argv)
+
+    fixture = load_fixture(args.fixture)
+    embedder = _embedder(args.embedder)
+    results = {}
+    for kind in args.refiner or ["none", "local"]:
+        progress.print(f"[dim]evaluating {kind} refiner...[/dim]")
+        results[kind] = evaluate_refiner(_refiner(kind), embedder, fixture, k=args.k)
+
+    table = Table(title=f"Query refiner retrieval ({args.embedder} embeddings)")
+    table.add_column("Refiner", style="bold")
+    for column in ("Hit@1", f"Hit@{args.k}", "MRR", "Refine ms"):
+        table.add_column(column, justify="right")
+    for kind, row in results.items():
+        table.add_row(
+            kind,
+            f"{row['hit_at_1']:.2f}",
+            f"{row[f'hit_at_{args.k}']:.2f}",
+            f"{row['mrr']:.3f}",
+            f"{row['refine_mean_ms']:.3f}",
+        )
+    progress.print(table)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        progress.print(f"[green]Refiner evaluation written to {args.output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Evaluate forethought's web research routing on labelled fixture questions.
+
+Fixture memories are stored through ``MemoryStore.add`` (with their critic impact
+scores) in a real local Chroma collection; each case is retrieved once and then
+routed by the legacy keyword heuristic and by ``ResearchPolicy`` at every
+``--min-similarity`` value. Reports accuracy, the web search rate, unnecessary
+searches (memory already covered the question) and missed searches.
+
+Usage::
+
+    python -m benchmarks.research_eval                                  # offline embedder
+    python -m benchmarks.research_eval --embedder openai --min-similarity 0.4 --min-similarity 0.5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from chromadb import PersistentClient
+from langchain_core.embeddings import Embeddings
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.fakes import HashingEmbedder
+from srl_agents.memory import MemoryStore, Retrieval
+from srl_agents.research_policy import ResearchPolicy
+from srl_agents.state import LearningContext, ReflectionOutput
+from srl_agents.tools.search_cache import is_time_sensitive
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "research_eval.json"
+progress = Console(stderr=True)
+
+Router = Callable[[Retrieval, LearningContext], bool]
+
+
+def load_fixture(path: str | Path = FIXTURE) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def legacy_should_research(retrieval: Retrieval, learning_context: LearningContext) -> bool:
+    """The routing forethought used before ``ResearchPolicy``: any rendered memory line, unless fresh."""
+    if not retrieval.text.strip().startswith("- ["):
+        return True
+    return is_time_sensitive(learning_context.success_criteria)
+
+
+def retrieve_cases(fixture: dict, embedder: Embeddings) -> list[tuple[dict, Retrieval, LearningContext]]:
+    """Store the fixture memories and retrieve every case once."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(embedder, PersistentClient(path=tmp), collection_name="research-eval")
+        for memory in fixture["memories"]:
+            reflection = ReflectionOutput(
+                topic=memory["topic"],
+                insight=memory["insight"],
+                reasoning=memory["reasoning"],
+                should_store=True,
+                source_query=memory.get("source_query"),
+            )
+            store.add(reflection, impact_score=memory.get("impact_score"))
+        return [
+            (
+                case,
+                store.retrieve(case["query"]),
+                LearningContext(
+                    learning_goal=case["query"], success_criteria=case["success_criteria"], prior_knowledge=""
+                ),
+            )
+            for case in fixture["cases"]
+        ]
+
+
+def evaluate_router(router: Router, retrieved: list[tuple[dict, Retrieval, LearningContext]]) -> dict:
+    """Return accuracy, search rate and unnecessary/missed search counts for one router."""
+    correct = searches = unnecessary = missed = 0
+    for case, retrieval, learning_context in retrieved:
+        research = router(retrieval, learning_context)
+        expected = case["needs_research"]
+        correct += research == expected
+        searches += research
+        unnecessary += research and not expected
+        missed += expected and not research
+    total = len(retrieved)
+    return {
+        "cases": total,
+        "accuracy": correct / total,
+        "search_rate": searches / total,
+        "unnecessary_searches": unnecessary,
+        "missed_searches": missed,
+    }
+
+
+def policy_router(policy: ResearchPolicy) -> Router:
+    return lambda retrieval, learning_context: policy.decide(retrieval.hits, learning_context).needs_research
+
+
+def _embedder(kind: str) -> Embeddings:
+    if kind == "openai":
+        from srl_agents.config import get_embeddings
+
+        return get_embeddings()
+    return HashingEmbedder()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Forethought research routing evaluation.")
+    parser.add_argument(
+        "--embedder",
+        default="hashing",
+        choices=["hashing", "openai"],
+        help="hashing = offline bag-of-words embedder; openai = the configured embedding model",
+    )
+    parser.add_argument(
+        "--min-similarity",
+        action="append",
+        type=float,
+        help="Policy threshold(s) to compare; repeat the flag. Defaults to 0.3-0.6 in 0.05 steps.",
+    )
+    parser.add_argument("--fresh-similarity", type=float, default=ResearchPolicy.fresh_similarity)
+    parser.add_argument("--min-impact", type=int, default=ResearchPolicy.min_impact)
+    parser.add_argument("--fixture", default=str(FIXTURE), help="JSON file with memories and labelled cases")
+    parser.add_argument("--output", help="Optional path for JSON results")
+    args = parser.parse_args(argv)
+
+    progress.print("[dim]retrieving fixture cases...[/dim]")
+    retrieved = retrieve_cases(load_fixture(args.fixture), _embedder(args.embedder))
+    results = {"legacy": evaluate_router(legacy_should_research, retrieved)}
+    for threshold in args.min_similarity or [round(0.3 + 0.05 * step, 2) for step in range(7)]:
+        policy = ResearchPolicy(
+            min_similarity=threshold,
+            fresh_similarity=max(args.fresh_similarity, threshold),
+            min_impact=args.min_impact,
+        )
+        results[f"policy@{threshold:.2f}"] = evaluate_router(policy_router(policy), retrieved)
+
+    table = Table(title=f"Research routing ({args.embedder} embeddings, {len(retrieved)} cases)")
+    table.add_column("Router", style="bold")
+    for column in ("Accuracy", "Search rate", "Unnecessary", "Missed"):
+        table.add_column(column, justify="right")
+    for name, row in results.items():
+        table.add_row(
+            name,
+            f"{row['accuracy']:.2f}",
+            f"{row['search_rate']:.2f}",
+            str(row["unnecessary_searches"]),
+            str(row["missed_searches"]),
+        )
+    progress.print(table)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        progress.print(f"[green]Research routing evaluation written to {args.output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
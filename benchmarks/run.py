@@ -0,0 +1,255 @@
+"""Run the offline benchmark suite and write results to JSON.
+
+Usage::
+
+    python -m benchmarks.run                       # all suites, default sizes
+    python -m benchmarks.run --suite memory --sizes 1000,100000,1000000
+    python -m benchmarks.compare base.json head.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+from chromadb import PersistentClient
+from rich.console import Console
+
+from benchmarks.fakes import FakeChatModel, FakeSearchSession, HashingEmbedder
+from srl_agents.graph import create_app
+from srl_agents.instrumentation import Profiler
+from srl_agents.logging import configure_logging
+from srl_agents.memory import MemoryStore
+from srl_agents.state import ReflectionOutput
+from srl_agents.tools.web_search import WebSearchTool
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# Progress goes to stderr so it never mixes with node events.
+progress = Console(stderr=True)
+
+QUERIES = [
+    "How do I reset a git repository to a clean state?",
+    "Why is my SQL join slow on large tables?",
+    "What is the best way to structure Python unit tests?",
+    "How should I plan a weekly revision schedule?",
+    "Explain gradient descent learning rates",
+]
+
+
+def latency_stats(samples_ms: list[float]) -> dict[str, float]:
+    """Summarize latency samples (milliseconds)."""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {"count": 0}
+
+    def percentile(fraction: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "max_ms": ordered[-1],
+    }
+
+
+def _time_ms(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_graph(iterations: int, llm_latency_ms: float) -> dict:
+    """Full graph throughput and per-node overhead with fake model, embedder and search."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(
+            embedder=HashingEmbedder(),
+            client=PersistentClient(path=tmp),
+            collection_name="bench-graph",
+        )
+        profiler = Profiler()
+        app = create_app(
+            memory_store=store,
+            profiler=profiler,
+            llm=FakeChatModel(latency_ms=llm_latency_ms),
+            web_search_tool=WebSearchTool(session_factory=FakeSearchSession),
+        )
+        samples = []
+        for idx in range(iterations):
+            query = QUERIES[idx % len(QUERIES)]
+            samples.append(_time_ms(lambda: app.invoke({"query": query, "retry_count": 0})))
+
+    per_node = {
+        row["node"]: {"calls": row["calls"], "mean_ms": row["wall_ms"] / row["calls"]}
+        for row in profiler.summary()
+    }
+    total_s = sum(samples) / 1000
+    return {
+        "iterations": iterations,
+        "llm_latency_ms": llm_latency_ms,
+        "runs_per_second": iterations / total_s if total_s else 0.0,
+        "run": latency_stats(samples),
+        "nodes": per_node,
+    }
+
+
+def _bulk_load(store: MemoryStore, size: int, dimensions: int, seed: int = 7) -> None:
+    rng = np.random.default_rng(seed)
+    batch = 5000
+    for start in range(0, size, batch):
+        count = min(batch, size - start)
+        vectors = rng.standard_normal((count, dimensions)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        store.collection.add(
+            ids=[f"bench-{start + idx}" for idx in range(count)],
+            embeddings=vectors.tolist(),
+            documents=[f"Synthetic reflection {start + idx}" for idx in range(count)],
+            metadatas=[
+                {"topic": f"Topic {(start + idx) % 16}", "insight": f"Synthetic insight {start + idx}"}
+                for idx in range(count)
+            ],
+        )
+
+
+def bench_memory(sizes: list[int], queries: int, adds: int, dimensions: int) -> dict:
+    """``MemoryStore.search``/``add`` latency against a real local Chroma collection."""
+    results: dict[str, dict] = {}
+    for size in sizes:
+        progress.print(f"[dim]memory: loading {size} records...[/dim]")
+        with tempfile.TemporaryDirectory() as tmp:
+            store = MemoryStore(
+                embedder=HashingEmbedder(dimensions),
+                client=PersistentClient(path=tmp),
+                collection_name=f"bench-{size}",
+                min_similarity=None,
+            )
+            load_ms = _time_ms(lambda: _bulk_load(store, size, dimensions))
+            search_samples = [
+                _time_ms(lambda: store.search(QUERIES[idx % len(QUERIES)])) for idx in range(queries)
+            ]
+            add_samples = []
+            for idx in range(adds):
+                reflection = ReflectionOutput(
+                    topic="Bench",
+                    insight=f"Benchmark insight {idx}",
+                    reasoning="Measures write latency",
+                    should_store=True,
+                    source_query=QUERIES[idx % len(QUERIES)],
+                )
+                add_samples.append(_time_ms(lambda: store.add(reflection, impact_score=3)))
+        results[str(size)] = {
+            "load_records_per_second": size / (load_ms / 1000) if load_ms else 0.0,
+            "search": latency_stats(search_samples),
+            "add": latency_stats(add_samples),
+        }
+    return results
+
+
+def bench_web(iterations: int) -> dict:
+    """Result parsing and prompt formatting cost for the web search tool (no network)."""
+    tool = WebSearchTool(session_factory=lambda: FakeSearchSession(results=10), max_results=10)
+    parse_samples = [_time_ms(lambda: tool.search(QUERIES[idx % len(QUERIES)])) for idx in range(iterations)]
+    results = tool.search(QUERIES[0])
+    format_samples = [_time_ms(lambda: WebSearchTool.format_results(results)) for _ in range(iterations)]
+    return {"search_parse": latency_stats(parse_samples), "format_results": latency_stats(format_samples)}
+
+
+def bench_cli(repeats: int) -> dict:
+    """Cold-process startup time for the CLI entry points."""
+    commands = {
+        "main_help": [sys.executable, "main.py", "--help"],
+        "memory_cli_help": [sys.executable, "memory_cli.py", "--help"],
+        "import_srl_agents": [sys.executable, "-c", "import srl_agents"],
+    }
+    results = {}
+    for name, command in commands.items():
+        samples = [
+            _time_ms(
+                lambda: subprocess.run(command, cwd=PROJECT_ROOT, check=True, capture_output=True)
+            )
+            for _ in range(repeats)
+        ]
+        results[name] = latency_stats(samples)
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline SRL agents benchmark suite.")
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=["graph", "memory", "web", "cli"],
+        help="Suite(s) to run; repeat the flag to select several. Defaults to all.",
+    )
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results")
+    parser.add_argument("--iterations", type=int, default=20, help="Graph/web iterations")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated chat model latency")
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000",
+        help="Comma-separated collection sizes for the memory suite (e.g. 1000,100000,1000000)",
+    )
+    parser.add_argument("--queries", type=int, default=50, help="Searches per collection size")
+    parser.add_argument("--adds", type=int, default=20, help="Adds per collection size")
+    parser.add_argument("--dimensions", type=int, default=384, help="Embedding dimensions for the memory suite")
+    parser.add_argument("--cli-repeats", type=int, default=3, help="Process launches per CLI command")
+    parser.add_argument(
+        "--log-sink",
+        default="none",
+        choices=["none", "json", "rich"],
+        help="Node event sink while benchmarking (default none, matching a quiet server deployment)",
+    )
+    args = parser.parse_args(argv)
+
+    suites = args.suite or ["graph", "memory", "web", "cli"]
+    results: dict[str, dict] = {}
+    configure_logging(sink=args.log_sink)
+    if "graph" in suites:
+        results["graph"] = bench_graph(args.iterations, args.llm_latency_ms)
+    if "memory" in suites:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+        results["memory"] = bench_memory(sizes, args.queries, args.adds, args.dimensions)
+    if "web" in suites:
+        results["web"] = bench_web(args.iterations * 10)
+    if "cli" in suites:
+        results["cli"] = bench_cli(args.cli_repeats)
+
+    payload = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    progress.print(f"[green]Benchmark results written to {args.output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,32 @@
 """Sample scenarios demonstrating the forethought-reflection loop."""
 from __future__ import annotations
 
+from typing import Callable
+
+from langchain_core.runnables import RunnableConfig
 from rich.console import Console
 
 
-def run_demo(app):  # type: ignore[override]
+def run_demo(
+    app,
+    make_config: Callable[[str], RunnableConfig | None] = lambda scenario: None,
+    on_result: Callable[[dict], None] = lambda state: None,
+):  # type: ignore[override]
+    """Run the demo scenarios; ``make_config`` supplies per-scenario config (e.g. checkpoint thread ids)
+    and ``on_result`` receives each scenario's final state."""
     console = Console()
     console.print("[bold cyan]🚀 Scenario 1 · Visible Learning · Git Hygiene[/bold cyan]")
-    app.invoke(
+    result = app.invoke(
         {
             "query": (
                 "I'm leading a study group and need a clear recipe for resetting a git repo to a clean slate. "
                 "How do I explain the safest way to undo local changes?"
             ),
             "retry_count": 0,
-        }
+        },
+        make_config("git-hygiene"),
     )
+    on_result(result)
 
     # console.print("[bold cyan]🚀 Scenario 2 · SRL Evidence · AI Roadmap[/bold cyan]")
     # app.invoke(
@@ -25,5 +36,6 @@ def run_demo(app):  # type: ignore[override]
     #             "What recent developments should I highlight, and how will I know if my audience understood them?"
     #         ),
     #         "retry_count": 0,
-    #     }
+    #     },
+    #     make_config("ai-roadmap"),
     # )
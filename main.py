@@ -3,8 +3,47 @@ from __future__ import annotations
 
 import argparse
 
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
 from examples.scenarios import run_demo
 from srl_agents import create_app
+from srl_agents.checkpointing import latest_thread_id, new_thread_id, thread_config
+from srl_agents.config import get_checkpointer
+from srl_agents.instrumentation import Profiler
+from srl_agents.logging import configure_logging, console
+
+
+def start_config(checkpointer: BaseCheckpointSaver | None, prefix: str) -> RunnableConfig | None:
+    """Allocate a fresh checkpoint thread and tell the user how to resume it."""
+    if checkpointer is None:
+        return None
+    thread_id = new_thread_id(prefix)
+    console.print(f"[dim]Checkpoint thread {thread_id} (resume with --resume {thread_id})[/dim]")
+    return thread_config(thread_id)
+
+
+def print_answer(state: dict | None) -> None:
+    """Print a run's final answer on stdout, whatever sink and level node events go to."""
+    if state and state.get("response"):
+        console.rule("Answer", style="bold green")
+        console.print(state["response"], markup=False)
+
+
+def resume_run(app, checkpointer: BaseCheckpointSaver, thread_id: str) -> None:
+    """Continue a checkpointed run from its last completed node."""
+    if thread_id == "latest":
+        thread_id = latest_thread_id(checkpointer) or ""
+        if not thread_id:
+            console.print("[yellow]No checkpointed runs to resume.[/yellow]")
+            return
+    config = thread_config(thread_id)
+    snapshot = app.get_state(config)
+    if not snapshot.next:
+        console.print(f"[yellow]Run {thread_id} has no pending nodes; nothing to resume.[/yellow]")
+        return
+    console.print(f"[cyan]Resuming {thread_id} at: {', '.join(snapshot.next)}[/cyan]")
+    print_answer(app.invoke(None, config))
 
 
 def main() -> None:
@@ -13,13 +52,67 @@ def main() -> None:
         "--query",
         help="If provided, run the graph once with this query instead of the predefined scenarios.",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record per-node latency and token usage and print a summary table after the run.",
+    )
+    parser.add_argument(
+        "--profile-trace",
+        metavar="PATH",
+        help="Write the per-node profile (every span plus summary) as JSON to PATH. Implies --profile.",
+    )
+    parser.add_argument(
+        "--profile-metrics",
+        metavar="PATH",
+        help="Write Prometheus text-format counters to PATH. Implies --profile.",
+    )
+    parser.add_argument(
+        "--log-sink",
+        choices=["auto", "rich", "json", "none"],
+        help="Where node events go (default: SRL_LOG_SINK or auto = rich on a TTY, JSON lines otherwise).",
+    )
+    parser.add_argument(
+        "--log-level",
+        help="Minimum event level: DEBUG, INFO, WARNING or ERROR (default: SRL_LOG_LEVEL or sink-specific).",
+    )
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        metavar="THREAD_ID",
+        help="Resume a failed or interrupted run from its last completed node (default: most recent thread).",
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Disable SQLite checkpointing (SRL_CHECKPOINT_DB) for this run.",
+    )
     args = parser.parse_args()
+    if args.resume and args.no_checkpoint:
+        parser.error("--resume requires checkpointing; drop --no-checkpoint")
+    if args.log_sink or args.log_level:
+        configure_logging(sink=args.log_sink, level=args.log_level)
 
-    app = create_app()
-    if args.query:
-        app.invoke({"query": args.query, "retry_count": 0})
-    else:
-        run_demo(app)
+    profiler = Profiler() if (args.profile or args.profile_trace or args.profile_metrics) else None
+    checkpointer = None if args.no_checkpoint else get_checkpointer()
+    app = create_app(profiler=profiler, checkpointer=checkpointer)
+    try:
+        if args.resume:
+            resume_run(app, checkpointer, args.resume)
+        elif args.query:
+            print_answer(app.invoke({"query": args.query, "retry_count": 0}, start_config(checkpointer, "query")))
+        else:
+            run_demo(app, lambda scenario: start_config(checkpointer, scenario), on_result=print_answer)
+    finally:
+        if profiler:
+            profiler.render_summary(console)
+            if args.profile_trace:
+                profiler.write_trace(args.profile_trace)
+                console.print(f"[dim]Profile trace written to {args.profile_trace}[/dim]")
+            if args.profile_metrics:
+                profiler.write_prometheus(args.profile_metrics)
+                console.print(f"[dim]Prometheus counters written to {args.profile_metrics}[/dim]")
 
 
 if __name__ == "__main__":
@@ -2,17 +2,33 @@
 from __future__ import annotations
 
 import argparse
+from datetime import datetime
 
 from rich.table import Table
 
-from srl_agents.config import get_embeddings, get_vector_client
+from srl_agents.batch_reflection import reflect_batch
+from srl_agents.config import (
+    CHROMA_DIR,
+    CONTEXT_TOKENIZER,
+    CRITIC_BATCH_SIZE,
+    MEMORY_SNAPSHOT_MARKER,
+    REFLECT_BATCH_CONCURRENCY,
+    REFLECTOR_CONTEXT_TOKENS,
+    WEB_SEARCH_CACHE_PATH,
+    build_configured_query_refiner,
+    build_memory_store,
+    get_llm,
+    get_llm_cache,
+    get_model_settings,
+    get_reflection_journal,
+    get_retrieval_log,
+    get_web_search_cache,
+)
+from srl_agents.context_packer import ContextPacker, get_token_counter
 from srl_agents.logging import console
 from srl_agents.memory import MemoryStore
-
-
-def build_memory_store() -> MemoryStore:
-    """Instantiate a MemoryStore backed by the shared Chroma client."""
-    return MemoryStore(embedder=get_embeddings(), client=get_vector_client())
+from srl_agents.memory_shards import ShardedMemoryStore
+from srl_agents.snapshot import SnapshotError, restore_snapshot, write_snapshot
 
 
 def list_memories(store: MemoryStore, limit: int) -> None:
@@ -49,9 +65,218 @@ def delete_memory(store: MemoryStore, memory_id: str) -> None:
         console.print(f"[yellow]No memory found with id {memory_id}.[/yellow]")
 
 
-def reset_memory(store: MemoryStore) -> None:
-    deleted = store.reset_memory()
-    console.print(f"[green]Cleared {deleted} stored memories.[/green]")
+def reset_memory(store: MemoryStore, topic: str | None = None) -> None:
+    deleted = store.reset_memory(topic=topic)
+    scope = f" for topic {topic!r}" if topic else ""
+    console.print(f"[green]Cleared {deleted} stored memories{scope}.[/green]")
+
+
+def rebuild_index(store: MemoryStore) -> None:
+    if store.ivf is None:
+        console.print("[yellow]Two-stage retrieval disabled; set MEMORY_IVF=1 to enable it.[/yellow]")
+        return
+    indexed = store.rebuild_index()
+    clusters = len(store.ivf.centroids) if store.ivf.ready else 0
+    console.print(f"[green]Indexed {indexed} memories into {clusters} clusters at {store.ivf.path}.[/green]")
+
+
+def snapshot_memory(store: MemoryStore, path: str, dtype: str) -> None:
+    manifest = write_snapshot(store, path, dtype=dtype)
+    console.print(
+        f"[green]Wrote {manifest['count']} memories ({manifest['dimensions']}-d {dtype}) to {path}.[/green]"
+    )
+
+
+def restore_memory(store: MemoryStore, path: str, replace: bool) -> None:
+    try:
+        restored = restore_snapshot(store, path, replace=replace, marker=MEMORY_SNAPSHOT_MARKER)
+    except SnapshotError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise SystemExit(1) from exc
+    console.print(f"[green]Restored {restored} memories from {path}.[/green]")
+
+
+def list_topics(store: MemoryStore) -> None:
+    if not isinstance(store, ShardedMemoryStore):
+        console.print("[yellow]Topic sharding disabled; set MEMORY_SHARD_BY_TOPIC=1 to enable it.[/yellow]")
+        return
+    table = Table(title="Memory shards")
+    table.add_column("Shard", style="bold")
+    table.add_column("Topic", style="magenta")
+    table.add_column("Memories", justify="right")
+    for row in store.topics():
+        table.add_row(row["shard"], row["topic"], str(row["count"]))
+    console.print(table)
+
+
+def show_memory_stats(store: MemoryStore, top_topics: int) -> None:
+    stats = store.stats()
+    table = Table(title="Memory store", show_header=False)
+    table.add_column("Metric", style="bold")
+    table.add_column("Value")
+    table.add_row("Memories", str(stats.records))
+    table.add_row("Queued writes", str(stats.pending))
+    table.add_row("Topics", str(len(stats.topics)))
+    table.add_row("Embedding dimensions", str(stats.dimensions or "-"))
+    table.add_row("Distance space", store.space)
+    table.add_row("On-disk size", f"{_format_bytes(_directory_size(CHROMA_DIR))} ({CHROMA_DIR})")
+    if store.ivf is not None:
+        clusters = len(store.ivf.centroids) if store.ivf.ready else 0
+        table.add_row("IVF clusters", f"{clusters} (nprobe {store.ivf.nprobe})")
+    console.print(table)
+
+    if stats.topics:
+        topics = Table(title="Memories per topic")
+        topics.add_column("Topic", style="magenta")
+        topics.add_column("Memories", justify="right")
+        topics.add_column("Share", justify="right")
+        for topic, count in list(stats.topics.items())[:top_topics]:
+            topics.add_row(topic, str(count), f"{count / stats.records:.1%}")
+        if len(stats.topics) > top_topics:
+            topics.add_row(f"... {len(stats.topics) - top_topics} more", "", "")
+        console.print(topics)
+
+        impact = Table(title="Impact scores")
+        impact.add_column("Impact", style="cyan")
+        impact.add_column("Memories", justify="right")
+        for score in sorted(stats.impact, key=lambda value: (value is None, value)):
+            impact.add_row("unscored" if score is None else str(score), str(stats.impact[score]))
+        console.print(impact)
+
+    log = get_retrieval_log()
+    if log is None:
+        console.print("[yellow]Retrieval log disabled; set MEMORY_RETRIEVAL_LOG to record searches.[/yellow]")
+        return
+    retrieval = log.stats()
+    if not retrieval.searches:
+        console.print(f"[yellow]No retrievals logged yet at {log.path}.[/yellow]")
+        return
+    table = Table(title=f"Retrieval (last {retrieval.searches} searches)", show_header=False)
+    table.add_column("Metric", style="bold")
+    table.add_column("Value")
+    table.add_row("Window", f"{_format_timestamp(retrieval.first_ts)} .. {_format_timestamp(retrieval.last_ts)}")
+    table.add_row(
+        "Latency p50 / p95 / p99",
+        " / ".join(f"{retrieval.latency_ms[label]:.1f} ms" for label in ("p50", "p95", "p99")),
+    )
+    table.add_row("Hit rate", f"{retrieval.hit_rate:.1%}")
+    table.add_row("Fallback rate", f"{retrieval.fallback_rate:.1%}")
+    table.add_row("Empty", str(retrieval.empty))
+    table.add_row("Served from cache", f"{retrieval.cache_rate:.1%}")
+    console.print(table)
+
+    histogram = Table(title="Top-hit similarity")
+    histogram.add_column("Similarity", style="bold")
+    histogram.add_column("Searches", justify="right")
+    histogram.add_column("")
+    peak = max(retrieval.top_similarity.values()) or 1
+    lower = None
+    for edge, count in retrieval.top_similarity.items():
+        label = f"< {edge:.1f}" if lower is None else f"{lower:.1f} - {edge:.1f}"
+        histogram.add_row(label, str(count), "█" * round(30 * count / peak))
+        lower = edge
+    console.print(histogram)
+
+
+def run_batch_reflection(store: MemoryStore, limit: int | None, concurrency: int, critic_batch: int) -> None:
+    journal = get_reflection_journal()
+    packer = ContextPacker(
+        REFLECTOR_CONTEXT_TOKENS,
+        token_counter=get_token_counter(CONTEXT_TOKENIZER, get_model_settings("reflector").model),
+    )
+    result = reflect_batch(
+        journal,
+        store,
+        get_llm("reflector"),
+        get_llm("critic"),
+        packer=packer,
+        limit=limit,
+        concurrency=concurrency,
+        critic_batch_size=critic_batch,
+    )
+    if not result.interactions:
+        console.print(f"[yellow]No journaled interactions at {journal.path}.[/yellow]")
+        return
+    table = Table(title="Batch reflection", show_header=False)
+    table.add_column("Metric", style="bold")
+    table.add_column("Value", justify="right")
+    table.add_row("Interactions", str(result.interactions))
+    table.add_row("Stored", str(result.stored))
+    table.add_row("Below impact threshold", str(result.skipped))
+    table.add_row("Discarded", str(result.discarded))
+    table.add_row("Failed (kept for retry)", str(result.failed))
+    table.add_row("Reflector calls", str(result.reflector_calls))
+    table.add_row("Critic calls", str(result.critic_calls))
+    table.add_row("Still journaled", str(journal.pending()))
+    console.print(table)
+
+
+def show_cache_stats() -> None:
+    show_web_cache_stats()
+    cache = get_llm_cache()
+    if cache is None:
+        console.print("[yellow]LLM cache disabled; set LLM_CACHE_PATH to enable it.[/yellow]")
+        return
+    stats = cache.stats()
+    table = Table(title="LLM cache", show_header=False)
+    table.add_column("Metric", style="bold")
+    table.add_column("Value")
+    table.add_row("Path", stats.path)
+    table.add_row("Entries", f"{stats.entries}" + (f" / {stats.max_entries}" if stats.max_entries else ""))
+    table.add_row(
+        "Payload size",
+        _format_bytes(stats.total_bytes) + (f" / {_format_bytes(stats.max_bytes)}" if stats.max_bytes else ""),
+    )
+    table.add_row("Hits", str(stats.hits))
+    table.add_row("Misses", str(stats.misses))
+    table.add_row("Hit rate", f"{stats.hit_rate:.1%}")
+    table.add_row("Oldest entry", _format_timestamp(stats.oldest))
+    table.add_row("Newest entry", _format_timestamp(stats.newest))
+    console.print(table)
+
+
+def show_web_cache_stats() -> None:
+    # Only a persisted web cache outlives the process; hit counters are per-run.
+    cache = get_web_search_cache() if WEB_SEARCH_CACHE_PATH else None
+    if cache is None:
+        return
+    stats = cache.stats()
+    table = Table(title="Web search cache", show_header=False)
+    table.add_column("Metric", style="bold")
+    table.add_column("Value")
+    table.add_row("Path", stats.path or "-")
+    table.add_row("Entries", f"{stats.entries} / {stats.max_entries}")
+    table.add_row("TTL", f"{cache.ttl_seconds:.0f}s (time-sensitive: {cache.fresh_ttl_seconds:.0f}s)")
+    console.print(table)
+
+
+def clear_cache() -> None:
+    web_cache = get_web_search_cache() if WEB_SEARCH_CACHE_PATH else None
+    if web_cache is not None:
+        web_cache.clear()
+        console.print(f"[green]Cleared web search cache at {web_cache.path}.[/green]")
+    cache = get_llm_cache()
+    if cache is None:
+        console.print("[yellow]LLM cache disabled; nothing to clear.[/yellow]")
+        return
+    cache.clear()
+    console.print(f"[green]Cleared LLM cache at {cache.path}.[/green]")
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _directory_size(path) -> int:
+    return sum(entry.stat().st_size for entry in path.rglob("*") if entry.is_file()) if path.exists() else 0
+
+
+def _format_timestamp(value: float | None) -> str:
+    return datetime.fromtimestamp(value).isoformat(timespec="seconds") if value else "-"
 
 
 def main() -> None:
@@ -64,18 +289,67 @@ def main() -> None:
     delete_parser = subparsers.add_parser("delete", help="Delete a stored reflection by id")
     delete_parser.add_argument("id", help="Memory identifier returned by the list command")
 
-    subparsers.add_parser("reset", help="Delete every stored reflection")
+    reset_parser = subparsers.add_parser("reset", help="Delete every stored reflection")
+    reset_parser.add_argument("--topic", help="Only delete reflections filed under this topic")
+    snapshot_parser = subparsers.add_parser("snapshot", help="Write a binary snapshot of every stored memory")
+    snapshot_parser.add_argument("path", help="Snapshot directory to create")
+    snapshot_parser.add_argument(
+        "--dtype", default="float32", choices=["float32", "float16"], help="float16 halves the size"
+    )
+    restore_parser = subparsers.add_parser("restore", help="Load a snapshot into the memory store")
+    restore_parser.add_argument("path", help="Snapshot directory written by the snapshot command")
+    restore_parser.add_argument("--replace", action="store_true", help="Delete existing memories first")
+    subparsers.add_parser("rebuild-index", help="Recompute the k-means centroids for two-stage retrieval (MEMORY_IVF=1)")
+    subparsers.add_parser("topics", help="List topic shards and their sizes (MEMORY_SHARD_BY_TOPIC=1)")
+    stats_parser = subparsers.add_parser(
+        "stats", help="Show memory counts per topic and impact, size on disk, and retrieval latency and quality"
+    )
+    stats_parser.add_argument("--topics", type=int, default=15, help="How many topics to list")
+    reflect_parser = subparsers.add_parser(
+        "reflect-batch", help="Reflect on, review and store interactions journaled with SRL_DEFERRED_REFLECTION=1"
+    )
+    reflect_parser.add_argument("--limit", type=int, help="Process at most this many interactions")
+    reflect_parser.add_argument(
+        "--concurrency", type=int, default=REFLECT_BATCH_CONCURRENCY, help="Concurrent Reflector/Critic requests"
+    )
+    reflect_parser.add_argument(
+        "--critic-batch", type=int, default=CRITIC_BATCH_SIZE, help="Rules reviewed per Critic call"
+    )
+    subparsers.add_parser("cache-stats", help="Show LLM response and persisted web search cache statistics")
+    subparsers.add_parser("cache-clear", help="Drop every cached LLM response and web search result")
 
     args = parser.parse_args()
 
-    store = build_memory_store()
     action = args.action
+    if action == "cache-stats":
+        show_cache_stats()
+        return
+    if action == "cache-clear":
+        clear_cache()
+        return
+
+    # Maintenance commands must not start a background restore; ``restore`` completes an unfinished one.
+    # Only reflect-batch embeds reflections, and it must refine them as the agent does.
+    refiner = build_configured_query_refiner() if action == "reflect-batch" else None
+    store = build_memory_store(refiner, warm_start=False)
     if action == "list":
         list_memories(store, args.limit)
     elif action == "delete":
         delete_memory(store, args.id)
     elif action == "reset":
-        reset_memory(store)
+        reset_memory(store, args.topic)
+    elif action == "snapshot":
+        snapshot_memory(store, args.path, args.dtype)
+    elif action == "restore":
+        restore_memory(store, args.path, args.replace)
+    elif action == "rebuild-index":
+        rebuild_index(store)
+    elif action == "topics":
+        list_topics(store)
+    elif action == "stats":
+        show_memory_stats(store, args.topics)
+    elif action == "reflect-batch":
+        run_batch_reflection(store, args.limit, args.concurrency, args.critic_batch)
     else:  # pragma: no cover
         console.print(f"[red]Unknown action: {action}[/red]")
 
@@ -0,0 +1,155 @@
+"""Deferred Reflector/Critic pass over journaled interactions (``memory_cli.py reflect-batch``).
+
+Each round reflects every open interaction concurrently (``max_concurrency``
+through LangChain's ``batch``), reviews the resulting rules ``critic_batch_size``
+at a time in a single Critic call, and stores the approved ones with one
+``MemoryStore.add_many`` write. Rules the Critic asks to revise go back to the
+Reflector with its feedback, up to ``max_attempts`` reflections per interaction
+as in the interactive graph. Interactions whose LLM calls or write failed stay
+in the journal for the next run.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from langchain_core.language_models import BaseChatModel
+
+from .context_packer import ContextPacker
+from .logging import logger
+from .memory import MemoryStore
+from .nodes.critic import build_batch_review_messages
+from .nodes.reflector import build_reflection_prompt
+from .nodes.store import MIN_IMPACT_SCORE
+from .rate_limit import Priority, priority
+from .reflection_journal import Interaction, InteractionJournal
+from .state import CriticBatchOutput, CriticReview, ReflectionOutput
+
+
+@dataclass
+class BatchReflectionResult:
+    interactions: int = 0
+    reflector_calls: int = 0
+    critic_calls: int = 0
+    stored: int = 0
+    skipped: int = 0
+    discarded: int = 0
+    failed: int = 0
+
+
+def reflect_batch(
+    journal: InteractionJournal,
+    store: MemoryStore,
+    reflector_llm: BaseChatModel,
+    critic_llm: BaseChatModel,
+    *,
+    packer: ContextPacker | None = None,
+    limit: int | None = None,
+    concurrency: int = 4,
+    critic_batch_size: int = 5,
+    max_attempts: int = 3,
+) -> BatchReflectionResult:
+    """Reflect on, review and store up to ``limit`` journaled interactions."""
+    interactions = journal.claim(limit)
+    result = BatchReflectionResult(interactions=len(interactions))
+    if not interactions:
+        return result
+    config = {"max_concurrency": concurrency}
+    reflector = reflector_llm.with_structured_output(ReflectionOutput)
+    critic = critic_llm.with_structured_output(CriticBatchOutput)
+    feedback: dict[str, str] = {}
+    open_items = list(interactions)
+    done: list[str] = []
+    approved: list[tuple[Interaction, ReflectionOutput, int]] = []
+
+    with priority(Priority.BACKGROUND):
+        for attempt in range(1, max_attempts + 1):
+            if not open_items:
+                break
+            prompts = [
+                build_reflection_prompt({**item.state(), "critic_feedback": feedback.get(item.id, "")}, packer)
+                for item in open_items
+            ]
+            outputs = reflector.batch(prompts, config=config, return_exceptions=True)
+            result.reflector_calls += len(prompts)
+            candidates: list[tuple[Interaction, ReflectionOutput]] = []
+            for item, output in zip(open_items, outputs):
+                if isinstance(output, Exception):
+                    _log_failure("reflector", item, output)
+                    result.failed += 1
+                elif not output.should_store:
+                    result.discarded += 1
+                    done.append(item.id)
+                else:
+                    candidates.append((item, output.model_copy(update={"source_query": item.query})))
+
+            chunks = [
+                candidates[start : start + critic_batch_size]
+                for start in range(0, len(candidates), critic_batch_size)
+            ]
+            reviews = critic.batch(
+                [
+                    build_batch_review_messages(
+                        [reflection for _, reflection in chunk], [item.success_criteria for item, _ in chunk]
+                    )
+                    for chunk in chunks
+                ],
+                config=config,
+                return_exceptions=True,
+            )
+            result.critic_calls += len(chunks)
+            open_items = []
+            for chunk, review in zip(chunks, reviews):
+                by_index = {} if isinstance(review, Exception) else {entry.index: entry for entry in review.reviews}
+                for index, (item, reflection) in enumerate(chunk, start=1):
+                    entry: CriticReview | None = by_index.get(index)
+                    if entry is None:
+                        _log_failure("critic", item, review if isinstance(review, Exception) else "missing review")
+                        result.failed += 1
+                    elif entry.decision == "APPROVE":
+                        impact = max(1, min(5, entry.impact_score or 1))
+                        if impact >= MIN_IMPACT_SCORE:
+                            approved.append((item, reflection, impact))
+                        else:
+                            result.skipped += 1
+                            done.append(item.id)
+                    elif entry.decision == "REVISE" and attempt < max_attempts:
+                        feedback[item.id] = entry.feedback
+                        open_items.append(item)
+                    else:
+                        # DISCARD, or still REVISE after the last attempt.
+                        result.discarded += 1
+                        done.append(item.id)
+
+    if approved:
+        try:
+            result.stored = store.add_many(
+                [reflection for _, reflection, _ in approved],
+                impact_scores=[impact for _, _, impact in approved],
+                success_criteria=[item.success_criteria for item, _, _ in approved],
+            )
+            done.extend(item.id for item, _, _ in approved)
+        except Exception as exc:  # noqa: BLE001 - the interactions stay journaled for the next run
+            logger.error("reflect_batch.store_failed", f"Could not store {len(approved)} reflections: {exc}")
+            result.failed += len(approved)
+    journal.complete(done)
+    logger.info(
+        "reflect_batch.done",
+        f"Processed {result.interactions} interactions: {result.stored} stored, {result.skipped} below impact "
+        f"{MIN_IMPACT_SCORE}, {result.discarded} discarded, {result.failed} left for retry "
+        f"({result.reflector_calls} reflector / {result.critic_calls} critic calls).",
+        style="green",
+        **vars(result),
+    )
+    return result
+
+
+def _log_failure(stage: str, item: Interaction, error: object) -> None:
+    logger.warning(
+        "reflect_batch.failed",
+        f"{stage.capitalize()} failed for interaction {item.id}: {error}",
+        stage=stage,
+        interaction=item.id,
+    )
+
+
+__all__ = ["BatchReflectionResult", "reflect_batch"]
@@ -0,0 +1,44 @@
+"""Durable LangGraph checkpoints so interrupted runs resume from the last completed node."""
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from uuid import uuid4
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+# Pydantic models stored on AgentState; checkpoints may only revive these types.
+_STATE_TYPES = [
+    ("srl_agents.state", "LearningContext"),
+    ("srl_agents.state", "ReflectionOutput"),
+]
+
+
+def open_sqlite_checkpointer(path: str | Path) -> SqliteSaver:
+    """Return a SQLite checkpointer at ``path`` that can deserialize SRL state models."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    return SqliteSaver(conn, serde=JsonPlusSerializer(allowed_msgpack_modules=_STATE_TYPES))
+
+
+def new_thread_id(prefix: str = "run") -> str:
+    return f"{prefix}-{uuid4().hex[:12]}"
+
+
+def thread_config(thread_id: str) -> RunnableConfig:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def latest_thread_id(checkpointer: BaseCheckpointSaver) -> str | None:
+    """Return the thread id of the most recently written checkpoint, if any."""
+    latest = next(iter(checkpointer.list(None, limit=1)), None)
+    if latest is None:
+        return None
+    return latest.config["configurable"].get("thread_id")
+
+
+__all__ = ["latest_thread_id", "new_thread_id", "open_sqlite_checkpointer", "thread_config"]
@@ -1,13 +1,47 @@
 """Centralized configuration helpers for LangGraph application."""
 from __future__ import annotations
 
+import math
 import os
 from functools import lru_cache
 from pathlib import Path
+from typing import Callable
 
+import httpx
 from chromadb import PersistentClient
 from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from .checkpointing import open_sqlite_checkpointer
+from .http_transport import TransportSettings, build_async_http_client, build_http_client
+from .ivf_index import IVFIndex
+from .llm_cache import SQLiteLLMCache
+from .memory import MemoryStore
+from .memory_shards import ShardedMemoryStore
+from .model_tiers import ModelSettings, load_model_config, resolve_model_settings
+from .query_refiner import build_query_refiner
+from .rate_limit import (
+    ChatRateLimiter,
+    RateLimitCallbackHandler,
+    RateLimitedEmbeddings,
+    RateLimiter,
+    async_http_event_hooks,
+    http_event_hooks,
+)
+from .reflection_journal import InteractionJournal
+from .research_policy import ResearchPolicy
+from .retrieval_cache import RetrievalCache
+from .retrieval_log import RetrievalLog
+from .snapshot import warm_start as warm_start_from_snapshot
+from .tools.providers import SearchProvider, build_search_provider
+from .tools.resilience import CircuitBreaker
+from .tools.search_cache import WebSearchCache
+from .tools.web_search import WebSearchTool
+from .vector_index import HnswSettings
+from .write_behind import WriteBehindBuffer
 
 # Load environment variables once at import time so CLI users can rely on .env files
 load_dotenv()
@@ -16,18 +50,334 @@ DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
 DEFAULT_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0"))
 DEFAULT_EMBED_MODEL = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-small")
 CHROMA_DIR = Path(os.getenv("CHROMA_PERSIST_DIR", ".chroma"))
+MEMORY_HNSW_SPACE = os.getenv("MEMORY_HNSW_SPACE", "cosine")
+MEMORY_HNSW_M = int(os.getenv("MEMORY_HNSW_M", "16"))
+MEMORY_HNSW_EF_CONSTRUCTION = int(os.getenv("MEMORY_HNSW_EF_CONSTRUCTION", "100"))
+MEMORY_HNSW_EF_SEARCH = int(os.getenv("MEMORY_HNSW_EF_SEARCH", "100"))
+MEMORY_SHARD_BY_TOPIC = os.getenv("MEMORY_SHARD_BY_TOPIC", "0").lower() in ("1", "true", "yes")
+MEMORY_ROUTE_SHARDS = int(os.getenv("MEMORY_ROUTE_SHARDS", "2"))
+MEMORY_IVF = os.getenv("MEMORY_IVF", "0").lower() in ("1", "true", "yes")
+MEMORY_IVF_PATH = Path(os.getenv("MEMORY_IVF_PATH", str(CHROMA_DIR / "memory-ivf.npz")))
+MEMORY_IVF_CLUSTERS = int(os.getenv("MEMORY_IVF_CLUSTERS", "0"))
+MEMORY_IVF_NPROBE = int(os.getenv("MEMORY_IVF_NPROBE", "8"))
+MEMORY_IVF_MIN_RECORDS = int(os.getenv("MEMORY_IVF_MIN_RECORDS", "5000"))
+MEMORY_SNAPSHOT = os.getenv("MEMORY_SNAPSHOT")
+# Progress of a background snapshot restore, so one cut short by a restart resumes.
+MEMORY_SNAPSHOT_MARKER = Path(os.getenv("MEMORY_SNAPSHOT_MARKER", str(CHROMA_DIR / "snapshot-backfill.json")))
+# Rendered memory searches kept per process until the next memory write; 0 disables the cache.
+MEMORY_SEARCH_CACHE_SIZE = int(os.getenv("MEMORY_SEARCH_CACHE_SIZE", "256"))
+# Rolling retrieval log read by ``memory_cli.py stats``; set MEMORY_RETRIEVAL_LOG= (empty) to disable it.
+MEMORY_RETRIEVAL_LOG = os.getenv("MEMORY_RETRIEVAL_LOG", str(CHROMA_DIR / "retrieval-log.jsonl"))
+MEMORY_RETRIEVAL_LOG_SIZE = int(os.getenv("MEMORY_RETRIEVAL_LOG_SIZE", "10000"))
+MEMORY_WRITE_BEHIND = os.getenv("MEMORY_WRITE_BEHIND", "0").lower() in ("1", "true", "yes")
+MEMORY_WRITE_BATCH = int(os.getenv("MEMORY_WRITE_BATCH", "16"))
+MEMORY_WRITE_DELAY = float(os.getenv("MEMORY_WRITE_DELAY", "2"))
+MEMORY_WRITE_JOURNAL = Path(os.getenv("MEMORY_WRITE_JOURNAL", str(CHROMA_DIR / "memory-journal.jsonl")))
+# Opt-in exact-match LLM cache; leave LLM_CACHE_PATH unset to always call the API.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "256"))
+# Per-node prompt context budgets (tokens); 0 disables trimming for that node.
+ACTOR_CONTEXT_TOKENS = int(os.getenv("ACTOR_CONTEXT_TOKENS", "3000"))
+REFLECTOR_CONTEXT_TOKENS = int(os.getenv("REFLECTOR_CONTEXT_TOKENS", "2000"))
+CONTEXT_TOKENIZER = os.getenv("CONTEXT_TOKENIZER", "approx")
+# Memory query refinement: "llm" (chat rewrite), "local" (rule-based, no API call) or "none".
+QUERY_REFINER = os.getenv("SRL_QUERY_REFINER", "llm")
+# Return the memory search query from the learning-context call instead of a separate refiner call.
+FUSED_LEARNING_CONTEXT = os.getenv("SRL_FUSED_LEARNING_CONTEXT", "0").lower() in ("1", "true", "yes")
+# End runs after the Actor and journal them for `memory_cli.py reflect-batch` instead of reflecting inline.
+DEFERRED_REFLECTION = os.getenv("SRL_DEFERRED_REFLECTION", "0").lower() in ("1", "true", "yes")
+REFLECTION_JOURNAL = Path(os.getenv("SRL_REFLECTION_JOURNAL", str(CHROMA_DIR / "reflection-journal.jsonl")))
+REFLECT_BATCH_CONCURRENCY = int(os.getenv("SRL_REFLECT_BATCH_CONCURRENCY", "4"))
+# Reflections reviewed per Critic call in batch mode.
+CRITIC_BATCH_SIZE = int(os.getenv("SRL_CRITIC_BATCH_SIZE", "5"))
+# Forethought skips web search when a retrieved memory is at least this similar (see research_policy).
+RESEARCH_MIN_SIMILARITY = float(os.getenv("RESEARCH_MIN_SIMILARITY", "0.5"))
+# Goals asking for current information ("latest", "news", ...) need a near-duplicate memory instead.
+RESEARCH_FRESH_SIMILARITY = float(os.getenv("RESEARCH_FRESH_SIMILARITY", "0.8"))
+# Strong matches whose critic impact scores are all below this do not count.
+RESEARCH_MIN_IMPACT = int(os.getenv("RESEARCH_MIN_IMPACT", "2"))
+# Web search result cache: TTL in seconds (0 disables), shorter TTL for time-sensitive goals.
+WEB_SEARCH_CACHE_TTL = float(os.getenv("WEB_SEARCH_CACHE_TTL", "3600"))
+WEB_SEARCH_CACHE_FRESH_TTL = float(os.getenv("WEB_SEARCH_CACHE_FRESH_TTL", "300"))
+WEB_SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("WEB_SEARCH_CACHE_MAX_ENTRIES", "256"))
+WEB_SEARCH_CACHE_PATH = os.getenv("WEB_SEARCH_CACHE_PATH")
+# Seconds to wait for concurrent web search query variants before using partial results.
+WEB_SEARCH_TIMEOUT = float(os.getenv("WEB_SEARCH_TIMEOUT", "10"))
+# Search backend: "duckduckgo" or "local" (BM25 over WEB_SEARCH_LOCAL_INDEX, a JSONL file or directory).
+WEB_SEARCH_PROVIDER = os.getenv("WEB_SEARCH_PROVIDER", "duckduckgo")
+WEB_SEARCH_LOCAL_INDEX = os.getenv("WEB_SEARCH_LOCAL_INDEX")
+# Hard per-call deadline, hedge after this latency quantile (0 disables) and circuit breaker.
+WEB_SEARCH_DEADLINE = float(os.getenv("WEB_SEARCH_DEADLINE", "8"))
+WEB_SEARCH_HEDGE_PERCENTILE = float(os.getenv("WEB_SEARCH_HEDGE_PERCENTILE", "0.9"))
+WEB_SEARCH_BREAKER_FAILURES = int(os.getenv("WEB_SEARCH_BREAKER_FAILURES", "5"))
+WEB_SEARCH_BREAKER_COOLDOWN = float(os.getenv("WEB_SEARCH_BREAKER_COOLDOWN", "60"))
+CHECKPOINT_DB = Path(os.getenv("SRL_CHECKPOINT_DB", ".checkpoints/srl.sqlite"))
+# Process-wide OpenAI budget shared by chat and embedding calls; unset means unlimited.
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", "0"))
+OPENAI_TPM = float(os.getenv("OPENAI_TPM", "0"))
+OPENAI_EST_TOKENS_PER_CALL = int(os.getenv("OPENAI_EST_TOKENS_PER_CALL", "1500"))
+# Shared keep-alive HTTP pool used by both chat and embedding clients.
+OPENAI_HTTP_MAX_CONNECTIONS = int(os.getenv("OPENAI_HTTP_MAX_CONNECTIONS", "20"))
+OPENAI_HTTP_MAX_KEEPALIVE = int(os.getenv("OPENAI_HTTP_MAX_KEEPALIVE", "10"))
+OPENAI_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_HTTP_KEEPALIVE_EXPIRY", "120"))
+OPENAI_HTTP_CONNECT_TIMEOUT = float(os.getenv("OPENAI_HTTP_CONNECT_TIMEOUT", "5"))
+OPENAI_HTTP_READ_TIMEOUT = float(os.getenv("OPENAI_HTTP_READ_TIMEOUT", "60"))
+OPENAI_HTTP2 = os.getenv("OPENAI_HTTP2", "0").lower() in ("1", "true", "yes")
+# Optional TOML file with per-node model tiers; SRL_<NODE>_MODEL etc. override it.
+MODEL_CONFIG_PATH = os.getenv("SRL_MODEL_CONFIG")
+
+
+@lru_cache(maxsize=None)
+def get_llm(node: str | None = None) -> ChatOpenAI:
+    """Return the ChatOpenAI client for ``node`` (the global default when omitted).
+
+    Nodes whose resolved settings match share one client instance.
+    """
+    return _build_llm(get_model_settings(node))
+
+
+@lru_cache(maxsize=None)
+def get_model_settings(node: str | None = None) -> ModelSettings:
+    """Resolve the model, temperature and timeout for ``node`` from env and ``SRL_MODEL_CONFIG``."""
+    return resolve_model_settings(
+        node,
+        ModelSettings(model=DEFAULT_MODEL, temperature=DEFAULT_TEMPERATURE),
+        load_model_config(MODEL_CONFIG_PATH),
+        os.environ,
+    )
+
+
+@lru_cache(maxsize=None)
+def _build_llm(settings: ModelSettings) -> ChatOpenAI:
+    limiter = get_rate_limiter()
+    transport = _transport_kwargs(settings.timeout)
+    if limiter is None:
+        return ChatOpenAI(
+            model=settings.model, temperature=settings.temperature, cache=get_llm_cache(), **transport
+        )
+    return ChatOpenAI(
+        model=settings.model,
+        temperature=settings.temperature,
+        cache=get_llm_cache(),
+        rate_limiter=ChatRateLimiter(limiter, estimated_tokens=OPENAI_EST_TOKENS_PER_CALL),
+        callbacks=[RateLimitCallbackHandler(limiter, estimated_tokens=OPENAI_EST_TOKENS_PER_CALL)],
+        **transport,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> SQLiteLLMCache | None:
+    """Return the shared on-disk LLM cache, or ``None`` when caching is disabled."""
+    if not LLM_CACHE_PATH:
+        return None
+    return SQLiteLLMCache(
+        LLM_CACHE_PATH,
+        max_entries=LLM_CACHE_MAX_ENTRIES or None,
+        max_bytes=int(LLM_CACHE_MAX_MB * 1024 * 1024) or None,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_web_search_cache() -> WebSearchCache | None:
+    """Return the shared web search result cache, or ``None`` when ``WEB_SEARCH_CACHE_TTL`` is 0."""
+    if WEB_SEARCH_CACHE_TTL <= 0:
+        return None
+    return WebSearchCache(
+        ttl_seconds=WEB_SEARCH_CACHE_TTL,
+        fresh_ttl_seconds=min(WEB_SEARCH_CACHE_FRESH_TTL, WEB_SEARCH_CACHE_TTL),
+        max_entries=WEB_SEARCH_CACHE_MAX_ENTRIES,
+        path=WEB_SEARCH_CACHE_PATH or None,
+    )
 
 
 @lru_cache(maxsize=1)
-def get_llm() -> ChatOpenAI:
-    """Return a singleton ChatOpenAI client configured via environment variables."""
-    return ChatOpenAI(model=DEFAULT_MODEL, temperature=DEFAULT_TEMPERATURE)
+def get_search_provider() -> SearchProvider:
+    """Return the configured web search backend."""
+    return build_search_provider(
+        WEB_SEARCH_PROVIDER,
+        local_index=WEB_SEARCH_LOCAL_INDEX,
+        timeout=max(1, math.ceil(WEB_SEARCH_DEADLINE or 10)),
+    )
 
 
 @lru_cache(maxsize=1)
-def get_embeddings() -> OpenAIEmbeddings:
+def get_web_search_tool() -> WebSearchTool:
+    """Return the shared DuckDuckGo tool so cache, latency history and breaker state are process-wide."""
+    return WebSearchTool(
+        provider=get_search_provider(),
+        cache=get_web_search_cache(),
+        deadline=WEB_SEARCH_DEADLINE or None,
+        hedge_percentile=WEB_SEARCH_HEDGE_PERCENTILE or None,
+        breaker=(
+            CircuitBreaker(WEB_SEARCH_BREAKER_FAILURES, WEB_SEARCH_BREAKER_COOLDOWN)
+            if WEB_SEARCH_BREAKER_FAILURES > 0
+            else None
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_embeddings() -> Embeddings:
     """Return a singleton embedding client for semantic memory search."""
-    return OpenAIEmbeddings(model=DEFAULT_EMBED_MODEL)
+    embeddings = OpenAIEmbeddings(model=DEFAULT_EMBED_MODEL, **_transport_kwargs())
+    limiter = get_rate_limiter()
+    return RateLimitedEmbeddings(embeddings, limiter) if limiter else embeddings
+
+
+def get_transport_settings() -> TransportSettings:
+    return TransportSettings(
+        max_connections=OPENAI_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=OPENAI_HTTP_KEEPALIVE_EXPIRY,
+        connect_timeout=OPENAI_HTTP_CONNECT_TIMEOUT,
+        read_timeout=OPENAI_HTTP_READ_TIMEOUT,
+        http2=OPENAI_HTTP2,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """Return the process-wide pooled HTTP client shared by all OpenAI SDK clients.
+
+    With a rate limiter configured, the SDK's own retries are admitted through it.
+    """
+    limiter = get_rate_limiter()
+    return build_http_client(get_transport_settings(), event_hooks=http_event_hooks(limiter) if limiter else None)
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client() -> httpx.AsyncClient:
+    """Async counterpart of ``get_http_client`` used by ``ainvoke``/``aembed_*``."""
+    limiter = get_rate_limiter()
+    return build_async_http_client(
+        get_transport_settings(), event_hooks=async_http_event_hooks(limiter) if limiter else None
+    )
+
+
+def _transport_kwargs(read_timeout: float | None = None) -> dict:
+    # langchain-openai passes request_timeout through explicitly, so the pool's
+    # timeout must be repeated here or the SDK would fall back to none at all.
+    timeout = get_transport_settings().timeout
+    if read_timeout is not None:
+        timeout = httpx.Timeout(
+            connect=timeout.connect, read=read_timeout, write=timeout.write, pool=timeout.pool
+        )
+    return {
+        "http_client": get_http_client(),
+        "http_async_client": get_async_http_client(),
+        "request_timeout": timeout,
+    }
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> RateLimiter | None:
+    """Return the process-wide OpenAI rate limiter, or ``None`` when no budget is configured."""
+    if not (OPENAI_RPM or OPENAI_TPM):
+        return None
+    return RateLimiter(requests_per_minute=OPENAI_RPM or None, tokens_per_minute=OPENAI_TPM or None)
+
+
+@lru_cache(maxsize=1)
+def get_checkpointer() -> SqliteSaver:
+    """Return the shared SQLite checkpointer used to resume interrupted runs."""
+    return open_sqlite_checkpointer(CHECKPOINT_DB)
+
+
+def get_hnsw_settings() -> HnswSettings:
+    """Return the memory collection's distance space and HNSW parameters from the environment."""
+    return HnswSettings(
+        space=MEMORY_HNSW_SPACE.lower(),
+        max_neighbors=MEMORY_HNSW_M,
+        ef_construction=MEMORY_HNSW_EF_CONSTRUCTION,
+        ef_search=MEMORY_HNSW_EF_SEARCH,
+    )
+
+
+def get_research_policy() -> ResearchPolicy:
+    """Return forethought's web research thresholds from the environment."""
+    return ResearchPolicy(
+        min_similarity=RESEARCH_MIN_SIMILARITY,
+        fresh_similarity=RESEARCH_FRESH_SIMILARITY,
+        min_impact=RESEARCH_MIN_IMPACT,
+    )
+
+
+def build_configured_query_refiner(llm: BaseChatModel | None = None) -> Callable[[str], str] | None:
+    """Return the ``SRL_QUERY_REFINER`` refiner; the ``llm`` mode uses ``llm`` or the ``query_refiner`` tier.
+
+    Stores that embed reflections must use it too, so memories and searches are refined alike.
+    """
+    if QUERY_REFINER.lower() != "llm":
+        return build_query_refiner(QUERY_REFINER)
+    return build_query_refiner(QUERY_REFINER, llm or get_llm("query_refiner"))
+
+
+def build_memory_store(query_refiner: Callable[[str], str] | None = None, *, warm_start: bool = True) -> MemoryStore:
+    """Return a memory store on the shared Chroma client, topic-sharded when ``MEMORY_SHARD_BY_TOPIC`` is set
+    (existing unsharded memories are migrated into their shards first).
+
+    With ``warm_start``, an empty store warm-starts from the ``MEMORY_SNAPSHOT``
+    snapshot: searchable at once, with the rows inserted into Chroma in the
+    background. A backfill left unfinished at ``MEMORY_SNAPSHOT_MARKER`` resumes.
+    """
+    kwargs = {
+        "embedder": get_embeddings(),
+        "client": get_vector_client(),
+        "hnsw": get_hnsw_settings(),
+        "query_refiner": query_refiner,
+        "write_buffer": get_write_buffer(),
+        "cache": RetrievalCache(MEMORY_SEARCH_CACHE_SIZE) if MEMORY_SEARCH_CACHE_SIZE > 0 else None,
+        "retrieval_log": get_retrieval_log(),
+    }
+    if MEMORY_SHARD_BY_TOPIC:
+        store = ShardedMemoryStore(route_shards=MEMORY_ROUTE_SHARDS, **kwargs)
+        # Memories written before sharding was enabled would otherwise be invisible.
+        store.migrate_legacy()
+    else:
+        store = MemoryStore(ivf=get_ivf_index(), **kwargs)
+    if warm_start and MEMORY_SNAPSHOT and Path(MEMORY_SNAPSHOT).exists():
+        warm_start_from_snapshot(store, MEMORY_SNAPSHOT, marker=MEMORY_SNAPSHOT_MARKER)
+    return store
+
+
+@lru_cache(maxsize=1)
+def get_reflection_journal() -> InteractionJournal:
+    """Return the journal of interactions awaiting batch reflection."""
+    return InteractionJournal(REFLECTION_JOURNAL)
+
+
+@lru_cache(maxsize=1)
+def get_retrieval_log() -> RetrievalLog | None:
+    """Return the process-wide retrieval log, or ``None`` when ``MEMORY_RETRIEVAL_LOG`` is empty."""
+    if not MEMORY_RETRIEVAL_LOG:
+        return None
+    return RetrievalLog(MEMORY_RETRIEVAL_LOG, max_entries=MEMORY_RETRIEVAL_LOG_SIZE)
+
+
+@lru_cache(maxsize=1)
+def get_write_buffer() -> WriteBehindBuffer | None:
+    """Return the process-wide write-behind buffer, or ``None`` unless ``MEMORY_WRITE_BEHIND`` is set."""
+    if not MEMORY_WRITE_BEHIND:
+        return None
+    return WriteBehindBuffer(
+        max_batch=MEMORY_WRITE_BATCH,
+        max_delay=MEMORY_WRITE_DELAY,
+        journal_path=MEMORY_WRITE_JOURNAL,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_ivf_index() -> IVFIndex | None:
+    """Return the shared two-stage centroid index, or ``None`` unless ``MEMORY_IVF`` is set."""
+    if not MEMORY_IVF:
+        return None
+    return IVFIndex(
+        n_clusters=MEMORY_IVF_CLUSTERS,
+        nprobe=MEMORY_IVF_NPROBE,
+        min_records=MEMORY_IVF_MIN_RECORDS,
+        path=MEMORY_IVF_PATH,
+    )
 
 
 @lru_cache(maxsize=1)
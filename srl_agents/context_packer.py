@@ -0,0 +1,151 @@
+"""Token-budgeted packing of retrieved context for LLM prompts."""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Iterable, Sequence
+
+TokenCounter = Callable[[str], int]
+
+_MEMORY_SCORE = re.compile(r"\(score: (-?\d+(?:\.\d+)?)\)")
+_MEMORY_IMPACT = re.compile(r"\| impact: (\d+)")
+
+
+def approximate_tokens(text: str) -> int:
+    """Cheap token estimate: ~4 ASCII characters per token, one token per other character."""
+    if not text:
+        return 0
+    ascii_chars = sum(1 for char in text if char.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+@lru_cache(maxsize=4)
+def _tiktoken_encoding(model: str):
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def get_token_counter(tokenizer: str = "approx", model: str = "gpt-4o") -> TokenCounter:
+    """Return a token counter; ``tokenizer="tiktoken"`` falls back to the approximation if unavailable."""
+    if tokenizer == "tiktoken":
+        try:
+            encoding = _tiktoken_encoding(model)
+        except Exception:  # pragma: no cover - missing package or offline BPE download
+            return approximate_tokens
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    return approximate_tokens
+
+
+@dataclass
+class ContextItem:
+    """A single prompt fragment (memory line, web hit, reasoning step) competing for budget."""
+
+    text: str
+    source: str
+    priority: float = 0.0
+    tokens: int = 0
+
+
+@dataclass
+class PackedContext:
+    """Result of packing: kept items in original order plus what was trimmed."""
+
+    kept: list[ContextItem] = field(default_factory=list)
+    dropped: list[ContextItem] = field(default_factory=list)
+    budget: int | None = None
+
+    @property
+    def tokens(self) -> int:
+        return sum(item.tokens for item in self.kept)
+
+    def text(self, source: str, *, separator: str = "\n") -> str:
+        return separator.join(item.text for item in self.kept if item.source == source)
+
+    def items(self, source: str) -> list[str]:
+        return [item.text for item in self.kept if item.source == source]
+
+    def describe_dropped(self) -> str:
+        counts: dict[str, int] = {}
+        for item in self.dropped:
+            counts[item.source] = counts.get(item.source, 0) + 1
+        parts = ", ".join(f"{count} {source}" for source, count in counts.items())
+        dropped_tokens = sum(item.tokens for item in self.dropped)
+        return f"dropped {parts} (~{dropped_tokens} tokens) to fit {self.budget}-token budget"
+
+
+class ContextPacker:
+    """Greedily keep the highest-priority items that fit within a token budget."""
+
+    def __init__(self, budget: int | None, *, token_counter: TokenCounter = approximate_tokens):
+        self.budget = budget if budget and budget > 0 else None
+        self.token_counter = token_counter
+
+    def pack(self, items: Iterable[ContextItem]) -> PackedContext:
+        indexed = list(enumerate(items))
+        for _, item in indexed:
+            item.tokens = self.token_counter(item.text)
+        if self.budget is None:
+            return PackedContext(kept=[item for _, item in indexed])
+
+        remaining = self.budget
+        kept_indexes: set[int] = set()
+        for index, item in sorted(indexed, key=lambda pair: (-pair[1].priority, pair[0])):
+            if item.tokens <= remaining:
+                kept_indexes.add(index)
+                remaining -= item.tokens
+        return PackedContext(
+            kept=[item for index, item in indexed if index in kept_indexes],
+            dropped=[item for index, item in indexed if index not in kept_indexes],
+            budget=self.budget,
+        )
+
+
+def memory_items(memories: str, *, base_priority: float = 1.0) -> list[ContextItem]:
+    """Split formatted memory lines, prioritizing by similarity score and impact."""
+    items: list[ContextItem] = []
+    for line in _non_empty_lines(memories):
+        score_match = _MEMORY_SCORE.search(line)
+        impact_match = _MEMORY_IMPACT.search(line)
+        score = float(score_match.group(1)) if score_match else 0.0
+        impact = int(impact_match.group(1)) if impact_match else 0
+        items.append(ContextItem(line, "memory", base_priority + score + 0.1 * impact))
+    return items
+
+
+def web_items(web_results: str, *, base_priority: float = 0.5) -> list[ContextItem]:
+    """Split web bullets, preferring higher-ranked hits."""
+    lines = _non_empty_lines(web_results)
+    return [
+        ContextItem(line, "web", base_priority + (len(lines) - rank) / (len(lines) + 1))
+        for rank, line in enumerate(lines)
+    ]
+
+
+def trace_items(actor_trace: Sequence[str], *, base_priority: float = 3.0) -> list[ContextItem]:
+    """Wrap actor reasoning steps; earlier steps win ties since later ones build on them."""
+    return [
+        ContextItem(step, "trace", base_priority - rank / (len(actor_trace) + 1))
+        for rank, step in enumerate(actor_trace)
+    ]
+
+
+def _non_empty_lines(text: str) -> list[str]:
+    return [line for line in (text or "").splitlines() if line.strip()]
+
+
+__all__ = [
+    "ContextItem",
+    "ContextPacker",
+    "PackedContext",
+    "TokenCounter",
+    "approximate_tokens",
+    "get_token_counter",
+    "memory_items",
+    "trace_items",
+    "web_items",
+]
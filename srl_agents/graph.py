@@ -1,22 +1,54 @@
 """Graph assembly helpers."""
 from __future__ import annotations
 
+from langchain_core.language_models import BaseChatModel
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
 
-from .config import get_embeddings, get_llm, get_vector_client
-from .logging import console
+from .config import (
+    ACTOR_CONTEXT_TOKENS,
+    CONTEXT_TOKENIZER,
+    DEFERRED_REFLECTION,
+    FUSED_LEARNING_CONTEXT,
+    REFLECTOR_CONTEXT_TOKENS,
+    WEB_SEARCH_TIMEOUT,
+    build_configured_query_refiner,
+    build_memory_store,
+    get_llm,
+    get_model_settings,
+    get_reflection_journal,
+    get_research_policy,
+    get_web_search_tool,
+)
+from .context_packer import ContextPacker, get_token_counter
+from .instrumentation import Profiler
+from .logging import logger
 from .memory import MemoryStore
 from .nodes.actor import build_actor_node
 from .nodes.critic import build_critic_node
 from .nodes.forethought import build_forethought_node
+from .nodes.journal import build_journal_node
 from .nodes.learning_context import build_learning_context_node
 from .nodes.reflector import build_reflector_node
 from .nodes.store import build_store_node
 from .nodes.web_search import build_web_search_node
-from .query_refiner import LLMQueryRefiner
+from .rate_limit import Priority, prioritized
+from .reflection_journal import InteractionJournal
 from .state import AgentState
 from .tools.web_search import WebSearchTool
 
+# Scheduling class for the OpenAI calls each node makes under a shared rate limit.
+NODE_PRIORITIES = {
+    "learning_context": Priority.INTERACTIVE,
+    "forethought": Priority.INTERACTIVE,
+    "web_search": Priority.INTERACTIVE,
+    "actor": Priority.ACTOR,
+    "reflector": Priority.BACKGROUND,
+    "critic": Priority.BACKGROUND,
+    "store": Priority.BACKGROUND,
+    "journal": Priority.BACKGROUND,
+}
+
 
 def _router(state: AgentState):
     decision = state.get("review_decision", "")
@@ -28,7 +60,7 @@ def _router(state: AgentState):
         return END
     if decision == "REVISE":
         if retry_count >= 3:
-            console.print("[red]Exceeded maximum retry count, abandoning record.[/red]")
+            logger.error("graph.retry_exhausted", "Exceeded maximum retry count, abandoning record.")
             return END
         return "reflector"
     return END
@@ -38,24 +70,65 @@ def _route_after_forethought(state: AgentState):
     return "web_search" if state.get("needs_research") else "actor"
 
 
-def create_app(memory_store: MemoryStore | None = None):
-    """Compile and return the LangGraph application."""
-    llm = get_llm()
-    store = memory_store or MemoryStore(
-        embedder=get_embeddings(),
-        client=get_vector_client(),
-        query_refiner=LLMQueryRefiner(llm),
+def create_app(
+    memory_store: MemoryStore | None = None,
+    profiler: Profiler | None = None,
+    *,
+    llm: BaseChatModel | None = None,
+    web_search_tool: WebSearchTool | None = None,
+    checkpointer: BaseCheckpointSaver | None = None,
+    reflection_journal: InteractionJournal | None = None,
+):
+    """Compile and return the LangGraph application.
+
+    When ``profiler`` is provided, every node is wrapped to record wall time, LLM
+    token usage, and embedding/Chroma/web-search timings. Without ``llm`` each
+    stage gets its configured model tier (``config.get_llm(node)``); passing one
+    uses it for every stage. ``web_search_tool`` defaults to the shared DuckDuckGo tool.
+    With a ``checkpointer`` (e.g. ``config.get_checkpointer()``), state is saved after
+    every node; invoke with a ``thread_id`` and resume a failed run via
+    ``app.invoke(None, config)``.
+    With a ``reflection_journal`` (the configured one when ``SRL_DEFERRED_REFLECTION``
+    is set), runs end after the Actor and are journaled for ``memory_cli.py reflect-batch``.
+    """
+
+    def llm_for(node: str) -> BaseChatModel:
+        return llm or get_llm(node)
+
+    store = memory_store or build_memory_store(query_refiner=build_configured_query_refiner(llm))
+    web_search_tool = web_search_tool or get_web_search_tool()
+    if reflection_journal is None and DEFERRED_REFLECTION:
+        reflection_journal = get_reflection_journal()
+    actor_packer = ContextPacker(
+        ACTOR_CONTEXT_TOKENS,
+        token_counter=get_token_counter(CONTEXT_TOKENIZER, get_model_settings("actor").model),
+    )
+    reflector_packer = ContextPacker(
+        REFLECTOR_CONTEXT_TOKENS,
+        token_counter=get_token_counter(CONTEXT_TOKENIZER, get_model_settings("reflector").model),
     )
-    web_search_tool = WebSearchTool()
 
     workflow = StateGraph(AgentState)
-    workflow.add_node("learning_context", build_learning_context_node(llm))
-    workflow.add_node("forethought", build_forethought_node(store))
-    workflow.add_node("web_search", build_web_search_node(web_search_tool))
-    workflow.add_node("actor", build_actor_node(llm))
-    workflow.add_node("reflector", build_reflector_node(llm))
-    workflow.add_node("critic", build_critic_node(llm))
-    workflow.add_node("store", build_store_node(store))
+
+    def add_node(name: str, node) -> None:
+        node = prioritized(node, NODE_PRIORITIES[name])
+        workflow.add_node(name, profiler.wrap_node(name, node) if profiler else node)
+
+    add_node("learning_context", build_learning_context_node(llm_for("learning_context"), fused=FUSED_LEARNING_CONTEXT))
+    add_node(
+        "forethought",
+        build_forethought_node(
+            store, research_available=web_search_tool.available, policy=get_research_policy()
+        ),
+    )
+    add_node("web_search", build_web_search_node(web_search_tool, timeout=WEB_SEARCH_TIMEOUT or None))
+    add_node("actor", build_actor_node(llm_for("actor"), actor_packer))
+    if reflection_journal is None:
+        add_node("reflector", build_reflector_node(llm_for("reflector"), reflector_packer))
+        add_node("critic", build_critic_node(llm_for("critic")))
+        add_node("store", build_store_node(store))
+    else:
+        add_node("journal", build_journal_node(reflection_journal))
 
     workflow.add_edge(START, "learning_context")
     workflow.add_edge("learning_context", "forethought")
@@ -68,6 +141,11 @@ def create_app(memory_store: MemoryStore | None = None):
         },
     )
     workflow.add_edge("web_search", "actor")
+    if reflection_journal is not None:
+        workflow.add_edge("actor", "journal")
+        workflow.add_edge("journal", END)
+        return workflow.compile(checkpointer=checkpointer)
+
     workflow.add_edge("actor", "reflector")
     workflow.add_edge("reflector", "critic")
 
@@ -82,4 +160,4 @@ def create_app(memory_store: MemoryStore | None = None):
     )
 
     workflow.add_edge("store", END)
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
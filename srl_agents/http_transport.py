@@ -0,0 +1,90 @@
+"""Shared, keep-alive HTTP clients for the OpenAI chat and embedding SDK clients.
+
+By default every ``ChatOpenAI`` / ``OpenAIEmbeddings`` instance builds its own
+httpx pool with a short keep-alive, so bursts of calls after a pause pay a fresh
+TCP + TLS handshake. Routing both through one long-lived pool keeps warm
+connections to the API host available to every node.
+"""
+from __future__ import annotations
+
+import importlib.util
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import httpx
+
+from .logging import logger
+
+
+@dataclass(frozen=True)
+class TransportSettings:
+    """Connection pool and timeout settings for the shared OpenAI transport."""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 120.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0
+    http2: bool = False
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``pip install srl-agents[http2]``)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _use_http2(settings: TransportSettings) -> bool:
+    if settings.http2 and not http2_available():
+        logger.warning(
+            "http.http2_unavailable",
+            "HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1.",
+        )
+        return False
+    return settings.http2
+
+
+def build_http_client(
+    settings: TransportSettings | None = None, *, event_hooks: dict[str, list[Callable[..., Any]]] | None = None
+) -> httpx.Client:
+    """Return a pooled synchronous client configured from ``settings``."""
+    settings = settings or TransportSettings()
+    return httpx.Client(
+        limits=settings.limits, timeout=settings.timeout, http2=_use_http2(settings), event_hooks=event_hooks
+    )
+
+
+def build_async_http_client(
+    settings: TransportSettings | None = None, *, event_hooks: dict[str, list[Callable[..., Any]]] | None = None
+) -> httpx.AsyncClient:
+    """Return a pooled asynchronous client configured from ``settings``."""
+    settings = settings or TransportSettings()
+    return httpx.AsyncClient(
+        limits=settings.limits, timeout=settings.timeout, http2=_use_http2(settings), event_hooks=event_hooks
+    )
+
+
+__all__ = [
+    "TransportSettings",
+    "build_async_http_client",
+    "build_http_client",
+    "http2_available",
+]
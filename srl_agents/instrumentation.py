@@ -0,0 +1,283 @@
+"""Per-node latency and token-usage profiling for SRL graph runs."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.tracers.context import register_configure_hook
+from rich.console import Console
+from rich.table import Table
+
+# Dependency categories recorded via ``timed``; kept in this order in reports.
+DEPENDENCIES = ("embedding", "chroma_query", "chroma_write", "web_search", "rate_limit")
+
+
+@dataclass
+class NodeSpan:
+    """Measurements for a single node execution."""
+
+    node: str
+    run: str | None
+    started_at: float
+    wall_ms: float = 0.0
+    llm_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    dependency_calls: dict[str, int] = field(default_factory=dict)
+    dependency_ms: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+
+_current_span: ContextVar[NodeSpan | None] = ContextVar("srl_current_span", default=None)
+_usage_handler: ContextVar[BaseCallbackHandler | None] = ContextVar("srl_usage_handler", default=None)
+register_configure_hook(_usage_handler, inheritable=True)
+
+
+class _UsageHandler(BaseCallbackHandler):
+    """Attribute LLM calls and token usage to the node span active in this context."""
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        span = _current_span.get()
+        if span is None:
+            return
+        input_tokens, output_tokens = extract_token_usage(response)
+        span.llm_calls += 1
+        span.input_tokens += input_tokens
+        span.output_tokens += output_tokens
+
+
+_HANDLER = _UsageHandler()
+
+
+def extract_token_usage(response: LLMResult) -> tuple[int, int]:
+    """Return ``(input_tokens, output_tokens)`` reported for a chat/LLM result."""
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            if isinstance(generation, ChatGeneration) and isinstance(generation.message, AIMessage):
+                usage = generation.message.usage_metadata
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+    if not (input_tokens or output_tokens):
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        input_tokens = token_usage.get("prompt_tokens", 0) or 0
+        output_tokens = token_usage.get("completion_tokens", 0) or 0
+    return input_tokens, output_tokens
+
+
+@contextmanager
+def timed(dependency: str) -> Iterator[None]:
+    """Attribute the wall time of the enclosed block to ``dependency`` on the active span.
+
+    Outside a profiled node this is a near-free no-op, so library code can call it
+    unconditionally.
+    """
+    span = _current_span.get()
+    if span is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        span.dependency_calls[dependency] = span.dependency_calls.get(dependency, 0) + 1
+        span.dependency_ms[dependency] = span.dependency_ms.get(dependency, 0.0) + elapsed
+
+
+class Profiler:
+    """Collect ``NodeSpan`` records for every node wrapped via ``wrap_node``."""
+
+    def __init__(self) -> None:
+        self.spans: list[NodeSpan] = []
+        self._lock = threading.Lock()
+        self._run: str | None = None
+
+    @contextmanager
+    def run(self, label: str) -> Iterator[None]:
+        """Tag spans recorded inside the block with ``label`` (e.g., a scenario name)."""
+        previous, self._run = self._run, label
+        try:
+            yield
+        finally:
+            self._run = previous
+
+    def wrap_node(self, name: str, node: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        @wraps(node)
+        def profiled_node(state):
+            span = NodeSpan(node=name, run=self._run, started_at=time.time())
+            span_token = _current_span.set(span)
+            handler_token = _usage_handler.set(_HANDLER)
+            start = time.perf_counter()
+            try:
+                return node(state)
+            except Exception as exc:
+                span.error = f"{type(exc).__name__}: {exc}"
+                raise
+            finally:
+                span.wall_ms = (time.perf_counter() - start) * 1000
+                _usage_handler.reset(handler_token)
+                _current_span.reset(span_token)
+                with self._lock:
+                    self.spans.append(span)
+
+        return profiled_node
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Aggregate spans per node, in first-seen order."""
+        rows: dict[str, dict[str, Any]] = {}
+        for span in list(self.spans):
+            row = rows.setdefault(
+                span.node,
+                {
+                    "node": span.node,
+                    "calls": 0,
+                    "errors": 0,
+                    "wall_ms": 0.0,
+                    "llm_calls": 0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    **{f"{dep}_calls": 0 for dep in DEPENDENCIES},
+                    **{f"{dep}_ms": 0.0 for dep in DEPENDENCIES},
+                },
+            )
+            row["calls"] += 1
+            row["errors"] += 1 if span.error else 0
+            row["wall_ms"] += span.wall_ms
+            row["llm_calls"] += span.llm_calls
+            row["input_tokens"] += span.input_tokens
+            row["output_tokens"] += span.output_tokens
+            for dep, count in span.dependency_calls.items():
+                row[f"{dep}_calls"] = row.get(f"{dep}_calls", 0) + count
+                row[f"{dep}_ms"] = row.get(f"{dep}_ms", 0.0) + span.dependency_ms.get(dep, 0.0)
+        return list(rows.values())
+
+    def render_summary(self, console: Console) -> None:
+        rows = self.summary()
+        if not rows:
+            console.print("[yellow]No profiled node executions.[/yellow]")
+            return
+        table = Table(title="Node profile")
+        table.add_column("Node", style="bold")
+        table.add_column("Calls", justify="right")
+        table.add_column("Wall ms", justify="right")
+        table.add_column("Avg ms", justify="right")
+        table.add_column("LLM calls", justify="right")
+        table.add_column("Tokens in/out", justify="right")
+        table.add_column("Embed (n/ms)", justify="right")
+        table.add_column("Chroma ms", justify="right")
+        table.add_column("Web ms", justify="right")
+        table.add_column("Queue ms", justify="right")
+        totals = {"wall_ms": 0.0, "llm_calls": 0, "input_tokens": 0, "output_tokens": 0}
+        for row in rows:
+            for key in totals:
+                totals[key] += row[key]
+            table.add_row(
+                row["node"] + (f" [red]({row['errors']} err)[/red]" if row["errors"] else ""),
+                str(row["calls"]),
+                f"{row['wall_ms']:.1f}",
+                f"{row['wall_ms'] / row['calls']:.1f}",
+                str(row["llm_calls"]),
+                f"{row['input_tokens']}/{row['output_tokens']}",
+                f"{row['embedding_calls']}/{row['embedding_ms']:.1f}",
+                f"{row['chroma_query_ms'] + row['chroma_write_ms']:.1f}",
+                f"{row['web_search_ms']:.1f}",
+                f"{row['rate_limit_ms']:.1f}",
+            )
+        table.add_section()
+        table.add_row(
+            "[bold]total[/bold]",
+            str(sum(row["calls"] for row in rows)),
+            f"{totals['wall_ms']:.1f}",
+            "",
+            str(totals["llm_calls"]),
+            f"{totals['input_tokens']}/{totals['output_tokens']}",
+            "",
+            "",
+            "",
+            "",
+        )
+        console.print(table)
+
+    def write_trace(self, path: str | Path) -> None:
+        """Write every span plus the per-node summary as JSON."""
+        payload = {"spans": [asdict(span) for span in self.spans], "summary": self.summary()}
+        Path(path).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    def prometheus_text(self) -> str:
+        """Render cumulative counters in the Prometheus text exposition format."""
+        rows = self.summary()
+        lines: list[str] = []
+
+        def counter(name: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{{{labels}}} {value:g}" for labels, value in samples)
+
+        counter(
+            "srl_node_invocations_total",
+            "Number of node executions.",
+            [(f'node="{row["node"]}"', row["calls"]) for row in rows],
+        )
+        counter(
+            "srl_node_errors_total",
+            "Number of node executions that raised.",
+            [(f'node="{row["node"]}"', row["errors"]) for row in rows],
+        )
+        counter(
+            "srl_node_duration_seconds_total",
+            "Cumulative node wall time.",
+            [(f'node="{row["node"]}"', row["wall_ms"] / 1000) for row in rows],
+        )
+        counter(
+            "srl_llm_calls_total",
+            "Chat model calls issued from each node.",
+            [(f'node="{row["node"]}"', row["llm_calls"]) for row in rows],
+        )
+        counter(
+            "srl_llm_tokens_total",
+            "Chat model tokens reported in response metadata.",
+            [
+                (f'node="{row["node"]}",direction="{direction}"', row[f"{direction}_tokens"])
+                for row in rows
+                for direction in ("input", "output")
+            ],
+        )
+        counter(
+            "srl_dependency_calls_total",
+            "Calls to embedding, Chroma, web search backends and the rate limiter.",
+            [
+                (f'node="{row["node"]}",dependency="{dep}"', row[f"{dep}_calls"])
+                for row in rows
+                for dep in DEPENDENCIES
+                if row[f"{dep}_calls"]
+            ],
+        )
+        counter(
+            "srl_dependency_duration_seconds_total",
+            "Cumulative time spent in embedding, Chroma, web search backends and rate-limit queues.",
+            [
+                (f'node="{row["node"]}",dependency="{dep}"', row[f"{dep}_ms"] / 1000)
+                for row in rows
+                for dep in DEPENDENCIES
+                if row[f"{dep}_calls"]
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path) -> None:
+        Path(path).write_text(self.prometheus_text(), encoding="utf-8")
+
+
+__all__ = ["DEPENDENCIES", "NodeSpan", "Profiler", "extract_token_usage", "timed"]
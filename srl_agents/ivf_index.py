@@ -0,0 +1,210 @@
+"""Two-stage (IVF) retrieval over memory embeddings with NumPy k-means centroids.
+
+Embeddings are grouped around ``n_clusters`` spherical k-means centroids. A
+search scores the query against every centroid, keeps the ``nprobe`` closest
+clusters and computes exact cosine similarity only for their members, so the
+fine stage touches roughly ``nprobe / n_clusters`` of the store.
+
+Only the centroids are persisted (``path``, ``.npz``); member vectors are read
+back from Chroma and assigned to the nearest centroid when the index is loaded.
+New memories are assigned incrementally on ``add``; once the store has grown by
+``rebuild_growth`` since the last build, ``needs_rebuild`` asks for a fresh
+k-means pass (``MemoryStore.rebuild_index`` / ``memory_cli.py rebuild-index``).
+"""
+from __future__ import annotations
+
+import math
+import threading
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+# Cap on vectors used to fit centroids; every vector is still assigned afterwards.
+_TRAINING_POINTS_PER_CLUSTER = 256
+_CHUNK = 20000
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), _CHUNK):
+        labels[start : start + _CHUNK] = np.argmax(vectors[start : start + _CHUNK] @ centroids.T, axis=1)
+    return labels
+
+
+def kmeans(vectors: np.ndarray, n_clusters: int, *, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Fit unit-length spherical k-means centroids to unit-length ``vectors``."""
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _nearest(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        counts = np.bincount(labels, minlength=n_clusters)
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = _normalize(sums)
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """Inverted-file index: centroid lists of ``(memory id, unit vector)`` members."""
+
+    def __init__(
+        self,
+        *,
+        n_clusters: int = 0,
+        nprobe: int = 8,
+        min_records: int = 5000,
+        rebuild_growth: float = 0.25,
+        iterations: int = 10,
+        path: str | Path | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.n_clusters = n_clusters
+        self.nprobe = nprobe
+        self.min_records = min_records
+        self.rebuild_growth = rebuild_growth
+        self.iterations = iterations
+        self.path = Path(path) if path else None
+        self.seed = seed
+        self.centroids: np.ndarray | None = None
+        self.built_size = 0
+        self._lock = threading.Lock()
+        self._ids: list[list[str]] = []
+        self._vectors: list[np.ndarray] = []
+        self._cluster_of: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._cluster_of)
+
+    @property
+    def ready(self) -> bool:
+        """True once centroids are fitted and at least one memory is assigned to them."""
+        return self.centroids is not None and bool(self._cluster_of)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """True once the index has grown by ``rebuild_growth`` since centroids were fitted."""
+        return self.ready and len(self) - self.built_size > self.rebuild_growth * max(self.built_size, 1)
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Fit centroids to ``vectors`` (``sqrt(n)`` clusters unless configured) and assign all of them."""
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        n_clusters = self.n_clusters or max(1, int(math.sqrt(len(vectors))))
+        rng = np.random.default_rng(self.seed)
+        sample = vectors
+        if len(vectors) > n_clusters * _TRAINING_POINTS_PER_CLUSTER:
+            sample = vectors[rng.choice(len(vectors), n_clusters * _TRAINING_POINTS_PER_CLUSTER, replace=False)]
+        centroids = kmeans(sample, n_clusters, iterations=self.iterations, seed=self.seed)
+        with self._lock:
+            self.centroids = centroids
+            self._assign_all(ids, vectors)
+            self.built_size = len(self._cluster_of)
+        self.save()
+
+    def assign(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Replace all members with ``vectors`` assigned to the current centroids (used after ``load``)."""
+        with self._lock:
+            self._assign_all(ids, _normalize(np.asarray(vectors, dtype=np.float32)))
+
+    def add(self, memory_id: str, vector: Sequence[float] | np.ndarray) -> None:
+        """Assign one new memory to its nearest centroid (no-op before the first build)."""
+        with self._lock:
+            if self.centroids is None:
+                return
+            unit = _normalize(np.asarray(vector, dtype=np.float32))
+            cluster = int(np.argmax(self.centroids @ unit))
+            self._remove(memory_id)
+            self._ids[cluster].append(memory_id)
+            self._vectors[cluster] = np.vstack([self._vectors[cluster], unit[None, :]])
+            self._cluster_of[memory_id] = cluster
+
+    def ids(self) -> set[str]:
+        """Ids of every assigned memory."""
+        with self._lock:
+            return set(self._cluster_of)
+
+    def remove(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            for memory_id in ids:
+                self._remove(memory_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.centroids = None
+            self.built_size = 0
+            self._ids, self._vectors, self._cluster_of = [], [], {}
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+    def search(
+        self, vector: Sequence[float] | np.ndarray, k: int, *, nprobe: int | None = None
+    ) -> list[tuple[str, float]]:
+        """Return up to ``k`` ``(memory id, cosine similarity)`` pairs, best first."""
+        with self._lock:
+            if self.centroids is None:
+                return []
+            unit = _normalize(np.asarray(vector, dtype=np.float32))
+            probe = min(nprobe or self.nprobe, len(self.centroids))
+            clusters = np.argpartition(-(self.centroids @ unit), probe - 1)[:probe]
+            ids = [memory_id for cluster in clusters for memory_id in self._ids[cluster]]
+            if not ids:
+                return []
+            scores = np.concatenate([self._vectors[cluster] @ unit for cluster in clusters])
+        top = min(k, len(ids))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        return [(ids[idx], float(scores[idx])) for idx in best]
+
+    def save(self) -> None:
+        if not self.path or self.centroids is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("wb") as handle:
+            np.savez(handle, centroids=self.centroids, built_size=self.built_size)
+
+    def load(self) -> bool:
+        """Load persisted centroids; members must then be supplied through ``assign``."""
+        if not self.path or not self.path.exists():
+            return False
+        with np.load(self.path) as data:
+            with self._lock:
+                self.centroids = data["centroids"]
+                self.built_size = int(data["built_size"])
+        return True
+
+    def _assign_all(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        assert self.centroids is not None
+        dimensions = self.centroids.shape[1]
+        vectors = vectors.reshape(len(ids), dimensions)
+        labels = _nearest(vectors, self.centroids)
+        self._ids = [[] for _ in range(len(self.centroids))]
+        self._vectors = [np.empty((0, dimensions), dtype=np.float32) for _ in range(len(self.centroids))]
+        self._cluster_of = {}
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(len(self.centroids) + 1))
+        for cluster in range(len(self.centroids)):
+            members = order[bounds[cluster] : bounds[cluster + 1]]
+            self._ids[cluster] = [ids[idx] for idx in members]
+            self._vectors[cluster] = vectors[members]
+            for idx in members:
+                self._cluster_of[ids[idx]] = cluster
+
+    def _remove(self, memory_id: str) -> None:
+        cluster = self._cluster_of.pop(memory_id, None)
+        if cluster is None:
+            return
+        position = self._ids[cluster].index(memory_id)
+        del self._ids[cluster][position]
+        self._vectors[cluster] = np.delete(self._vectors[cluster], position, axis=0)
+
+
+__all__ = ["IVFIndex", "kmeans"]
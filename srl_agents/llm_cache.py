@@ -0,0 +1,171 @@
+"""SQLite-backed exact-match cache for chat model generations."""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache (last_access);
+CREATE TABLE IF NOT EXISTS llm_cache_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class LLMCacheStats:
+    """Snapshot of cache occupancy and effectiveness."""
+
+    path: str
+    entries: int
+    total_bytes: int
+    hits: int
+    misses: int
+    max_entries: int | None
+    max_bytes: int | None
+    oldest: float | None
+    newest: float | None
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SQLiteLLMCache(BaseCache):
+    """Persistent LangChain cache keyed by the serialized model config and prompt.
+
+    LangChain's ``llm_string`` already captures the model name, sampling parameters
+    and any bound tools/response format, so structured-output calls made through
+    ``with_structured_output`` are keyed by their schema as well.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_entries: int | None = 5000,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._bump_counter("misses")
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET hits = hits + 1, last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._bump_counter("hits")
+            self._conn.commit()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                return loads(row[0], allowed_objects="core")
+        except Exception:  # pragma: no cover - corrupted or incompatible payloads
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        payload = dumps(list(return_val))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key, payload, len(payload.encode("utf-8")), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.execute("DELETE FROM llm_cache_counters")
+            self._conn.commit()
+
+    def stats(self) -> LLMCacheStats:
+        """Return entry counts, on-disk payload size and lifetime hit/miss counters."""
+        with self._lock:
+            entries, total_bytes, oldest, newest = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(created_at), MAX(created_at) FROM llm_cache"
+            ).fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM llm_cache_counters").fetchall())
+        return LLMCacheStats(
+            path=str(self.path),
+            entries=entries,
+            total_bytes=total_bytes,
+            hits=counters.get("hits", 0),
+            misses=counters.get("misses", 0),
+            max_entries=self.max_entries,
+            max_bytes=self.max_bytes,
+            oldest=oldest,
+            newest=newest,
+        )
+
+    def _evict(self) -> None:
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        if self.max_bytes is not None:
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+            while total > self.max_bytes:
+                row = self._conn.execute(
+                    "SELECT key, size FROM llm_cache ORDER BY last_access ASC LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    break
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (row[0],))
+                total -= row[1]
+
+    def _bump_counter(self, name: str) -> None:
+        self._conn.execute(
+            "INSERT INTO llm_cache_counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(llm_string.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+
+__all__ = ["LLMCacheStats", "SQLiteLLMCache"]
@@ -1,8 +1,282 @@
-"""Rich console utilities for consistent pretty-printing."""
+"""Leveled logging for SRL nodes with rich (interactive) and JSON-line (server) sinks.
+
+``console`` remains the shared rich console for CLI tables and explicit output.
+Graph nodes and library code log through ``logger`` instead, so that server
+deployments can route events to a buffered JSON-line sink, or drop them, without
+paying for terminal rendering on the hot path.
+
+Configuration comes from the environment (or ``configure_logging``):
+
+- ``SRL_LOG_SINK``: ``auto`` (default; rich on a TTY, JSON otherwise), ``rich``, ``json`` or ``none``.
+- ``SRL_LOG_LEVEL``: ``DEBUG``, ``INFO``, ``WARNING``, ``ERROR``. Defaults to ``DEBUG``
+  for the rich sink (full interactive trace) and ``WARNING`` for JSON.
+- ``SRL_LOG_FILE``: JSON-line destination; defaults to stderr.
+"""
 from __future__ import annotations
 
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from typing import IO, Any, Protocol
+
 from rich.console import Console
 
 console = Console()
 
-__all__ = ["console"]
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+_LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+_LEVELS = {name: level for level, name in _LEVEL_NAMES.items()}
+# Rich styles applied when a call does not pass its own.
+_DEFAULT_STYLES = {WARNING: "yellow", ERROR: "red"}
+
+
+class Sink(Protocol):
+    def emit(self, level: int, event: str, message: str, style: str | None, fields: dict[str, Any]) -> None:
+        ...
+
+    def rule(self, title: str) -> None:
+        ...
+
+    def flush(self) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class RichSink:
+    """Render events on the interactive rich console."""
+
+    def __init__(self, target: Console | None = None):
+        self.console = target or console
+
+    def emit(self, level: int, event: str, message: str, style: str | None, fields: dict[str, Any]) -> None:
+        self.console.print(message, style=style or _DEFAULT_STYLES.get(level), markup=False)
+
+    def rule(self, title: str) -> None:
+        self.console.rule(title, style="bold cyan")
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JsonLineSink:
+    """Serialize events as JSON lines on a background thread.
+
+    ``emit`` only enqueues; records are encoded and written in batches, so callers
+    never block on I/O. When the queue is full, new records are dropped and counted
+    rather than stalling the graph. The file and writer thread are opened on the
+    first record, so configuring the sink is free.
+    """
+
+    def __init__(
+        self,
+        stream: IO[str] | None = None,
+        *,
+        path: str | None = None,
+        max_queue: int = 10_000,
+        flush_interval: float = 0.5,
+    ):
+        self._owns_stream = stream is None and path is not None
+        self._path = path
+        self._stream: IO[str] | None = stream
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(maxsize=max_queue)
+        self._flush_interval = flush_interval
+        self._flushed = threading.Condition()
+        self._pending = 0
+        self.dropped = 0
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def emit(self, level: int, event: str, message: str, style: str | None, fields: dict[str, Any]) -> None:
+        record = {"ts": time.time(), "level": _LEVEL_NAMES.get(level, str(level)), "event": event}
+        if message:
+            record["message"] = message
+        if fields:
+            record.update(fields)
+        self._enqueue(record)
+
+    def rule(self, title: str) -> None:
+        self._enqueue({"ts": time.time(), "level": "INFO", "event": "stage", "message": title})
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every enqueued record has been written."""
+        deadline = time.monotonic() + timeout
+        with self._flushed:
+            while self._pending and self._thread is not None and self._thread.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._flushed.wait(remaining)
+
+    def close(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            if self._stream is None:
+                self._stream = open(self._path, "a", encoding="utf-8") if self._path else sys.stderr
+            self._thread = threading.Thread(target=self._drain, name="srl-json-log", daemon=True)
+            self._thread.start()
+
+    def _enqueue(self, record: dict[str, Any]) -> None:
+        if self._thread is None:
+            self._start()
+        with self._flushed:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._flushed:
+                self._pending -= 1
+                self.dropped += 1
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not None]
+            if records:
+                assert self._stream is not None
+                lines = "".join(json.dumps(record, default=str, ensure_ascii=False) + "\n" for record in records)
+                try:
+                    self._stream.write(lines)
+                    self._stream.flush()
+                except (OSError, ValueError):  # pragma: no cover - closed or broken stream
+                    pass
+                with self._flushed:
+                    self._pending -= len(records)
+                    self._flushed.notify_all()
+            if None in batch:
+                return
+
+
+class Logger:
+    """Dispatch leveled events to the configured sinks; disabled levels return immediately."""
+
+    def __init__(self, level: int = INFO, sinks: list[Sink] | None = None):
+        self.level = level
+        self.sinks: list[Sink] = sinks or []
+
+    def is_enabled(self, level: int) -> bool:
+        return bool(self.sinks) and level >= self.level
+
+    def log(self, level: int, event: str, message: str = "", *, style: str | None = None, **fields: Any) -> None:
+        if not self.sinks or level < self.level:
+            return
+        for sink in self.sinks:
+            sink.emit(level, event, message, style, fields)
+
+    def debug(self, event: str, message: str = "", *, style: str | None = None, **fields: Any) -> None:
+        self.log(DEBUG, event, message, style=style, **fields)
+
+    def info(self, event: str, message: str = "", *, style: str | None = None, **fields: Any) -> None:
+        self.log(INFO, event, message, style=style, **fields)
+
+    def warning(self, event: str, message: str = "", *, style: str | None = None, **fields: Any) -> None:
+        self.log(WARNING, event, message, style=style, **fields)
+
+    def error(self, event: str, message: str = "", *, style: str | None = None, **fields: Any) -> None:
+        self.log(ERROR, event, message, style=style, **fields)
+
+    def rule(self, title: str) -> None:
+        """Mark the start of a graph stage (a horizontal rule on the rich console)."""
+        if not self.sinks or INFO < self.level:
+            return
+        for sink in self.sinks:
+            sink.rule(title)
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+logger = Logger()
+
+
+def parse_level(value: str | int | None, default: int) -> int:
+    if value is None or value == "":
+        return default
+    if isinstance(value, int):
+        return value
+    if value.isdigit():
+        return int(value)
+    try:
+        return _LEVELS[value.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown log level {value!r}; expected one of {', '.join(_LEVELS)}") from None
+
+
+def configure_logging(
+    sink: str | None = None,
+    level: str | int | None = None,
+    path: str | None = None,
+) -> Logger:
+    """(Re)configure the shared ``logger`` in place and return it."""
+    sink = (sink or os.getenv("SRL_LOG_SINK") or "auto").lower()
+    if sink == "auto":
+        sink = "rich" if sys.stdout.isatty() else "json"
+    path = path or os.getenv("SRL_LOG_FILE") or None
+    level = level if level is not None else os.getenv("SRL_LOG_LEVEL")
+
+    if sink not in ("rich", "json", "none"):
+        raise ValueError(f"Unknown log sink {sink!r}; expected auto, rich, json or none")
+
+    logger.close()
+    if sink == "rich":
+        logger.sinks = [RichSink()]
+        logger.level = parse_level(level, DEBUG)
+    elif sink == "json":
+        logger.sinks = [JsonLineSink(path=path)]
+        logger.level = parse_level(level, WARNING)
+    else:
+        logger.sinks = []
+        logger.level = parse_level(level, ERROR)
+    return logger
+
+
+configure_logging()
+atexit.register(logger.close)
+
+__all__ = [
+    "DEBUG",
+    "ERROR",
+    "INFO",
+    "WARNING",
+    "JsonLineSink",
+    "Logger",
+    "RichSink",
+    "configure_logging",
+    "console",
+    "logger",
+]
@@ -1,17 +1,67 @@
 """ChromaDB-backed memory store for SRL agents."""
 from __future__ import annotations
 
-from typing import Callable, List, Optional, TypedDict
-from uuid import uuid4
+import hashlib
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Protocol, Sequence, Tuple, TypedDict
 
+import numpy as np
 from chromadb.api import ClientAPI
 from chromadb.api.models.Collection import Collection
 from langchain_core.embeddings import Embeddings
 
-from .logging import console
+from .instrumentation import timed
+from .ivf_index import IVFIndex
+from .logging import logger
+from .retrieval_cache import RetrievalCache
+from .retrieval_log import RetrievalLog
 from .state import ReflectionOutput
+from .vector_index import HnswSettings, collection_hnsw, distance_to_similarity, embedding_distances
+from .write_behind import PendingWrite, WriteBehindBuffer
 
 QueryRefiner = Callable[[str], str]
+# (metadata, document, similarity) for one retrieved memory.
+MemoryHit = Tuple[dict, Optional[str], Optional[float]]
+# How long the collection count and write generation are trusted before re-reading them.
+_COUNT_TTL_SECONDS = 5.0
+# Collection metadata key bumped on every write by an IVF-indexed store, so other processes' indexes resync.
+_GENERATION_KEY = "srl_generation"
+
+
+def content_id(text: str) -> str:
+    """Deterministic memory id for a reflection's stored text, ignoring case and whitespace."""
+    normalized = " ".join(text.split()).casefold()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass(frozen=True)
+class Retrieval:
+    """Rendered memories for the prompt plus the ranked hits (with similarities) behind them."""
+
+    text: str
+    hits: tuple[MemoryHit, ...] = ()
+    # The query actually searched, after refinement; ``None`` when nothing was searched.
+    refined_query: str | None = None
+
+
+@dataclass
+class StoreStats:
+    """Size and composition of a memory store, for ``memory_cli.py stats``."""
+
+    records: int
+    pending: int
+    dimensions: int | None
+    topics: dict[str, int] = field(default_factory=dict)
+    # Critic impact score -> count; ``None`` counts memories stored without one.
+    impact: dict[int | None, int] = field(default_factory=dict)
+
+
+class HitSource(Protocol):
+    def hits(self, query_vec, k: int) -> list[MemoryHit]:
+        ...
 
 
 class MemoryRecord(TypedDict, total=False):
@@ -25,7 +75,26 @@ class MemoryRecord(TypedDict, total=False):
 
 
 class MemoryStore:
-    """Vector database wrapper using Chroma collections."""
+    """Vector database wrapper using Chroma collections.
+
+    New collections are created with ``hnsw`` (default: cosine space). An existing
+    collection keeps the space and graph parameters it was built with; scores are
+    converted for its actual space and a mismatch is logged.
+
+    With an ``ivf`` index, searches go coarse-to-fine through cluster centroids
+    once the collection holds ``ivf.min_records`` memories (see ``ivf_index``);
+    smaller stores keep using Chroma's HNSW query.
+
+    With a ``write_buffer``, ``add`` only queues the reflection; batches are
+    embedded with one ``embed_documents`` call and written together, and
+    ``search`` also scores queued reflections so this process reads its own writes.
+
+    With a ``cache``, repeated searches return the cached rendering until the
+    next write through this store (see ``retrieval_cache``).
+
+    With a ``retrieval_log``, every retrieval's latency, similarities and outcome
+    are appended to a rolling log (see ``retrieval_log``).
+    """
 
     def __init__(
         self,
@@ -35,55 +104,80 @@ class MemoryStore:
         top_k: int = 3,
         min_similarity: Optional[float] = 0.35,
         query_refiner: QueryRefiner | None = None,
+        hnsw: HnswSettings | None = None,
+        ivf: IVFIndex | None = None,
+        write_buffer: WriteBehindBuffer | None = None,
+        cache: RetrievalCache | None = None,
+        retrieval_log: RetrievalLog | None = None,
     ) -> None:
         self.embedder = embedder
-        self.collection: Collection = client.get_or_create_collection(collection_name)
+        self.client = client
+        self.hnsw = hnsw or HnswSettings()
+        self.collection, self.space = self._open_collection(collection_name)
         self.top_k = top_k
         self.min_similarity = min_similarity
         self.query_refiner = query_refiner
+        self.ivf = ivf
+        self._ivf_loaded = False
+        self._count: int | None = None
+        self._count_at = 0.0
+        self._generation = self._stored_generation() if ivf is not None else None
+        self._ivf_stale = False
+        self.write_buffer = write_buffer
+        self.cache = cache
+        self.retrieval_log = retrieval_log
+        # Extra hit sources merged into every search, e.g. a snapshot still being restored.
+        self.overlays: list[HitSource] = []
+        if write_buffer is not None:
+            write_buffer.bind(self._flush_pending)
 
-    def search(self, query: str) -> str:
-        """Return top similar memories from Chroma."""
+    def search(self, query: str, *, refined_query: str | None = None) -> str:
+        """Return top similar memories from Chroma, rendered for the prompt.
+
+        ``refined_query`` (e.g. produced alongside the learning context) is embedded
+        as-is and skips the store's own ``query_refiner``.
+        """
+        return self.retrieve(query, refined_query=refined_query).text
+
+    def retrieve(self, query: str, *, refined_query: str | None = None) -> Retrieval:
+        """Like ``search``, but also return the ranked hits so callers can act on their scores."""
         if not self.embedder:
-            return "Memory retrieval unavailable (missing embedding client)."
+            return Retrieval("Memory retrieval unavailable (missing embedding client).")
+
+        started = time.perf_counter()
+        key = generation = None
+        if self.cache is not None:
+            key = self.cache.key(query, refined_query, self.top_k, self.min_similarity)
+            generation = self.cache.generation
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._log_retrieval(cached, started, cached=True)
+                return cached
 
-        normalized_query = self._normalize_text(query, context="search query")
+        normalized_query = refined_query or self.refine_query(query)
         query_vec = self._embed_query(normalized_query)
         if query_vec is None:
-            return "No relevant past experience."
+            return Retrieval("No relevant past experience.", refined_query=normalized_query)
 
-        result = self.collection.query(
-            query_embeddings=[query_vec],
-            n_results=self.top_k,
-            include=["metadatas", "documents", "distances"],
-        )
-        metadatas = result.get("metadatas") or []
-        documents = result.get("documents") or []
-        distances = result.get("distances") or []
-        if not metadatas or not any(metadatas):
-            return "No relevant past experience."
-
-        lines: list[str] = []
-        fallback_lines: list[str] = []
-        for meta_list, doc_list, dist_list in zip(metadatas, documents, distances):
-            for meta, doc, dist in zip(meta_list or [], doc_list or [], dist_list or []):
-                topic = meta.get("topic", "General")
-                insight = meta.get("insight", doc)
-                impact = meta.get("impact_score")
-                score = self._distance_to_similarity(dist)
-                if self.min_similarity is not None and (
-                    score is None or score < self.min_similarity
-                ):
-                    fallback_lines.append(self._format_memory_line(topic, insight, score, impact))
-                    continue
-                lines.append(self._format_memory_line(topic, insight, score, impact))
-
-        if lines:
-            return "\n".join(lines)
-        if fallback_lines:
-            console.print("[yellow]No high-similarity matches; showing closest memory.[/yellow]")
-            return "\n".join(fallback_lines[: self.top_k])
-        return "No relevant past experience."
+        # Overlays are read before the collection so a row moving into Chroma meanwhile is seen at least once.
+        overlay_hits = [hit for overlay in list(self.overlays) for hit in overlay.hits(query_vec, self.top_k)]
+        try:
+            hits = self._query(query_vec)
+        except Exception as exc:
+            if not overlay_hits:
+                raise
+            # The first backfill batch may still be creating the collection's index on disk.
+            logger.debug("memory.query_failed", f"Collection query failed during restore: {exc}")
+            hits = []
+        if self.write_buffer is not None:
+            hits = self._with_pending(query_vec, hits)
+        if overlay_hits:
+            hits = self._merge_hits(hits, overlay_hits)
+        result = Retrieval(self._render(hits), tuple(hits), normalized_query)
+        if self.cache is not None and key is not None and generation is not None:
+            self.cache.put(key, result, generation)
+        self._log_retrieval(result, started)
+        return result
 
     def add(
         self,
@@ -92,48 +186,139 @@ class MemoryStore:
         impact_score: int | None = None,
         success_criteria: str | None = None,
     ) -> None:
-        """Persist reflections as embedded documents."""
+        """Persist reflections as embedded documents.
+
+        Ids are content hashes, so a reflection that is already stored is skipped
+        before it is refined or embedded.
+        """
         if not self.embedder:
-            console.print("[red]Cannot store reflection: embedding client not configured.[/red]")
+            logger.error("memory.add_failed", "Cannot store reflection: embedding client not configured.")
             return
 
-        components = [
-            reflection.topic,
-            reflection.insight,
-            reflection.reasoning,
-            reflection.source_query or "",
-        ]
-        text = ". ".join(filter(None, components))
-        normalized_text = self._normalize_text(text, context="reflection")
-        embedding = self._embed_query(normalized_text)
+        entry = self._pending_write(reflection, impact_score, success_criteria)
+        if self.write_buffer is not None:
+            logger.info(
+                "memory.persist",
+                f"\n[Database] 💾 Queued: [{reflection.topic}] {reflection.insight}",
+                style="green",
+                topic=reflection.topic,
+            )
+            self.write_buffer.append(entry)
+            self._invalidate()
+            return
+
+        if self._stored_ids([entry.id]):
+            logger.info(
+                "memory.duplicate",
+                f"\n[Database] Already stored: [{reflection.topic}] {reflection.insight}",
+                style="dim",
+                topic=reflection.topic,
+            )
+            return
+        entry.embed_text = self._normalize_text(entry.text, context="reflection")
+        embedding = self._embed_query(entry.embed_text)
         if embedding is None:
-            console.print("[red]Skipping persistence due to embedding failure.[/red]")
+            logger.error("memory.add_failed", "Skipping persistence due to embedding failure.")
             return
 
-        console.print(
-            f"[green]\n[Database] 💾 Persisting: [{reflection.topic}] {reflection.insight}[/green]"
+        logger.info(
+            "memory.persist",
+            f"\n[Database] 💾 Persisting: [{reflection.topic}] {reflection.insight}",
+            style="green",
+            topic=reflection.topic,
         )
-        metadata = {
-            "topic": reflection.topic,
-            "insight": reflection.insight,
-            "reasoning": reflection.reasoning,
-            "source_query": reflection.source_query,
-        }
-        if impact_score is not None:
-            metadata["impact_score"] = impact_score
-        if success_criteria:
-            metadata["success_criteria"] = success_criteria
+        self._write([entry.id], [embedding], [entry.text], [entry.metadata])
+
+    def add_many(
+        self,
+        reflections: Sequence[ReflectionOutput],
+        *,
+        impact_scores: Sequence[int | None] | None = None,
+        success_criteria: Sequence[str | None] | None = None,
+    ) -> int:
+        """Persist several reflections with one ``embed_documents`` call and one collection write.
+
+        Reflections already stored (or repeated in the batch) are skipped before embedding;
+        returns how many were written or queued. Unlike ``add``, embedding and write errors
+        propagate so batch callers can retry.
+        """
+        if not self.embedder:
+            logger.error("memory.add_failed", "Cannot store reflections: embedding client not configured.")
+            return 0
+        impact_scores = impact_scores or [None] * len(reflections)
+        success_criteria = success_criteria or [None] * len(reflections)
+        entries = list(
+            {
+                entry.id: entry
+                for entry in (
+                    self._pending_write(reflection, impact, criteria)
+                    for reflection, impact, criteria in zip(reflections, impact_scores, success_criteria)
+                )
+            }.values()
+        )
+        if self.write_buffer is None:
+            entries = self._unstored(entries)
+        if not entries:
+            return 0
+        logger.info(
+            "memory.persist",
+            f"\n[Database] 💾 {'Queued' if self.write_buffer is not None else 'Persisting'} {len(entries)} reflections.",
+            style="green",
+            count=len(entries),
+        )
+        if self.write_buffer is not None:
+            for entry in entries:
+                self.write_buffer.append(entry)
+            self._invalidate()
+            return len(entries)
+        self._embed_pending(entries)
+        self._write(
+            [entry.id for entry in entries],
+            [entry.embedding for entry in entries],
+            [entry.text for entry in entries],
+            [entry.metadata for entry in entries],
+        )
+        return len(entries)
 
-        self.collection.add(
-            ids=[str(uuid4())],
-            embeddings=[embedding],
-            documents=[text],
-            metadatas=[metadata],
+    def flush(self) -> int:
+        """Write any buffered reflections now; returns how many new memories were persisted."""
+        return self.write_buffer.flush() if self.write_buffer is not None else 0
+
+    def stats(self, batch_size: int = 5000) -> StoreStats:
+        """Count stored memories per topic and impact score, plus queued writes and the embedding size."""
+        topics: Counter[str] = Counter()
+        impact: Counter[int | None] = Counter()
+        dimensions = None
+        for collection in self._collections():
+            if dimensions is None:
+                sample = collection.get(include=["embeddings"], limit=1).get("embeddings")
+                dimensions = len(sample[0]) if sample is not None and len(sample) else None
+            offset = 0
+            while True:
+                batch = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+                metadatas = batch.get("metadatas") or []
+                for meta in metadatas:
+                    meta = meta or {}
+                    topics[meta.get("topic", "General")] += 1
+                    impact[meta.get("impact_score")] += 1
+                offset += len(metadatas)
+                if len(metadatas) < batch_size:
+                    break
+        return StoreStats(
+            records=sum(topics.values()),
+            pending=len(self.write_buffer.pending()) if self.write_buffer is not None else 0,
+            dimensions=dimensions,
+            topics=dict(topics.most_common()),
+            impact=dict(impact),
         )
 
     def list_memories(self, limit: int = 50) -> List[MemoryRecord]:
         """Return stored memories for CLI inspection."""
-        result = self.collection.get(include=["metadatas", "documents"], limit=limit)
+        return self._records(self.collection, limit)
+
+    @staticmethod
+    def _records(collection: Collection, limit: int) -> List[MemoryRecord]:
+        result = collection.get(include=["metadatas", "documents"], limit=limit)
         ids = result.get("ids") or []
         metadatas = result.get("metadatas") or [None] * len(ids)
         documents = result.get("documents") or [None] * len(ids)
@@ -163,31 +348,116 @@ class MemoryStore:
         """Delete a single memory entry by id."""
         if not memory_id:
             return False
+        if self.write_buffer is not None and self.write_buffer.discard(lambda entry: entry.id == memory_id):
+            self._invalidate()
+            return True
         existing = self.collection.get(ids=[memory_id], include=[])
         if not existing.get("ids"):
             return False
         self.collection.delete(ids=[memory_id])
+        self._bump_generation()
+        if self.ivf:
+            self.ivf.remove([memory_id])
+        self._invalidate()
         return True
 
-    def reset_memory(self, batch_size: int = 200) -> int:
-        """Remove every stored memory."""
-        total_deleted = 0
+    def reset_memory(self, batch_size: int = 200, *, topic: str | None = None) -> int:
+        """Remove every stored memory, or only those whose metadata ``topic`` matches."""
+        where = {"topic": topic} if topic else None
+        total_deleted = self._discard_pending(topic)
         while True:
-            batch = self.collection.get(include=[], limit=batch_size)
+            batch = self.collection.get(where=where, include=[], limit=batch_size)
             ids = batch.get("ids") or []
             if not ids:
                 break
             self.collection.delete(ids=ids)
+            if self.ivf:
+                self.ivf.remove(ids)
             total_deleted += len(ids)
             if len(ids) < batch_size:
                 break
+        if total_deleted:
+            self._bump_generation()
+        if self.ivf is not None and self.collection.count() == 0:
+            # Stale centroids would otherwise be reloaded over an empty collection.
+            self.ivf.clear()
+        self._invalidate()
         return total_deleted
 
+    def export_batches(self, batch_size: int = 5000) -> Iterator[dict]:
+        """Yield stored records with embeddings in ``collection.get`` batches (for snapshots).
+
+        Ids are listed first and then fetched, so records added meanwhile are left out
+        and records deleted meanwhile are skipped instead of shifting later pages.
+        """
+        self.flush()
+        for collection in self._collections():
+            ids = collection.get(include=[]).get("ids") or []
+            for start in range(0, len(ids), batch_size):
+                yield collection.get(
+                    ids=ids[start : start + batch_size], include=["embeddings", "documents", "metadatas"]
+                )
+
+    def bulk_add(
+        self,
+        ids: list[str],
+        embeddings: np.ndarray,
+        documents: list[str | None],
+        metadatas: list[dict],
+        *,
+        batch_size: int = 5000,
+        fit_index: bool = True,
+    ) -> int:
+        """Insert pre-embedded records in large batches, then (``fit_index``) fit the IVF index once."""
+        batch_size = min(batch_size, self.client.get_max_batch_size())
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            self._write(
+                ids[start:end],
+                np.asarray(embeddings[start:end], dtype=np.float32).tolist(),
+                documents[start:end],
+                metadatas[start:end],
+                index_ivf=False,
+            )
+        ivf = self.ivf
+        if fit_index and ivf is not None and self.collection.count() >= ivf.min_records:
+            if self.collection.count() == len(ids):
+                ivf.build(ids, np.asarray(embeddings, dtype=np.float32))
+            else:
+                self.rebuild_index()
+        return len(ids)
+
+    def rebuild_index(self, batch_size: int = 5000) -> int:
+        """Refit the IVF centroids over every stored embedding; returns how many were indexed."""
+        if self.ivf is None:
+            return 0
+        ids, vectors = self._all_embeddings(batch_size)
+        if not ids:
+            self.ivf.clear()
+            return 0
+        started = time.perf_counter()
+        self.ivf.build(ids, vectors)
+        self._invalidate()
+        logger.info(
+            "memory.ivf_rebuilt",
+            f"Rebuilt IVF index: {len(ids)} memories in {len(self.ivf.centroids)} clusters "
+            f"({time.perf_counter() - started:.1f}s).",
+            style="dim",
+            memories=len(ids),
+            clusters=len(self.ivf.centroids),
+        )
+        return len(ids)
+
+    def refine_query(self, query: str) -> str:
+        """Apply the configured ``query_refiner`` to a search query (identity without one)."""
+        return self._normalize_text(query, context="search query")
+
     def _embed_query(self, text: str):
         try:
-            return self.embedder.embed_query(text) if self.embedder else None
+            with timed("embedding"):
+                return self.embedder.embed_query(text) if self.embedder else None
         except Exception as exc:  # pragma: no cover
-            console.print(f"[red]Embedding failed:[/red] {exc}")
+            logger.error("memory.embedding_failed", f"Embedding failed: {exc}")
             return None
 
     def _normalize_text(self, text: str, context: str) -> str:
@@ -197,20 +467,321 @@ class MemoryStore:
             refined = self.query_refiner(text)
             if refined and refined != text:
                 label = "Refined memory query" if context == "search query" else "Refined reflection embedding"
-                console.print(
-                    f"[dim]{label}:[/dim] "
-                    f"{refined if len(refined) < 160 else refined[:157] + '...'}"
+                logger.debug(
+                    "memory.refined",
+                    f"{label}: {refined if len(refined) < 160 else refined[:157] + '...'}",
+                    style="dim",
                 )
             return refined or text
         except Exception as exc:  # pragma: no cover
-            console.print(f"[yellow]Query refinement failed:[/yellow] {exc}")
+            logger.warning("memory.refine_failed", f"Query refinement failed: {exc}")
             return text
 
+    def _query(self, query_vec) -> list[MemoryHit]:
+        if self._ivf_ready():
+            with timed("chroma_query"):
+                ranked = self.ivf.search(query_vec, self.top_k)
+                if not ranked:
+                    return []
+                result = self.collection.get(
+                    ids=[mem_id for mem_id, _ in ranked], include=["metadatas", "documents", "embeddings"]
+                )
+            # IVF ranks by cosine; report the similarity the HNSW path would for this space.
+            embeddings = result.get("embeddings")
+            distances = embedding_distances(query_vec, embeddings, self.space) if embeddings is not None else []
+            hits = [
+                (meta, doc, distance_to_similarity(float(distance), self.space))
+                for meta, doc, distance in zip(result.get("metadatas") or [], result.get("documents") or [], distances)
+                if meta
+            ]
+            return sorted(hits, key=lambda hit: -(hit[2] or 0.0))
+        with timed("chroma_query"):
+            result = self.collection.query(
+                query_embeddings=[query_vec],
+                n_results=self.top_k,
+                include=["metadatas", "documents", "distances"],
+            )
+        return self._hits(result, self.space)
+
+    def _write(
+        self,
+        ids: list[str],
+        embeddings: list,
+        texts: list[str],
+        metadatas: list[dict],
+        *,
+        index_ivf: bool = True,
+    ) -> None:
+        """Upsert rows; ``index_ivf=False`` leaves IVF assignment to a later (bulk) fit."""
+        with timed("chroma_write"):
+            self.collection.upsert(ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas)
+        self._bump_generation()
+        self._invalidate()
+        if index_ivf and self._ivf_ready(sync=False):
+            for memory_id, embedding in zip(ids, embeddings):
+                self.ivf.add(memory_id, embedding)
+            if self.ivf.needs_rebuild:
+                self.rebuild_index()
+
+    def _flush_pending(self, batch: list[PendingWrite]) -> int:
+        # Covers repeated reflections and replays of writes that landed just before a crash.
+        batch = self._unstored(list({entry.id: entry for entry in batch}.values()))
+        self._embed_pending(batch)
+        if batch:
+            self._write(
+                [entry.id for entry in batch],
+                [entry.embedding for entry in batch],
+                [entry.text for entry in batch],
+                [entry.metadata for entry in batch],
+            )
+            logger.debug("memory.flushed", f"Flushed {len(batch)} buffered memories.", count=len(batch))
+        return len(batch)
+
+    def _pending_write(
+        self, reflection: ReflectionOutput, impact_score: int | None, success_criteria: str | None
+    ) -> PendingWrite:
+        components = [
+            reflection.topic,
+            reflection.insight,
+            reflection.reasoning,
+            reflection.source_query or "",
+        ]
+        text = ". ".join(filter(None, components))
+        metadata = {
+            "topic": reflection.topic,
+            "insight": reflection.insight,
+            "reasoning": reflection.reasoning,
+            "source_query": reflection.source_query,
+        }
+        if impact_score is not None:
+            metadata["impact_score"] = impact_score
+        if success_criteria:
+            metadata["success_criteria"] = success_criteria
+        # The refined embedding text is filled in by ``_embed_pending`` once the id is known to be new.
+        return PendingWrite(content_id(text), text, "", metadata)
+
+    def _embed_pending(self, entries: list[PendingWrite]) -> None:
+        missing = [entry for entry in entries if entry.embedding is None]
+        if not missing:
+            return
+        for entry in missing:
+            entry.embed_text = entry.embed_text or self._normalize_text(entry.text, context="reflection")
+        with timed("embedding"):
+            vectors = self.embedder.embed_documents([entry.embed_text for entry in missing])
+        for entry, vector in zip(missing, vectors):
+            entry.embedding = vector
+
+    def _with_pending(self, query_vec, hits: list[MemoryHit]) -> list[MemoryHit]:
+        pending = self.write_buffer.pending()
+        if not pending:
+            return hits
+        try:
+            self._embed_pending(pending)
+        except Exception as exc:  # pragma: no cover - flush will retry the embedding
+            logger.warning("memory.embedding_failed", f"Could not embed queued memories: {exc}")
+            return hits
+        query = np.asarray(query_vec, dtype=np.float32)
+        matrix = np.asarray([entry.embedding for entry in pending], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        scores = matrix @ query / np.where(norms == 0, 1.0, norms)
+        queued = [(entry.metadata, entry.text, float(score)) for entry, score in zip(pending, scores)]
+        return self._merge_hits(hits, queued)
+
+    def _merge_hits(self, hits: list[MemoryHit], extra: list[MemoryHit]) -> list[MemoryHit]:
+        merged: dict[tuple, MemoryHit] = {}
+        for hit in hits + extra:
+            key = (hit[1], hit[0].get("insight"))
+            if key not in merged or (hit[2] or float("-inf")) > (merged[key][2] or float("-inf")):
+                merged[key] = hit
+        ranked = sorted(
+            merged.values(), key=lambda hit: hit[2] if hit[2] is not None else float("-inf"), reverse=True
+        )
+        return ranked[: self.top_k]
+
+    def _discard_pending(self, topic: str | None) -> int:
+        if self.write_buffer is None:
+            return 0
+        return self.write_buffer.discard(lambda entry: topic is None or entry.metadata.get("topic") == topic)
+
+    def _log_retrieval(self, retrieval: Retrieval, started: float, *, cached: bool = False) -> None:
+        if self.retrieval_log is None:
+            return
+        scores = [score for _, _, score in retrieval.hits if score is not None]
+        if not retrieval.hits:
+            outcome = "empty"
+        elif self.min_similarity is None or any(score >= self.min_similarity for score in scores):
+            outcome = "hit"
+        else:
+            outcome = "fallback"
+        try:
+            self.retrieval_log.record(
+                latency_ms=(time.perf_counter() - started) * 1000, outcome=outcome, similarities=scores, cached=cached
+            )
+        except OSError as exc:  # pragma: no cover - statistics must never fail a search
+            logger.warning("memory.retrieval_log_failed", f"Could not write retrieval log: {exc}")
+
+    def _invalidate(self) -> None:
+        self._count = None
+        if self.cache is not None:
+            self.cache.invalidate()
+
+    def _collections(self) -> list[Collection]:
+        return [self.collection]
+
+    def _stored_ids(self, ids: list[str]) -> set[str]:
+        return set(self.collection.get(ids=ids, include=[]).get("ids") or [])
+
+    def _unstored(self, entries: list[PendingWrite]) -> list[PendingWrite]:
+        if not entries:
+            return entries
+        stored = self._stored_ids([entry.id for entry in entries])
+        if stored:
+            logger.debug("memory.duplicate", f"Skipped {len(stored)} already stored memories.", count=len(stored))
+        return [entry for entry in entries if entry.id not in stored]
+
+    def _ivf_ready(self, *, sync: bool = True) -> bool:
+        """Load (or first build) the IVF index on demand; ``False`` keeps the HNSW path.
+
+        With ``sync``, a write generation bumped by another process, or a collection
+        count that no longer matches the index, resyncs the membership.
+        """
+        if self.ivf is None:
+            return False
+        if not self.ivf.ready and not self._ivf_loaded:
+            self._ivf_loaded = True
+            if self.ivf.load():
+                self.ivf.assign(*self._all_embeddings())
+        if not self.ivf.ready:
+            if self._collection_count() >= self.ivf.min_records:
+                self.rebuild_index()
+        # A snapshot backfill indexes its rows with one fit when it finishes.
+        elif sync and not self.overlays and (self._collection_count() != len(self.ivf) or self._ivf_stale):
+            self._sync_ivf()
+        return self.ivf.ready
+
+    def _collection_count(self) -> int:
+        now = time.monotonic()
+        if self._count is None or now - self._count_at >= _COUNT_TTL_SECONDS:
+            self._count, self._count_at = self.collection.count(), now
+            self._ivf_stale |= self._stored_generation() != self._generation
+        return self._count
+
+    def _stored_generation(self) -> str | None:
+        metadata = self.client.get_collection(self.collection.name).metadata or {}
+        return metadata.get(_GENERATION_KEY)
+
+    def _bump_generation(self) -> None:
+        if self.ivf is None:
+            return
+        metadata = dict(self.client.get_collection(self.collection.name).metadata or {})
+        # A generation we have not seen is another process's write; resync before it is overwritten.
+        self._ivf_stale |= metadata.get(_GENERATION_KEY) != self._generation
+        self._generation = metadata[_GENERATION_KEY] = uuid.uuid4().hex
+        self.collection.modify(metadata=metadata)
+
+    def _sync_ivf(self, batch_size: int = 5000) -> None:
+        assert self.ivf is not None
+        self._generation, self._ivf_stale = self._stored_generation(), False
+        stored = self.collection.get(include=[]).get("ids") or []
+        indexed = self.ivf.ids()
+        stale = indexed.difference(stored)
+        added = [memory_id for memory_id in stored if memory_id not in indexed]
+        self.ivf.remove(stale)
+        for start in range(0, len(added), batch_size):
+            batch = self.collection.get(ids=added[start : start + batch_size], include=["embeddings"])
+            embeddings = batch.get("embeddings")
+            for memory_id, embedding in zip(batch.get("ids") or [], embeddings if embeddings is not None else []):
+                self.ivf.add(memory_id, embedding)
+        self._invalidate()
+        self._count, self._count_at = len(stored), time.monotonic()
+        logger.debug(
+            "memory.ivf_synced",
+            f"Resynced IVF index with the collection: {len(added)} added, {len(stale)} removed elsewhere.",
+            added=len(added),
+            removed=len(stale),
+        )
+        if self.ivf.needs_rebuild:
+            self.rebuild_index()
+
+    def _all_embeddings(self, batch_size: int = 5000) -> tuple[list[str], np.ndarray]:
+        ids: list[str] = []
+        vectors: list[np.ndarray] = []
+        while True:
+            batch = self.collection.get(include=["embeddings"], limit=batch_size, offset=len(ids))
+            batch_ids = batch.get("ids") or []
+            if not batch_ids:
+                break
+            ids.extend(batch_ids)
+            vectors.append(np.asarray(batch["embeddings"], dtype=np.float32))
+            if len(batch_ids) < batch_size:
+                break
+        return ids, np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+
+    def _render(self, hits: list[MemoryHit]) -> str:
+        lines: list[str] = []
+        fallback_lines: list[str] = []
+        for meta, doc, score in hits:
+            topic = meta.get("topic", "General")
+            insight = meta.get("insight", doc)
+            impact = meta.get("impact_score")
+            if self.min_similarity is not None and (score is None or score < self.min_similarity):
+                fallback_lines.append(self._format_memory_line(topic, insight, score, impact))
+                continue
+            lines.append(self._format_memory_line(topic, insight, score, impact))
+
+        if lines:
+            return "\n".join(lines)
+        if fallback_lines:
+            logger.info(
+                "memory.fallback",
+                "No high-similarity matches; showing closest memory.",
+                style="yellow",
+            )
+            return "\n".join(fallback_lines[: self.top_k])
+        return "No relevant past experience."
+
     @staticmethod
-    def _distance_to_similarity(distance):
-        if isinstance(distance, (int, float)):
-            return float(1 - distance)
-        return None
+    def _hits(result, space: str) -> list[MemoryHit]:
+        metadatas = result.get("metadatas") or []
+        documents = result.get("documents") or []
+        distances = result.get("distances") or []
+        hits: list[MemoryHit] = []
+        for meta_list, doc_list, dist_list in zip(metadatas, documents, distances):
+            for meta, doc, dist in zip(meta_list or [], doc_list or [], dist_list or []):
+                if meta:
+                    hits.append((meta, doc, distance_to_similarity(dist, space)))
+        return hits
+
+    def _open_collection(self, name: str) -> tuple[Collection, str]:
+        collection = self.client.get_or_create_collection(name, configuration=self.hnsw.configuration())
+        return collection, self._reconcile_index(collection)
+
+    def _reconcile_index(self, collection: Collection) -> str:
+        """Return the collection's distance space, applying ``ef_search`` if it drifted."""
+        actual = collection_hnsw(collection)
+        if not actual:
+            return self.hnsw.space
+        fixed = ("space", "max_neighbors", "ef_construction")
+        drift = {
+            field: actual[field]
+            for field in fixed
+            if field in actual and actual[field] != getattr(self.hnsw, field)
+        }
+        if drift:
+            logger.warning(
+                "memory.hnsw_mismatch",
+                f"Collection {collection.name!r} was built with "
+                + ", ".join(f"{field}={value}" for field, value in drift.items())
+                + "; these are fixed at creation, so rebuild the collection to change them.",
+                collection=collection.name,
+                **drift,
+            )
+        if actual.get("ef_search") not in (None, self.hnsw.ef_search):
+            try:
+                collection.modify(configuration={"hnsw": {"ef_search": self.hnsw.ef_search}})
+            except Exception as exc:  # pragma: no cover - depends on the Chroma build
+                logger.warning("memory.hnsw_modify_failed", f"Could not update ef_search: {exc}")
+        return actual.get("space", self.hnsw.space)
 
     @staticmethod
     def _format_memory_line(
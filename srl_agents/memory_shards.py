@@ -0,0 +1,253 @@
+"""Topic-sharded memory: one Chroma collection per reflection topic.
+
+Each shard collection is named ``<collection_name>-t-<shard key>``, where the key
+is a readable slug of the topic plus a short hash of the exact topic, so topics
+that slug alike ("C", "C++", "C#") never share a shard. A small
+registry collection (``<collection_name>-topics``) holds one record per shard
+whose embedding is the running mean of that shard's reflection embeddings.
+``search`` queries the registry for the ``route_shards`` closest centroids, queries
+only those shards and merges the hits by similarity, so each ANN query scans a
+topic-sized index instead of the whole memory.
+
+Memories stored in the unsharded ``<collection_name>`` collection before sharding
+was enabled are moved into their shards by ``migrate_legacy``.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Any, List, Optional
+
+import numpy as np
+from chromadb.api import ClientAPI
+from chromadb.api.models.Collection import Collection
+from langchain_core.embeddings import Embeddings
+
+from .instrumentation import timed
+from .logging import logger
+from .memory import MemoryHit, MemoryRecord, MemoryStore
+
+_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def topic_slug(topic: str | None) -> str:
+    """Collection-safe shard key for a topic (``"Git / Version Control"`` -> ``git-version-control-<hash>``)."""
+    topic = (topic or "").strip() or "General"
+    slug = _SLUG.sub("-", topic.lower()).strip("-")[:40].strip("-") or "topic"
+    return f"{slug}-{hashlib.sha256(topic.encode('utf-8')).hexdigest()[:8]}"
+
+
+class ShardedMemoryStore(MemoryStore):
+    """``MemoryStore`` that writes each reflection to its topic's collection and routes searches."""
+
+    def __init__(
+        self,
+        embedder: Optional[Embeddings],
+        client: ClientAPI,
+        collection_name: str = "srl-memory",
+        *,
+        route_shards: int = 2,
+        **kwargs,
+    ) -> None:
+        self.shard_prefix = collection_name
+        self.route_shards = route_shards
+        self._shards: dict[str, tuple[Collection, str]] = {}
+        super().__init__(embedder, client, collection_name=f"{collection_name}-topics", **kwargs)
+
+    def migrate_legacy(self, batch_size: int = 500) -> int:
+        """Move memories from the unsharded collection into topic shards; returns how many moved.
+
+        Records keep their ids and embeddings, and each batch is deleted from the old
+        collection only after it is written, so an interrupted migration can simply be rerun.
+        """
+        if self.shard_prefix not in {collection.name for collection in self.client.list_collections()}:
+            return 0
+        legacy = self.client.get_collection(self.shard_prefix)
+        moved = 0
+        while True:
+            batch = legacy.get(include=["embeddings", "documents", "metadatas"], limit=batch_size)
+            ids = batch.get("ids") or []
+            if not ids:
+                break
+            stored = self._stored_ids(ids)
+            rows = [idx for idx, mem_id in enumerate(ids) if mem_id not in stored]
+            if rows:
+                metadatas = batch.get("metadatas") or [None] * len(ids)
+                documents = batch.get("documents") or [None] * len(ids)
+                self._write(
+                    [ids[idx] for idx in rows],
+                    np.asarray(batch["embeddings"], dtype=np.float32)[rows].tolist(),
+                    [documents[idx] for idx in rows],
+                    [dict(metadatas[idx] or {}) for idx in rows],
+                )
+            legacy.delete(ids=ids)
+            moved += len(rows)
+        self.client.delete_collection(self.shard_prefix)
+        logger.info(
+            "memory.shards_migrated",
+            f"Moved {moved} memories from {self.shard_prefix!r} into topic shards.",
+            style="green",
+            count=moved,
+        )
+        return moved
+
+    def topics(self) -> list[dict]:
+        """Return ``{"shard", "topic", "count"}`` for every shard, largest first."""
+        result = self.collection.get(include=["metadatas"])
+        rows = [
+            {"shard": shard, "topic": (meta or {}).get("topic", shard), "count": (meta or {}).get("count", 0)}
+            for shard, meta in zip(result.get("ids") or [], result.get("metadatas") or [])
+        ]
+        return sorted(rows, key=lambda row: (-row["count"], row["shard"]))
+
+    def list_memories(self, limit: int = 50) -> List[MemoryRecord]:
+        records: List[MemoryRecord] = []
+        for row in self.topics():
+            if len(records) >= limit:
+                break
+            records.extend(self._records(self._shard(row["shard"])[0], limit - len(records)))
+        return records
+
+    def delete_memory(self, memory_id: str) -> bool:
+        if not memory_id:
+            return False
+        if self.write_buffer is not None and self.write_buffer.discard(lambda entry: entry.id == memory_id):
+            self._invalidate()
+            return True
+        for row in self.topics():
+            collection, _ = self._shard(row["shard"])
+            existing = collection.get(ids=[memory_id], include=["embeddings"])
+            if not existing.get("ids"):
+                continue
+            collection.delete(ids=[memory_id])
+            self._update_centroids({row["shard"]: (row["topic"], existing["embeddings"][:1])}, sign=-1)
+            self._invalidate()
+            return True
+        return False
+
+    def reset_memory(self, batch_size: int = 200, *, topic: str | None = None) -> int:
+        """Drop every shard, or only ``topic``'s shard, together with its centroid."""
+        shards = [topic_slug(topic)] if topic else [row["shard"] for row in self.topics()]
+        deleted = self._discard_pending(topic)
+        for shard in shards:
+            existing = self.collection.get(ids=[shard], include=["metadatas"])
+            if not existing.get("ids"):
+                continue
+            deleted += (existing["metadatas"][0] or {}).get("count", 0)
+            self.client.delete_collection(self._shard_name(shard))
+            self.collection.delete(ids=[shard])
+            self._shards.pop(shard, None)
+        self._invalidate()
+        return deleted
+
+    def route(self, query_vec) -> list[str]:
+        """Return the shard keys whose centroids are closest to ``query_vec``."""
+        with timed("chroma_query"):
+            result = self.collection.query(query_embeddings=[query_vec], n_results=self.route_shards, include=[])
+        return (result.get("ids") or [[]])[0]
+
+    def _query(self, query_vec) -> list[MemoryHit]:
+        hits: list[MemoryHit] = []
+        for shard in self.route(query_vec):
+            collection, space = self._shard(shard)
+            with timed("chroma_query"):
+                result = collection.query(
+                    query_embeddings=[query_vec],
+                    n_results=self.top_k,
+                    include=["metadatas", "documents", "distances"],
+                )
+            hits.extend(self._hits(result, space))
+        hits.sort(key=lambda hit: hit[2] if hit[2] is not None else float("-inf"), reverse=True)
+        return hits[: self.top_k]
+
+    def _write(
+        self,
+        ids: list[str],
+        embeddings: list,
+        texts: list[str],
+        metadatas: list[dict],
+        *,
+        index_ivf: bool = True,
+    ) -> None:
+        groups: dict[str, list[int]] = {}
+        for idx, metadata in enumerate(metadatas):
+            groups.setdefault(topic_slug(metadata.get("topic")), []).append(idx)
+        added: dict[str, tuple[str, list]] = {}
+        with timed("chroma_write"):
+            for shard, members in groups.items():
+                collection, _ = self._shard(shard)
+                shard_ids = [ids[idx] for idx in members]
+                # Upserted ids already in the shard are counted in its centroid.
+                stored = set(collection.get(ids=shard_ids, include=[]).get("ids") or [])
+                collection.upsert(
+                    ids=shard_ids,
+                    embeddings=[embeddings[idx] for idx in members],
+                    documents=[texts[idx] for idx in members],
+                    metadatas=[metadatas[idx] for idx in members],
+                )
+                new = [embeddings[idx] for idx in members if ids[idx] not in stored]
+                if new:
+                    added[shard] = (metadatas[members[0]].get("topic") or "General", new)
+            self._update_centroids(added)
+        self._invalidate()
+
+    def _discard_pending(self, topic: str | None) -> int:
+        if self.write_buffer is None:
+            return 0
+        shard = topic_slug(topic) if topic else None
+        return self.write_buffer.discard(
+            lambda entry: shard is None or topic_slug(entry.metadata.get("topic")) == shard
+        )
+
+    def _collections(self) -> list[Collection]:
+        return [self._shard(row["shard"])[0] for row in self.topics()]
+
+    def _stored_ids(self, ids: list[str]) -> set[str]:
+        stored: set[str] = set()
+        for row in self.topics():
+            stored.update(self._shard(row["shard"])[0].get(ids=ids, include=[]).get("ids") or [])
+        return stored
+
+    def _shard(self, shard: str) -> tuple[Collection, str]:
+        if shard not in self._shards:
+            self._shards[shard] = self._open_collection(self._shard_name(shard))
+        return self._shards[shard]
+
+    def _shard_name(self, shard: str) -> str:
+        return f"{self.shard_prefix}-t-{shard}"
+
+    def _update_centroids(self, changes: dict[str, tuple[str, Any]], *, sign: int = 1) -> None:
+        """Add (or with ``sign=-1`` remove) ``{shard: (topic, embeddings)}`` in one registry read and write."""
+        if not changes:
+            return
+        # Running mean: adding m vectors summing to s to n items gives (c * n + s) / (n + m).
+        existing = self.collection.get(ids=list(changes), include=["embeddings", "metadatas"])
+        embeddings = existing.get("embeddings")
+        current = {
+            shard: (int((meta or {}).get("count", 0)), np.asarray(embedding, dtype=np.float64))
+            for shard, meta, embedding in zip(
+                existing.get("ids") or [], existing.get("metadatas") or [], embeddings if embeddings is not None else []
+            )
+        }
+        ids, centroids, metadatas, emptied = [], [], [], []
+        for shard, (topic, rows) in changes.items():
+            vectors = np.asarray(rows, dtype=np.float64)
+            count, centroid = current.get(shard, (0, np.zeros(vectors.shape[1])))
+            new_count = count + sign * len(vectors)
+            if new_count <= 0:
+                emptied.append(shard)
+                continue
+            ids.append(shard)
+            centroids.append(((centroid * count + sign * vectors.sum(axis=0)) / new_count).tolist())
+            metadatas.append({"topic": topic, "count": new_count})
+        if ids:
+            self.collection.upsert(ids=ids, embeddings=centroids, metadatas=metadatas)
+        if emptied:
+            self.collection.delete(ids=emptied)
+        for shard in emptied:
+            self.client.delete_collection(self._shard_name(shard))
+            self._shards.pop(shard, None)
+            logger.debug("memory.shard_empty", f"Shard {shard!r} is empty; dropped it.", shard=shard)
+
+
+__all__ = ["ShardedMemoryStore", "topic_slug"]
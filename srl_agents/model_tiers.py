@@ -0,0 +1,81 @@
+"""Per-node chat model settings so lightweight stages can run on a smaller model.
+
+Settings resolve, most specific first, from:
+
+1. ``SRL_<NODE>_MODEL`` / ``SRL_<NODE>_TEMPERATURE`` / ``SRL_<NODE>_TIMEOUT`` env vars;
+2. the ``[nodes.<node>]`` table of the TOML file named by ``SRL_MODEL_CONFIG``;
+3. that file's ``[default]`` table;
+4. the global ``OPENAI_MODEL`` / ``OPENAI_TEMPERATURE`` defaults.
+
+Example file::
+
+    [default]
+    model = "gpt-4o"
+
+    [nodes.critic]
+    model = "gpt-4o-mini"
+    timeout = 20
+"""
+from __future__ import annotations
+
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+# Stages that issue chat calls; query_refiner runs inside forethought retrieval.
+LLM_NODES = ("learning_context", "actor", "reflector", "critic", "query_refiner")
+_FIELDS = ("model", "temperature", "timeout")
+
+
+@dataclass(frozen=True)
+class ModelSettings:
+    """Chat model, sampling temperature and read timeout (seconds; ``None`` keeps the transport default)."""
+
+    model: str
+    temperature: float = 0.0
+    timeout: float | None = None
+
+
+def load_model_config(path: str | Path | None) -> dict[str, Any]:
+    """Parse a model tier TOML file; a missing or unset path yields an empty config."""
+    if not path:
+        return {}
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Model config {path} does not exist")
+    with path.open("rb") as handle:
+        config = tomllib.load(handle)
+    unknown = set(config.get("nodes", {})) - set(LLM_NODES)
+    if unknown:
+        raise ValueError(f"Unknown node(s) in {path}: {', '.join(sorted(unknown))}; expected {', '.join(LLM_NODES)}")
+    return config
+
+
+def resolve_model_settings(
+    node: str | None,
+    defaults: ModelSettings,
+    file_config: Mapping[str, Any] | None = None,
+    environ: Mapping[str, str] | None = None,
+) -> ModelSettings:
+    """Merge defaults, file tables and env overrides for ``node`` (``None`` = global default)."""
+    if node is not None and node not in LLM_NODES:
+        raise ValueError(f"Unknown LLM node {node!r}; expected one of {', '.join(LLM_NODES)}")
+    file_config = file_config or {}
+    environ = environ or {}
+    values: dict[str, Any] = {"model": defaults.model, "temperature": defaults.temperature, "timeout": defaults.timeout}
+    values.update({key: value for key, value in file_config.get("default", {}).items() if key in _FIELDS})
+    if node is not None:
+        values.update({key: value for key, value in file_config.get("nodes", {}).get(node, {}).items() if key in _FIELDS})
+        prefix = f"SRL_{node.upper()}_"
+        for key in _FIELDS:
+            if environ.get(prefix + key.upper()):
+                values[key] = environ[prefix + key.upper()]
+    return ModelSettings(
+        model=str(values["model"]),
+        temperature=float(values["temperature"]),
+        timeout=float(values["timeout"]) if values["timeout"] not in (None, "") else None,
+    )
+
+
+__all__ = ["LLM_NODES", "ModelSettings", "load_model_config", "resolve_model_settings"]
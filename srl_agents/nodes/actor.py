@@ -4,7 +4,8 @@ from __future__ import annotations
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
-from ..logging import console
+from ..context_packer import ContextPacker, memory_items, web_items
+from ..logging import DEBUG, logger
 from ..state import ActorOutput, AgentState
 
 _PROMPT = ChatPromptTemplate.from_messages(
@@ -25,27 +26,39 @@ _PROMPT = ChatPromptTemplate.from_messages(
 )
 
 
-def build_actor_node(llm: ChatOpenAI):
+def build_actor_node(llm: ChatOpenAI, packer: ContextPacker | None = None):
     structured_llm = llm.with_structured_output(ActorOutput)
 
     def actor_node(state: AgentState):
         query = state["query"]
-        console.rule("[bold cyan]3. Actor")
-        web_context = state.get("web_results") or "No useful web evidence returned."
+        logger.rule("3. Actor")
+        memories = state["retrieved_memories"]
+        web_context = state.get("web_results") or ""
+        if packer:
+            packed = packer.pack(memory_items(memories) + web_items(web_context))
+            if packed.dropped:
+                logger.debug(
+                    "actor.context_trimmed",
+                    f"Context packer {packed.describe_dropped()}.",
+                    style="dim",
+                    dropped=len(packed.dropped),
+                )
+            memories = packed.text("memory") or "No relevant past experience."
+            web_context = packed.text("web")
         context = state["learning_context"]
         prompt = _PROMPT.format(
-            memories=state["retrieved_memories"],
-            web_context=web_context,
+            memories=memories,
+            web_context=web_context or "No useful web evidence returned.",
             query=query,
             goal=context.learning_goal,
             criteria=context.success_criteria,
             prior=context.prior_knowledge,
         )
         result = structured_llm.invoke(prompt)
-        if result.thoughts:
+        if result.thoughts and logger.is_enabled(DEBUG):
             visible_trace = "\n".join(f"{idx}. {thought}" for idx, thought in enumerate(result.thoughts, start=1))
-            console.print(f"[dim]Visible reasoning:[/dim]\n{visible_trace}")
-        console.print(result.answer)
+            logger.debug("actor.trace", f"Visible reasoning:\n{visible_trace}", style="dim")
+        logger.info("actor.answer", result.answer, thoughts=len(result.thoughts))
         return {"response": result.answer, "actor_trace": result.thoughts}
 
     return actor_node
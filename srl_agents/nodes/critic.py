@@ -4,8 +4,8 @@ from __future__ import annotations
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
-from ..logging import console
-from ..state import AgentState, CriticOutput
+from ..logging import logger
+from ..state import AgentState, CriticOutput, ReflectionOutput
 
 _REVIEW_PROMPT = ChatPromptTemplate.from_messages(
     [
@@ -25,6 +25,31 @@ _REVIEW_PROMPT = ChatPromptTemplate.from_messages(
     ]
 )
 
+_BATCH_REVIEW_SYSTEM = (
+    "You are a strict knowledge base administrator. Review each numbered AI-generated experience rule "
+    "independently and return exactly one review per rule, with its number as the index.\n"
+    "Decision criteria:\n"
+    "1. APPROVE: Rule is accurate, safe, and generalizable.\n"
+    "2. REVISE: Rule is ambiguous, dangerous, or inaccurate. Provide revision suggestions.\n"
+    "3. DISCARD: Rule is nonsense or completely wrong.\n"
+    "Also rate each rule's expected learning impact from 1 (low) to 5 (transformational) relative to the "
+    "learner's success criteria, when given."
+)
+
+
+def build_batch_review_messages(
+    reflections: list[ReflectionOutput], success_criteria: list[str | None] | None = None
+) -> list[tuple[str, str]]:
+    """Messages asking for one ``CriticReview`` per reflection, numbered from 1."""
+    criteria = success_criteria or [None] * len(reflections)
+    rules = []
+    for index, (reflection, goal) in enumerate(zip(reflections, criteria), start=1):
+        rule = f"Rule {index}: [{reflection.topic}] {reflection.insight}\nReasoning: {reflection.reasoning}"
+        if goal:
+            rule += f"\nLearner success criteria: {goal}"
+        rules.append(rule)
+    return [("system", _BATCH_REVIEW_SYSTEM), ("user", "\n\n".join(rules))]
+
 
 def build_critic_node(llm: ChatOpenAI):
     def critic_node(state: AgentState):
@@ -40,11 +65,16 @@ def build_critic_node(llm: ChatOpenAI):
             )
         )
 
-        console.rule("[bold cyan]5. Critic")
-        console.print(f"[yellow]Decision:[/yellow] {result.decision}")
-        console.print(f"[yellow]Impact score:[/yellow] {result.impact_score}")
+        logger.rule("5. Critic")
+        logger.info(
+            "critic.decision",
+            f"Decision: {result.decision}\nImpact score: {result.impact_score}",
+            style="yellow",
+            decision=result.decision,
+            impact_score=result.impact_score,
+        )
         if result.decision == "REVISE":
-            console.print(f"[yellow]Feedback:[/yellow] {result.feedback}")
+            logger.info("critic.feedback", f"Feedback: {result.feedback}", style="yellow")
 
         update = {"review_decision": result.decision}
         if result.decision == "REVISE":
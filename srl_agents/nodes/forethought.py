@@ -1,33 +1,65 @@
 """Forethought stage node."""
 from __future__ import annotations
 
-from ..logging import console
+from typing import Callable
+
+from ..logging import logger
 from ..memory import MemoryStore
+from ..research_policy import ResearchDecision, ResearchPolicy
 from ..state import AgentState, LearningContext
 
 
-def build_forethought_node(store: MemoryStore):
+def build_forethought_node(
+    store: MemoryStore,
+    *,
+    research_available: Callable[[], bool] | None = None,
+    policy: ResearchPolicy | None = None,
+):
+    """``research_available`` reports whether web search can currently run (e.g. its circuit is closed).
+
+    ``policy`` decides from the retrieved similarities and impact scores whether
+    memory covers the question or a web search is needed.
+    """
+    policy = policy or ResearchPolicy()
+
     def forethought_node(state: AgentState):
         query = state["query"]
-        memories = store.search(query)
+        retrieval = store.retrieve(query, refined_query=state.get("refined_query"))
         learning_context: LearningContext | None = state.get("learning_context")
-        needs_research = _should_research(memories, learning_context)
-        console.rule("[bold cyan]1. Forethought")
-        console.print(memories if memories else "No memories retrieved.")
-        if not needs_research:
-            console.print("[dim]Existing memories satisfy the current goal; skipping web search.[/dim]")
-        return {"retrieved_memories": memories, "needs_research": needs_research}
+        decision = policy.decide(retrieval.hits, learning_context)
+        needs_research = decision.needs_research
+        logger.rule("1. Forethought")
+        logger.info("forethought.memories", retrieval.text or "No memories retrieved.")
+        _log_decision(decision)
+        if needs_research and research_available is not None and not research_available():
+            needs_research = False
+            logger.warning(
+                "forethought.research_unavailable",
+                "Web search is temporarily unavailable (circuit open); answering from memory only.",
+            )
+        updates: AgentState = {"retrieved_memories": retrieval.text, "needs_research": needs_research}
+        if retrieval.refined_query:
+            # Web search reuses the query memory was searched with, however it was refined.
+            updates["refined_query"] = retrieval.refined_query
+        return updates
 
     return forethought_node
 
 
-def _should_research(memories: str, learning_context: LearningContext | None) -> bool:
-    normalized = (memories or "").strip()
-    has_actionable_memory = normalized.startswith("- [")
-    if not has_actionable_memory:
-        return True
-    if not learning_context:
-        return False
-    criteria = learning_context.success_criteria.lower()
-    freshness_keywords = ("latest", "current", "recent", "up-to-date", "news", "trend")
-    return any(keyword in criteria for keyword in freshness_keywords)
+def _log_decision(decision: ResearchDecision) -> None:
+    similarity = f"{decision.top_similarity:.2f}" if decision.top_similarity is not None else "n/a"
+    impact = f", impact {decision.top_impact}" if decision.top_impact is not None else ""
+    detail = f"{decision.reason}: top similarity {similarity}{impact}"
+    if decision.needs_research:
+        message = f"Memories do not cover the current goal ({detail}); researching."
+    else:
+        message = f"Existing memories satisfy the current goal ({detail}); skipping web search."
+    logger.info(
+        "forethought.research_decision",
+        message,
+        style="dim",
+        needs_research=decision.needs_research,
+        reason=decision.reason,
+        top_similarity=decision.top_similarity,
+        top_impact=decision.top_impact,
+    )
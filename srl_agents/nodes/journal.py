@@ -0,0 +1,29 @@
+"""Journal stage node: defers reflection by recording the finished interaction."""
+from __future__ import annotations
+
+from ..logging import logger
+from ..reflection_journal import Interaction, InteractionJournal
+from ..state import AgentState
+
+
+def build_journal_node(journal: InteractionJournal):
+    def journal_node(state: AgentState):
+        learning_context = state.get("learning_context")
+        interaction = Interaction(
+            query=state["query"],
+            response=state["response"],
+            actor_trace=state.get("actor_trace", []),
+            retrieved_memories=state.get("retrieved_memories", ""),
+            web_results=state.get("web_results", ""),
+            success_criteria=learning_context.success_criteria if learning_context else None,
+        )
+        journal.append(interaction)
+        logger.info(
+            "journal.deferred",
+            f"Interaction journaled for batch reflection ({journal.path}).",
+            style="dim",
+            interaction=interaction.id,
+        )
+        return {}
+
+    return journal_node
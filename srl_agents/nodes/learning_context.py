@@ -4,36 +4,57 @@ from __future__ import annotations
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
-from ..logging import console
-from ..state import AgentState, LearningContext
+from ..logging import logger
+from ..query_refiner import SEARCH_QUERY_GUIDANCE
+from ..state import AgentState, FusedLearningContext, LearningContext
+
+_INSTRUCTIONS = (
+    "You are a visible-learning coach. Rewrite the learner's question into structured intent metadata:\n"
+    "- learning_goal: describe the target skill or understanding in the learner's own words\n"
+    "- success_criteria: list observable evidence that would prove success\n"
+    "- prior_knowledge: summarize what the learner already seems to know (or misconceptions)"
+)
 
 _PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", _INSTRUCTIONS),
+        ("user", "Learner question: {query}"),
+    ]
+)
+
+_FUSED_PROMPT = ChatPromptTemplate.from_messages(
     [
         (
             "system",
-            "You are a visible-learning coach. Rewrite the learner's question into structured intent metadata:\n"
-            "- learning_goal: describe the target skill or understanding in the learner's own words\n"
-            "- success_criteria: list observable evidence that would prove success\n"
-            "- prior_knowledge: summarize what the learner already seems to know (or misconceptions)",
+            _INSTRUCTIONS + "\n- search_query: a terse semantic search string for memory retrieval. "
+            + SEARCH_QUERY_GUIDANCE,
         ),
         ("user", "Learner question: {query}"),
     ]
 )
 
 
-def build_learning_context_node(llm: ChatOpenAI):
-    structured_llm = llm.with_structured_output(LearningContext)
+def build_learning_context_node(llm: ChatOpenAI, *, fused: bool = False):
+    """Extract the learning context; with ``fused`` the same call also yields the memory search query."""
+    structured_llm = llm.with_structured_output(FusedLearningContext if fused else LearningContext)
+    prompt = _FUSED_PROMPT if fused else _PROMPT
 
     def learning_context_node(state: AgentState):
         query = state["query"]
-        console.rule("[bold cyan]0. Learning Context")
-        console.print(f"[bold]Learner question:[/bold] {query}")
-        context = structured_llm.invoke(_PROMPT.format(query=query))
-        console.print(
-            f"[green]Goal:[/green] {context.learning_goal}\n"
-            f"[green]Success criteria:[/green] {context.success_criteria}\n"
-            f"[green]Prior knowledge:[/green] {context.prior_knowledge}"
+        logger.rule("0. Learning Context")
+        logger.info("learning_context.query", f"Learner question: {query}", style="bold", query=query)
+        context = structured_llm.invoke(prompt.format(query=query))
+        logger.info(
+            "learning_context.result",
+            f"Goal: {context.learning_goal}\n"
+            f"Success criteria: {context.success_criteria}\n"
+            f"Prior knowledge: {context.prior_knowledge}",
+            style="green",
         )
-        return {"learning_context": context}
+        if not fused:
+            return {"learning_context": context}
+        search_query = context.search_query.strip()
+        logger.debug("learning_context.search_query", f"Memory search query: {search_query}", style="dim")
+        return {"learning_context": context.learning_context(), "refined_query": search_query or query}
 
     return learning_context_node
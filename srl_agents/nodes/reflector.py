@@ -4,7 +4,8 @@ from __future__ import annotations
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
-from ..logging import console
+from ..context_packer import ContextPacker, memory_items, trace_items, web_items
+from ..logging import logger
 from ..state import AgentState, ReflectionOutput
 
 _SYSTEM_MSG_INITIAL = (
@@ -17,36 +18,59 @@ _SYSTEM_MSG_REVISION = (
 )
 
 
-def build_reflector_node(llm: ChatOpenAI):
+def build_reflector_node(llm: ChatOpenAI, packer: ContextPacker | None = None):
     def reflector_node(state: AgentState):
         query = state["query"]
-        response = state["response"]
-        actor_trace = state.get("actor_trace", [])
-        retrieved_memories = state.get("retrieved_memories", "")
-        web_results = state.get("web_results", "")
-        feedback = state.get("critic_feedback", "")
         retry_count = state.get("retry_count", 0)
-
-        if feedback:
-            console.rule(f"[bold cyan]4. Reflector · Attempt {retry_count}")
-            system_msg = _SYSTEM_MSG_REVISION.format(feedback=feedback)
+        if state.get("critic_feedback", ""):
+            logger.rule(f"4. Reflector · Attempt {retry_count}")
         else:
-            console.rule("[bold cyan]4. Reflector")
-            system_msg = _SYSTEM_MSG_INITIAL
-
-        prompt = ChatPromptTemplate.from_messages(
-            _build_reflection_messages(system_msg, query, response, actor_trace, retrieved_memories, web_results)
-        )
+            logger.rule("4. Reflector")
 
         structured_llm = llm.with_structured_output(ReflectionOutput)
-        reflection = structured_llm.invoke(prompt.format())
+        reflection = structured_llm.invoke(build_reflection_prompt(state, packer))
         reflection = reflection.model_copy(update={"source_query": query})
-        console.print(f"[magenta]Proposed rule:[/magenta] {reflection.insight}")
+        logger.info(
+            "reflector.proposal",
+            f"Proposed rule: {reflection.insight}",
+            style="magenta",
+            topic=reflection.topic,
+            attempt=retry_count + 1,
+        )
         return {"proposed_reflection": reflection, "retry_count": retry_count + 1}
 
     return reflector_node
 
 
+def build_reflection_prompt(state: AgentState, packer: ContextPacker | None = None) -> str:
+    """Format the reflector prompt for an interaction; a ``critic_feedback`` entry asks for a revision."""
+    actor_trace = state.get("actor_trace", [])
+    retrieved_memories = state.get("retrieved_memories", "")
+    web_results = state.get("web_results", "")
+    feedback = state.get("critic_feedback", "")
+    system_msg = _SYSTEM_MSG_REVISION.format(feedback=feedback) if feedback else _SYSTEM_MSG_INITIAL
+
+    if packer:
+        packed = packer.pack(trace_items(actor_trace) + memory_items(retrieved_memories) + web_items(web_results))
+        if packed.dropped:
+            logger.debug(
+                "reflector.context_trimmed",
+                f"Context packer {packed.describe_dropped()}.",
+                style="dim",
+                dropped=len(packed.dropped),
+            )
+        actor_trace = packed.items("trace")
+        retrieved_memories = packed.text("memory")
+        web_results = packed.text("web")
+
+    prompt = ChatPromptTemplate.from_messages(
+        _build_reflection_messages(
+            system_msg, state["query"], state["response"], actor_trace, retrieved_memories, web_results
+        )
+    )
+    return prompt.format()
+
+
 def _build_reflection_messages(
     system_msg: str,
     query: str,
@@ -1,7 +1,7 @@
 """Storage stage node."""
 from __future__ import annotations
 
-from ..logging import console
+from ..logging import logger
 from ..memory import MemoryStore
 from ..state import AgentState
 
@@ -13,8 +13,11 @@ def build_store_node(store: MemoryStore):
         reflection = state["proposed_reflection"]
         impact_score = state.get("impact_score", 0)
         if impact_score < MIN_IMPACT_SCORE:
-            console.print(
-                f"[yellow]Skipping storage (impact score {impact_score} < {MIN_IMPACT_SCORE}).[/yellow]"
+            logger.info(
+                "store.skipped",
+                f"Skipping storage (impact score {impact_score} < {MIN_IMPACT_SCORE}).",
+                style="yellow",
+                impact_score=impact_score,
             )
             return {}
 
@@ -1,21 +1,29 @@
 """Web search stage node."""
 from __future__ import annotations
 
-from ..logging import console
+from ..logging import logger
 from ..state import AgentState
+from ..tools.search_cache import is_time_sensitive
 from ..tools.web_search import WebSearchTool
 
 
-def build_web_search_node(tool: WebSearchTool):
+def build_web_search_node(tool: WebSearchTool, *, timeout: float | None = None):
+    """Search the raw query, the refined memory query and the learning goal concurrently."""
+
     def web_search_node(state: AgentState):
         query = state["query"]
-        console.rule("[bold cyan]2. Web Search")
-        results = tool.search(query)
+        logger.rule("2. Web Search")
+        learning_context = state.get("learning_context")
+        fresh = bool(learning_context and is_time_sensitive(learning_context.success_criteria))
+        variants = [query, state.get("refined_query") or ""]
+        if learning_context:
+            variants.append(learning_context.learning_goal)
+        results = tool.search_many(variants, fresh=fresh, timeout=timeout)
         summary = tool.format_results(results)
         if summary:
-            console.print(summary)
+            logger.info("web_search.results", summary, results=len(results))
         else:
-            console.print("[dim]No useful external links discovered.[/dim]")
+            logger.info("web_search.empty", "No useful external links discovered.", style="dim")
         return {"web_results": summary}
 
     return web_search_node
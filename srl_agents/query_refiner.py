@@ -1,17 +1,24 @@
 """Utilities for rewriting learner queries before memory retrieval."""
 from __future__ import annotations
 
+import re
+from typing import Callable
+
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
-from .logging import console
+from .logging import logger
+from .rate_limit import Priority, priority
+
+# Shared with the fused learning-context prompt so both modes produce the same kind of string.
+SEARCH_QUERY_GUIDANCE = "Highlight key skills, intents, and error patterns. Keep it under 40 words."
 
 _PROMPT = ChatPromptTemplate.from_messages(
     [
         (
             "system",
-            "Rewrite the learner's request into a terse semantic search string. "
-            "Highlight key skills, intents, and error patterns. Keep it under 40 words.",
+            "Rewrite the learner's request into a terse semantic search string. " + SEARCH_QUERY_GUIDANCE,
         ),
         ("user", "Original query: {query}\nRefined search string:"),
     ]
@@ -28,9 +35,115 @@ class LLMQueryRefiner:
         if not query.strip():
             return query
         try:
-            result = self.chain.invoke({"query": query})
+            with priority(Priority.BACKGROUND):
+                result = self.chain.invoke({"query": query})
             refined = (result.content or "").strip()
             return refined or query
         except Exception as exc:  # pragma: no cover
-            console.print(f"[yellow]Query refinement failed:[/yellow] {exc}")
+            logger.warning("query_refiner.failed", f"Query refinement failed: {exc}")
+            return query
+
+
+_STOPWORDS = frozenset(
+    """
+    a about above after again against all am an and any are as at be because been before being below
+    between both but by can could did do does doing down during each few for from further had has have
+    having he her here hers herself him himself his how i if in into is it its itself just let me more
+    most my myself no nor not now of off on once only or other our ours ourselves out over own same she
+    should so some such than that the their theirs them themselves then there these they this those
+    through to too under until up very was we were what when where which while who whom why will with
+    would you your yours yourself yourselves
+    anyone anything best better get getting got keep kind know like make need please really right
+    something still thing things tried trying use using want way help explain tell show give
+    """.split()
+)
+_ERROR_PATTERNS = (
+    re.compile(r"\b[A-Za-z_][A-Za-z0-9_]*(?:Error|Exception|Warning|Fault)\b"),
+    re.compile(r"\b(?:errno|exit code|exit status|status code|error code|http)\s*:?\s*-?\d+\b", re.IGNORECASE),
+    re.compile(
+        r"\b(?:segmentation fault|segfault|stack overflow|out of memory|permission denied|not found|"
+        r"timed out|timeout|deadlock|race condition|memory leak|null pointer|undefined reference|"
+        r"syntax error|merge conflict|detached head|infinite loop|off by one|traceback)\b",
+        re.IGNORECASE,
+    ),
+)
+_TOKEN = re.compile(r"\d+(?:\.\d+)+|[A-Za-z_][\w.+#/-]*[\w+#]|[A-Za-z]")
+
+
+def _is_entity(token: str, sentence_start: bool) -> bool:
+    """Identifiers, dotted names, versions, acronyms and mid-sentence proper nouns."""
+    if any(char in token for char in "_./#+") or any(char.isdigit() for char in token):
+        return True
+    if token.isupper() and len(token) > 1:
+        return True
+    if any(char.isupper() for char in token[1:]):
+        return True
+    return token[0].isupper() and not sentence_start
+
+
+def _dedupe_key(term: str) -> str:
+    key = term.lower()
+    if len(key) > 4 and key.endswith("ies"):
+        return key[:-3] + "y"
+    if len(key) > 3 and key.endswith("s") and not key.endswith("ss"):
+        return key[:-1]
+    return key
+
+
+class LocalQueryRefiner:
+    """Rule-based refiner: error patterns, entities, then content keywords, deduplicated.
+
+    Produces the same kind of terse search string as ``LLMQueryRefiner`` in
+    microseconds and without an API call, for both searches and stored reflections.
+    """
+
+    def __init__(self, max_terms: int = 24):
+        self.max_terms = max_terms
+
+    def __call__(self, query: str) -> str:
+        if not query.strip():
             return query
+        errors: list[str] = []
+        for pattern in _ERROR_PATTERNS:
+            errors.extend(match.group(0) for match in pattern.finditer(query))
+
+        entities: list[str] = []
+        keywords: list[str] = []
+        sentence_start = True
+        for match in _TOKEN.finditer(query):
+            token = match.group(0).strip(".-/")
+            if token:
+                if _is_entity(token, sentence_start):
+                    entities.append(token)
+                elif token.lower() not in _STOPWORDS and len(token) > 1:
+                    keywords.append(token.lower())
+            tail = query[match.end() : match.end() + 2]
+            sentence_start = tail[:1] in ("?", "!", ":", "\n") or tail.startswith(". ") or tail == "."
+
+        terms: list[str] = []
+        seen: set[str] = set()
+        for term in (*errors, *entities, *keywords):
+            key = _dedupe_key(term)
+            if key in seen or key in _STOPWORDS:
+                continue
+            # Words inside a multi-word error phrase are not repeated on their own.
+            seen.add(key)
+            seen.update(_dedupe_key(word) for word in term.split())
+            terms.append(term)
+            if len(terms) >= self.max_terms:
+                break
+        return " ".join(terms) or query
+
+
+def build_query_refiner(kind: str, llm: BaseChatModel | None = None) -> Callable[[str], str] | None:
+    """Return the refiner selected by ``SRL_QUERY_REFINER``: ``llm``, ``local`` or ``none``."""
+    kind = kind.lower()
+    if kind == "llm":
+        if llm is None:
+            raise ValueError("The 'llm' query refiner requires a chat model")
+        return LLMQueryRefiner(llm)
+    if kind == "local":
+        return LocalQueryRefiner()
+    if kind == "none":
+        return None
+    raise ValueError(f"Unknown query refiner {kind!r}; expected llm, local or none")
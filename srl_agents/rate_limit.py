@@ -0,0 +1,407 @@
+"""Process-wide token-bucket limiter with priority classes for OpenAI calls.
+
+Every chat and embedding request acquires from one shared ``RateLimiter`` before
+it is sent. Waiters are served strictly by priority class (then arrival order),
+so the learner-facing Actor keeps stable latency while reflection and critique
+absorb throttling. A 429 from the API halves the effective rate and pauses the
+bucket; successful calls recover it additively.
+
+Chat responses served from the LLM cache never acquire, so they are neither
+reconciled nor counted as successes. The OpenAI SDK's own retries go through the
+limiter via ``http_event_hooks`` on the shared HTTP client.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from functools import wraps
+from typing import Any, Callable, Iterator
+from uuid import UUID
+
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.embeddings import Embeddings
+from langchain_core.outputs import LLMResult
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from .context_packer import approximate_tokens
+from .instrumentation import extract_token_usage, timed
+
+
+class Priority(IntEnum):
+    """Lower values are served first."""
+
+    ACTOR = 0
+    INTERACTIVE = 1
+    BACKGROUND = 2
+
+
+_current_priority: ContextVar[Priority] = ContextVar("srl_request_priority", default=Priority.INTERACTIVE)
+# Header the OpenAI SDK sets on every attempt; values above 0 are its internal retries.
+_RETRY_COUNT_HEADER = "x-stainless-retry-count"
+# Set on 429 responses already reported by the HTTP hooks, so the raised error is not counted twice.
+_THROTTLE_RECORDED = "srl_throttle_recorded"
+
+
+class _Reservation:
+    """Marks whether a chat run acquired from the limiter (cache hits do not)."""
+
+    __slots__ = ("acquired",)
+
+    def __init__(self) -> None:
+        self.acquired = False
+
+
+_current_reservation: ContextVar[_Reservation | None] = ContextVar("srl_rate_limit_reservation", default=None)
+
+
+def _mark_acquired() -> None:
+    reservation = _current_reservation.get()
+    if reservation is not None:
+        reservation.acquired = True
+
+
+@contextmanager
+def priority(level: Priority) -> Iterator[None]:
+    """Run the enclosed OpenAI calls under the given priority class."""
+    token = _current_priority.set(level)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def prioritized(node: Callable[[Any], Any], level: Priority) -> Callable[[Any], Any]:
+    """Wrap a graph node so every call it makes uses ``level``."""
+
+    @wraps(node)
+    def prioritized_node(state):
+        with priority(level):
+            return node(state)
+
+    return prioritized_node
+
+
+class _Bucket:
+    def __init__(self, per_minute: float, burst_seconds: float):
+        self.per_minute = per_minute
+        self.capacity = max(1.0, per_minute * burst_seconds / 60)
+        self.level = self.capacity
+
+    def refill(self, elapsed: float, factor: float) -> None:
+        self.level = min(self.capacity, self.level + elapsed * self.per_minute * factor / 60)
+
+    def wait_for(self, cost: float, factor: float) -> float:
+        deficit = min(cost, self.capacity) - self.level
+        return 0.0 if deficit <= 0 else deficit * 60 / (self.per_minute * factor)
+
+
+class RateLimiter:
+    """Token buckets for requests and tokens per minute with priority-ordered waiters."""
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        *,
+        burst_seconds: float = 10.0,
+        min_rate_fraction: float = 0.1,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._requests = _Bucket(requests_per_minute, burst_seconds) if requests_per_minute else None
+        self._tokens = _Bucket(tokens_per_minute, burst_seconds) if tokens_per_minute else None
+        self.min_rate_fraction = min_rate_fraction
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._waiters: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._last_refill = clock()
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+        self.rate_factor = 1.0
+        self._delays: dict[Priority, deque[float]] = {level: deque(maxlen=1000) for level in Priority}
+        self._totals: dict[Priority, list[float]] = {level: [0, 0.0, 0.0] for level in Priority}
+        self.throttle_events = 0
+
+    def acquire(self, tokens: int = 0, level: Priority | None = None) -> float:
+        """Block until the request may be sent; return the queueing delay in seconds."""
+        level = _current_priority.get() if level is None else level
+        start = self._clock()
+        with self._cond:
+            ticket = (int(level), next(self._sequence))
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    self._refill(now)
+                    wait = None
+                    if self._waiters[0] == ticket:
+                        wait = max(self._paused_until - now, self._wait_for(tokens))
+                        if wait <= 0:
+                            self._consume(tokens)
+                            break
+                    self._cond.wait(timeout=wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+        delay = self._clock() - start
+        self._record_delay(level, delay)
+        return delay
+
+    def debit(self, tokens: int) -> None:
+        """Correct the token bucket once actual usage is known (negative refunds)."""
+        if self._tokens is None or not tokens:
+            return
+        with self._cond:
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level - tokens)
+            self._cond.notify_all()
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        """Record a 429: halve the effective rate and pause new requests."""
+        with self._cond:
+            self.throttle_events += 1
+            self._consecutive_throttles += 1
+            self.rate_factor = max(self.min_rate_fraction, self.rate_factor / 2)
+            backoff = retry_after or min(
+                self.max_backoff, self.base_backoff * 2 ** (self._consecutive_throttles - 1)
+            )
+            self._paused_until = max(self._paused_until, self._clock() + backoff)
+            self._cond.notify_all()
+
+    def succeeded(self) -> None:
+        """Record a successful call: recover the effective rate additively."""
+        with self._cond:
+            self._consecutive_throttles = 0
+            if self.rate_factor < 1.0:
+                self.rate_factor = min(1.0, self.rate_factor + 0.05)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Queueing delay per priority class (seconds)."""
+        with self._cond:
+            report = {}
+            for level in Priority:
+                count, total, worst = self._totals[level]
+                samples = sorted(self._delays[level])
+                p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))] if samples else 0.0
+                report[level.name.lower()] = {
+                    "requests": count,
+                    "mean_wait_s": total / count if count else 0.0,
+                    "p95_wait_s": p95,
+                    "max_wait_s": worst,
+                }
+            return report
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._last_refill)
+        self._last_refill = now
+        for bucket in (self._requests, self._tokens):
+            if bucket:
+                bucket.refill(elapsed, self.rate_factor)
+
+    def _wait_for(self, tokens: int) -> float:
+        waits = [0.0]
+        if self._requests:
+            waits.append(self._requests.wait_for(1, self.rate_factor))
+        if self._tokens and tokens:
+            waits.append(self._tokens.wait_for(tokens, self.rate_factor))
+        return max(waits)
+
+    def _consume(self, tokens: int) -> None:
+        if self._requests:
+            self._requests.level -= 1
+        if self._tokens and tokens:
+            self._tokens.level -= min(tokens, self._tokens.capacity)
+
+    def _record_delay(self, level: Priority, delay: float) -> None:
+        with self._cond:
+            self._delays[level].append(delay)
+            totals = self._totals[level]
+            totals[0] += 1
+            totals[1] += delay
+            totals[2] = max(totals[2], delay)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    return getattr(exc, "status_code", None) == 429 or type(exc).__name__ == "RateLimitError"
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    return _retry_after_header(getattr(getattr(exc, "response", None), "headers", None) or {})
+
+
+def _retry_after_header(headers: Any) -> float | None:
+    try:
+        return float(headers.get("retry-after")) if headers.get("retry-after") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _record_throttle(limiter: RateLimiter, exc: BaseException) -> None:
+    response = getattr(exc, "response", None)
+    if isinstance(response, httpx.Response) and response.extensions.get(_THROTTLE_RECORDED):
+        return
+    limiter.throttled(_retry_after(exc))
+
+
+def _is_sdk_retry(request: httpx.Request) -> bool:
+    try:
+        return int(request.headers.get(_RETRY_COUNT_HEADER) or 0) > 0
+    except ValueError:
+        return False
+
+
+def _report_throttled_response(limiter: RateLimiter, response: httpx.Response) -> None:
+    if response.status_code == 429:
+        limiter.throttled(_retry_after_header(response.headers))
+        response.extensions[_THROTTLE_RECORDED] = True
+
+
+def http_event_hooks(limiter: RateLimiter) -> dict[str, list[Callable[..., Any]]]:
+    """httpx ``event_hooks`` that admit the SDK's retries through ``limiter`` and report each 429.
+
+    The first attempt was already admitted by ``ChatRateLimiter``/``RateLimitedEmbeddings``;
+    a retry needs a request slot but no tokens, since the rejected attempt used none.
+    """
+
+    def on_request(request: httpx.Request) -> None:
+        if _is_sdk_retry(request):
+            with timed("rate_limit"):
+                limiter.acquire()
+
+    def on_response(response: httpx.Response) -> None:
+        _report_throttled_response(limiter, response)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def async_http_event_hooks(limiter: RateLimiter) -> dict[str, list[Callable[..., Any]]]:
+    """Coroutine counterpart of ``http_event_hooks`` for ``httpx.AsyncClient``."""
+
+    async def on_request(request: httpx.Request) -> None:
+        if _is_sdk_retry(request):
+            await asyncio.to_thread(limiter.acquire, 0, _current_priority.get())
+
+    async def on_response(response: httpx.Response) -> None:
+        _report_throttled_response(limiter, response)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+class ChatRateLimiter(BaseRateLimiter):
+    """LangChain ``rate_limiter`` adapter reserving an estimated token cost per chat call."""
+
+    def __init__(self, limiter: RateLimiter, *, estimated_tokens: int = 1500):
+        self.limiter = limiter
+        self.estimated_tokens = estimated_tokens
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        with timed("rate_limit"):
+            self.limiter.acquire(self.estimated_tokens)
+        _mark_acquired()
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        # Capture the caller's priority before hopping to a worker thread.
+        level = _current_priority.get()
+        await asyncio.to_thread(self.limiter.acquire, self.estimated_tokens, level)
+        _mark_acquired()
+        return True
+
+
+class RateLimitCallbackHandler(BaseCallbackHandler):
+    """Reconcile reserved tokens with reported usage and adapt to 429 responses.
+
+    Only runs that acquired through ``ChatRateLimiter`` are reconciled: each run
+    gets a reservation in a context variable at start, which ``acquire`` marks.
+    """
+
+    # Inline, so the reservation is set in the caller's context before the model acquires.
+    run_inline = True
+
+    def __init__(self, limiter: RateLimiter, *, estimated_tokens: int = 1500):
+        self.limiter = limiter
+        self.estimated_tokens = estimated_tokens
+        self._lock = threading.Lock()
+        self._reservations: dict[UUID, _Reservation] = {}
+
+    def on_chat_model_start(self, serialized: dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_llm_start(self, serialized: dict[str, Any], prompts: list[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        reservation = self._finish(run_id)
+        if reservation is None or not reservation.acquired:
+            return
+        input_tokens, output_tokens = extract_token_usage(response)
+        if input_tokens or output_tokens:
+            self.limiter.debit(input_tokens + output_tokens - self.estimated_tokens)
+        self.limiter.succeeded()
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+        if is_rate_limit_error(error):
+            _record_throttle(self.limiter, error)
+
+    def _start(self, run_id: UUID) -> None:
+        reservation = _Reservation()
+        with self._lock:
+            self._reservations[run_id] = reservation
+        _current_reservation.set(reservation)
+
+    def _finish(self, run_id: UUID) -> _Reservation | None:
+        with self._lock:
+            return self._reservations.pop(run_id, None)
+
+
+class RateLimitedEmbeddings(Embeddings):
+    """Embeddings wrapper that acquires from the shared limiter before each request."""
+
+    def __init__(self, inner: Embeddings, limiter: RateLimiter):
+        self.inner = inner
+        self.limiter = limiter
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._call(approximate_tokens(text), lambda: self.inner.embed_query(text))
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        cost = sum(approximate_tokens(text) for text in texts)
+        return self._call(cost, lambda: self.inner.embed_documents(texts))
+
+    def _call(self, tokens: int, request: Callable[[], Any]) -> Any:
+        with timed("rate_limit"):
+            self.limiter.acquire(tokens)
+        try:
+            result = request()
+        except Exception as exc:
+            if is_rate_limit_error(exc):
+                _record_throttle(self.limiter, exc)
+            raise
+        self.limiter.succeeded()
+        return result
+
+
+__all__ = [
+    "ChatRateLimiter",
+    "Priority",
+    "RateLimitCallbackHandler",
+    "RateLimitedEmbeddings",
+    "RateLimiter",
+    "async_http_event_hooks",
+    "http_event_hooks",
+    "prioritized",
+    "priority",
+]
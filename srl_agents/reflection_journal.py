@@ -0,0 +1,114 @@
+"""Local journal of completed interactions awaiting deferred reflection.
+
+With ``SRL_DEFERRED_REFLECTION=1`` the graph ends after the Actor and appends
+the interaction here instead of calling the Reflector and Critic; a later
+``memory_cli.py reflect-batch`` run works through the journal (see
+``batch_reflection``).
+
+Agents append to ``path``. A batch run claims everything appended so far by
+renaming it and folding it into ``<path>.processing``; entries leave that file
+only once they are fully handled, so interactions from a crashed or failed run
+are picked up again by the next one while new interactions keep accumulating.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable
+from uuid import uuid4
+
+
+@dataclass
+class Interaction:
+    """Everything the Reflector sees about one completed run."""
+
+    query: str
+    response: str
+    actor_trace: list[str] = field(default_factory=list)
+    retrieved_memories: str = ""
+    web_results: str = ""
+    success_criteria: str | None = None
+    id: str = field(default_factory=lambda: str(uuid4()))
+    created_at: float = field(default_factory=time.time)
+
+    def state(self) -> dict:
+        """The graph-state view of this interaction used to build the reflector prompt."""
+        return {
+            "query": self.query,
+            "response": self.response,
+            "actor_trace": self.actor_trace,
+            "retrieved_memories": self.retrieved_memories,
+            "web_results": self.web_results,
+        }
+
+
+class InteractionJournal:
+    """Append-only JSONL journal with claim/complete semantics for batch processing."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.processing_path = self.path.with_name(self.path.name + ".processing")
+        self._claim_path = self.path.with_name(self.path.name + ".claim")
+        self._lock = threading.Lock()
+
+    def append(self, interaction: Interaction) -> None:
+        line = json.dumps(asdict(interaction), ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def pending(self) -> int:
+        """How many interactions are waiting, including claimed but unfinished ones."""
+        return sum(1 for path in (self._claim_path, self.processing_path, self.path) for _ in self._read(path))
+
+    def claim(self, limit: int | None = None) -> list[Interaction]:
+        """Move newly appended interactions into the processing file and return up to ``limit`` of them."""
+        with self._lock:
+            if self.path.exists() and not self._claim_path.exists():
+                os.replace(self.path, self._claim_path)
+            if self._claim_path.exists():
+                with self.processing_path.open("a", encoding="utf-8") as handle:
+                    handle.write(self._claim_path.read_text(encoding="utf-8"))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                self._claim_path.unlink()
+            # Keyed by id: a crash between the append and the unlink above re-adds a claim file.
+            claimed = list({entry.id: entry for entry in self._read(self.processing_path)}.values())
+        return claimed[:limit] if limit is not None else claimed
+
+    def complete(self, ids: Iterable[str]) -> None:
+        """Drop finished interactions from the processing file."""
+        done = set(ids)
+        with self._lock:
+            remaining = [entry for entry in self._read(self.processing_path) if entry.id not in done]
+            if not remaining:
+                self.processing_path.unlink(missing_ok=True)
+                return
+            tmp = self.processing_path.with_name(self.processing_path.name + ".tmp")
+            with tmp.open("w", encoding="utf-8") as handle:
+                handle.writelines(json.dumps(asdict(entry), ensure_ascii=False) + "\n" for entry in remaining)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp, self.processing_path)
+
+    @staticmethod
+    def _read(path: Path) -> Iterable[Interaction]:
+        if not path.exists():
+            return
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    yield Interaction(**json.loads(line))
+                except (json.JSONDecodeError, TypeError):
+                    # A torn final line from a crash mid-append was never acknowledged.
+                    continue
+
+
+__all__ = ["Interaction", "InteractionJournal"]
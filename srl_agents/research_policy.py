@@ -0,0 +1,61 @@
+"""Decide whether forethought needs a web search from retrieval scores.
+
+A memory only counts as covering the question when its similarity clears
+``min_similarity``; rendered fallback lines below that threshold do not. Goals
+whose success criteria ask for current information (``is_time_sensitive``) need
+a near-duplicate memory (``fresh_similarity``) instead of triggering a search
+unconditionally. Strong matches that the critic scored below ``min_impact`` are
+not trusted on their own; memories stored without an impact score are.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from .memory import MemoryHit
+from .state import LearningContext
+from .tools.search_cache import is_time_sensitive
+
+
+@dataclass(frozen=True)
+class ResearchDecision:
+    needs_research: bool
+    # no_memories, weak_match, stale_match, low_impact, strong_match or fresh_match
+    reason: str
+    top_similarity: float | None = None
+    top_impact: int | None = None
+
+
+@dataclass(frozen=True)
+class ResearchPolicy:
+    """Similarity and impact thresholds for skipping web research."""
+
+    min_similarity: float = 0.5
+    fresh_similarity: float = 0.8
+    min_impact: int = 2
+
+    def __post_init__(self) -> None:
+        if not -1.0 <= self.min_similarity <= self.fresh_similarity <= 1.0:
+            raise ValueError("Expected -1 <= min_similarity <= fresh_similarity <= 1")
+
+    def decide(
+        self, hits: Sequence[MemoryHit], learning_context: LearningContext | None = None
+    ) -> ResearchDecision:
+        scored = [(meta, score) for meta, _, score in hits if score is not None]
+        if not scored:
+            return ResearchDecision(True, "no_memories")
+        top_similarity = max(score for _, score in scored)
+        fresh = learning_context is not None and is_time_sensitive(learning_context.success_criteria)
+        threshold = self.fresh_similarity if fresh else self.min_similarity
+        strong = [meta.get("impact_score") for meta, score in scored if score >= threshold]
+        impacts = [impact for impact in strong if impact is not None]
+        top_impact = max(impacts) if impacts else None
+        if not strong:
+            reason = "stale_match" if fresh and top_similarity >= self.min_similarity else "weak_match"
+            return ResearchDecision(True, reason, top_similarity)
+        if len(impacts) == len(strong) and top_impact < self.min_impact:
+            return ResearchDecision(True, "low_impact", top_similarity, top_impact)
+        return ResearchDecision(False, "fresh_match" if fresh else "strong_match", top_similarity, top_impact)
+
+
+__all__ = ["ResearchDecision", "ResearchPolicy"]
@@ -0,0 +1,94 @@
+"""In-process LRU of memory retrievals, invalidated by a write generation.
+
+``MemoryStore`` bumps the cache generation on every ``add``, ``delete_memory``,
+``reset_memory``, collection write and IVF rebuild, which drops every cached
+result. Between writes a repeated retrieval is a dict lookup: no query
+refinement, embedding call or Chroma query.
+
+Writes made by another process (e.g. ``memory_cli.py delete`` while an agent is
+running) are not seen until this process writes or the entry is evicted.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Hashable
+
+from .tools.web_search import normalize_query
+
+if TYPE_CHECKING:
+    from .memory import Retrieval
+
+
+@dataclass
+class RetrievalCacheStats:
+    """Occupancy and effectiveness of a ``RetrievalCache`` since it was created."""
+
+    entries: int
+    max_entries: int
+    generation: int
+    hits: int
+    misses: int
+    invalidations: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class RetrievalCache:
+    """Thread-safe LRU of retrievals keyed by normalized query and search parameters."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, Retrieval] = OrderedDict()
+        self._hits = self._misses = self._invalidations = 0
+
+    @staticmethod
+    def key(query: str, *params: Hashable) -> tuple:
+        return (normalize_query(query), *params)
+
+    def get(self, key: tuple) -> Retrieval | None:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def put(self, key: tuple, result: Retrieval, generation: int) -> None:
+        """Store ``result`` unless a write happened since it was computed at ``generation``."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Start a new generation, dropping every cached result."""
+        with self._lock:
+            self.generation += 1
+            self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> RetrievalCacheStats:
+        with self._lock:
+            return RetrievalCacheStats(
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                generation=self.generation,
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+            )
+
+
+__all__ = ["RetrievalCache", "RetrievalCacheStats"]
@@ -0,0 +1,141 @@
+"""Rolling JSONL log of memory retrievals and the statistics ``memory_cli.py stats`` reports.
+
+``MemoryStore.retrieve`` appends one line per call: wall time, whether the
+retrieval cache answered it, the hit similarities and the outcome (``hit``: at
+least one memory cleared ``min_similarity``; ``fallback``: only weaker memories
+were shown; ``empty``: nothing was retrieved). Once the file holds twice
+``max_entries`` lines it is compacted to the newest ``max_entries``, so reading
+it stays cheap. Appends are unsynchronized across processes; a line lost to a
+concurrent compaction only thins the sample.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Sequence
+
+# Upper edges of the similarity histogram buckets.
+SIMILARITY_BINS = (0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+@dataclass
+class RetrievalStats:
+    """Aggregate retrieval quality and latency over logged retrievals."""
+
+    searches: int
+    cached: int
+    hits: int
+    fallbacks: int
+    empty: int
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    # Top-hit similarity counts per bucket, keyed by the bucket's upper edge.
+    top_similarity: dict[float, int] = field(default_factory=dict)
+    first_ts: float | None = None
+    last_ts: float | None = None
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.searches if self.searches else 0.0
+
+    @property
+    def fallback_rate(self) -> float:
+        return self.fallbacks / self.searches if self.searches else 0.0
+
+    @property
+    def cache_rate(self) -> float:
+        return self.cached / self.searches if self.searches else 0.0
+
+
+class RetrievalLog:
+    """Append-only retrieval log bounded to roughly the last ``max_entries`` records."""
+
+    def __init__(self, path: str | Path, *, max_entries: int = 10000) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._lines: int | None = None
+
+    def record(self, *, latency_ms: float, outcome: str, similarities: Sequence[float], cached: bool = False) -> None:
+        entry = {
+            "ts": round(time.time(), 3),
+            "ms": round(latency_ms, 3),
+            "cached": cached,
+            "outcome": outcome,
+            "similarities": [round(score, 4) for score in similarities],
+        }
+        with self._lock:
+            if self._lines is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._lines = self._count_lines()
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._lines += 1
+            if self._lines >= 2 * self.max_entries:
+                self._compact()
+
+    def read(self) -> list[dict]:
+        """Return the newest ``max_entries`` records, skipping torn lines."""
+        if not self.path.exists():
+            return []
+        records: list[dict] = []
+        with self.path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records[-self.max_entries :]
+
+    def stats(self) -> RetrievalStats:
+        return summarize(self.read())
+
+    def _count_lines(self) -> int:
+        if not self.path.exists():
+            return 0
+        with self.path.open("rb") as handle:
+            return sum(1 for _ in handle)
+
+    def _compact(self) -> None:
+        keep = self.read()
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(entry, separators=(",", ":")) + "\n" for entry in keep)
+        os.replace(tmp, self.path)
+        self._lines = len(keep)
+
+
+def summarize(records: Iterable[dict]) -> RetrievalStats:
+    """Aggregate logged retrievals into rates, latency percentiles and a top-similarity histogram."""
+    records = list(records)
+    outcomes = [record.get("outcome") for record in records]
+    latencies = sorted(record["ms"] for record in records if "ms" in record)
+    histogram = dict.fromkeys(SIMILARITY_BINS[1:], 0)
+    for record in records:
+        if record.get("similarities"):
+            top = max(record["similarities"])
+            edge = next((edge for edge in SIMILARITY_BINS[1:] if top < edge), SIMILARITY_BINS[-1])
+            histogram[edge] += 1
+    timestamps = [record["ts"] for record in records if "ts" in record]
+    return RetrievalStats(
+        searches=len(records),
+        cached=sum(1 for record in records if record.get("cached")),
+        hits=outcomes.count("hit"),
+        fallbacks=outcomes.count("fallback"),
+        empty=outcomes.count("empty"),
+        latency_ms={
+            label: latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+            for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        }
+        if latencies
+        else {},
+        top_similarity=histogram,
+        first_ts=min(timestamps) if timestamps else None,
+        last_ts=max(timestamps) if timestamps else None,
+    )
+
+
+__all__ = ["SIMILARITY_BINS", "RetrievalLog", "RetrievalStats", "summarize"]
@@ -0,0 +1,336 @@
+"""Binary snapshots of the memory store for backups and warm-starting replicas.
+
+A snapshot is a directory::
+
+    manifest.json     format, version, count, dimensions, dtype, distance space, checksum
+    embeddings.npy    one contiguous (count, dimensions) matrix; ``np.load(mmap_mode="r")``-able
+    records.json      columnar ids, documents and one list per metadata key
+
+It is read through the Chroma API rather than by copying ``.chroma``, so it is
+safe to take while the store is live, and written to a temporary directory that
+is renamed into place, so readers never see a partial snapshot. ``restore``
+bulk-inserts in large batches and fits the IVF index straight from the matrix.
+
+Bulk inserts are bounded by Chroma's HNSW build (minutes at 100k+ records), so
+a replica can instead ``restore_in_background``: the memory-mapped snapshot
+answers searches immediately (exact NumPy scoring of rows not yet inserted)
+while a thread backfills Chroma. Its progress (snapshot checksum and rows
+inserted) is kept in a marker file, so a backfill cut short by a restart resumes
+where it stopped instead of leaving a partial replica; at exit the thread is
+stopped between batches.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .logging import logger
+from .memory import MemoryHit, MemoryStore
+
+FORMAT = "srl-memory-snapshot"
+VERSION = 1
+
+
+class SnapshotError(ValueError):
+    """Raised for unreadable, incompatible or corrupt snapshots."""
+
+
+@dataclass
+class Snapshot:
+    """A loaded snapshot; ``embeddings`` is memory-mapped unless loaded with ``mmap=False``."""
+
+    manifest: dict
+    ids: list[str]
+    documents: list[str | None]
+    metadatas: list[dict]
+    embeddings: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def write_snapshot(store: MemoryStore, path: str | Path, *, dtype: str = "float32", batch_size: int = 5000) -> dict:
+    """Write every stored memory to ``path`` and return the manifest."""
+    path = Path(path)
+    if path.exists():
+        raise FileExistsError(f"Snapshot {path} already exists")
+    started = time.perf_counter()
+    ids: list[str] = []
+    documents: list[str | None] = []
+    metadatas: list[dict] = []
+    blocks: list[np.ndarray] = []
+    for batch in store.export_batches(batch_size):
+        ids.extend(batch["ids"])
+        documents.extend(batch.get("documents") or [None] * len(batch["ids"]))
+        metadatas.extend(meta or {} for meta in batch.get("metadatas") or [None] * len(batch["ids"]))
+        blocks.append(np.asarray(batch["embeddings"], dtype=dtype))
+    embeddings = np.vstack(blocks) if blocks else np.empty((0, 0), dtype=dtype)
+
+    keys = sorted({key for meta in metadatas for key in meta})
+    records = {
+        "ids": ids,
+        "documents": documents,
+        "metadata": {key: [meta.get(key) for meta in metadatas] for key in keys},
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    np.save(tmp / "embeddings.npy", np.ascontiguousarray(embeddings))
+    (tmp / "records.json").write_text(json.dumps(records, separators=(",", ":")), encoding="utf-8")
+    manifest = {
+        "format": FORMAT,
+        "version": VERSION,
+        "count": len(ids),
+        "dimensions": int(embeddings.shape[1]) if embeddings.size else 0,
+        "dtype": dtype,
+        "space": store.space,
+        "created_at": time.time(),
+        "sha256": _digest(tmp),
+    }
+    (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    tmp.rename(path)
+    logger.info(
+        "memory.snapshot_written",
+        f"Snapshot of {len(ids)} memories written to {path} in {time.perf_counter() - started:.1f}s.",
+        style="green",
+        count=len(ids),
+    )
+    return manifest
+
+
+def load_snapshot(path: str | Path, *, mmap: bool = True, verify: bool = True) -> Snapshot:
+    """Read a snapshot; ``verify`` checks the checksum before anything is returned."""
+    path = Path(path)
+    try:
+        manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise SnapshotError(f"{path} is not a memory snapshot: {exc}") from exc
+    if manifest.get("format") != FORMAT or manifest.get("version") != VERSION:
+        raise SnapshotError(f"Unsupported snapshot format {manifest.get('format')} v{manifest.get('version')}")
+    if verify and _digest(path) != manifest["sha256"]:
+        raise SnapshotError(f"Snapshot {path} failed its checksum; it is corrupt or incomplete")
+    records = json.loads((path / "records.json").read_text(encoding="utf-8"))
+    embeddings = np.load(path / "embeddings.npy", mmap_mode="r" if mmap else None)
+    columns = records["metadata"]
+    metadatas = [
+        {key: values[idx] for key, values in columns.items() if values[idx] is not None}
+        for idx in range(len(records["ids"]))
+    ]
+    return Snapshot(manifest, records["ids"], records["documents"], metadatas, embeddings)
+
+
+def restore_snapshot(
+    store: MemoryStore,
+    path: str | Path,
+    *,
+    replace: bool = False,
+    verify: bool = True,
+    marker: str | Path | None = None,
+) -> int:
+    """Load a snapshot into ``store``; refuses a non-empty store unless ``replace`` clears it first.
+
+    A background restore of the same snapshot left unfinished in ``marker`` is
+    completed instead. Returns how many rows were inserted.
+    """
+    snapshot = load_snapshot(path, verify=verify)
+    if snapshot.manifest["space"] != store.space:
+        logger.warning(
+            "memory.snapshot_space",
+            f"Snapshot was taken from a {snapshot.manifest['space']} collection; restoring into {store.space}.",
+        )
+    if replace:
+        store.reset_memory()
+        start = 0
+    else:
+        start = _resume_offset(store, snapshot, marker, "pass replace=True (--replace) to overwrite it")
+    started = time.perf_counter()
+    restored = store.bulk_add(
+        snapshot.ids[start:], snapshot.embeddings[start:], snapshot.documents[start:], snapshot.metadatas[start:]
+    )
+    if marker is not None:
+        Path(marker).unlink(missing_ok=True)
+    logger.info(
+        "memory.snapshot_restored",
+        f"Restored {restored} memories from {path} in {time.perf_counter() - started:.1f}s.",
+        style="green",
+        count=restored,
+    )
+    return restored
+
+
+class SnapshotBackfill:
+    """Search overlay over a memory-mapped snapshot while its rows are inserted into a store."""
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        snapshot: Snapshot,
+        *,
+        batch_size: int = 5000,
+        marker: str | Path | None = None,
+        start: int = 0,
+    ) -> None:
+        self.store = store
+        self.snapshot = snapshot
+        self.batch_size = batch_size
+        self.marker = Path(marker) if marker else None
+        self.inserted = start
+        self.error: BaseException | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="srl-snapshot-backfill", daemon=True)
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive() and self._thread.ident is not None
+
+    def start(self) -> "SnapshotBackfill":
+        self._save_progress()
+        self.store.overlays.append(self)
+        self._thread.start()
+        atexit.register(self.close)
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        self._thread.join(timeout)
+        return self.done
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stop after the batch in flight; the marker lets the next ``restore_in_background`` resume."""
+        self._stop.set()
+        if self._thread.ident is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def hits(self, query_vec, k: int) -> list[MemoryHit]:
+        start = self.inserted  # rows before this are already searchable in Chroma
+        rows = np.asarray(self.snapshot.embeddings[start:], dtype=np.float32)
+        if not len(rows):
+            return []
+        query = np.asarray(query_vec, dtype=np.float32)
+        norms = np.linalg.norm(rows, axis=1) * np.linalg.norm(query)
+        scores = rows @ query / np.where(norms == 0, 1.0, norms)
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+        return [
+            (self.snapshot.metadatas[start + idx], self.snapshot.documents[start + idx], float(scores[idx]))
+            for idx in top
+        ]
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        snapshot = self.snapshot
+        try:
+            for offset in range(self.inserted, len(snapshot), self.batch_size):
+                if self._stop.is_set():
+                    logger.info(
+                        "memory.snapshot_backfill_paused",
+                        f"Snapshot backfill paused at {offset}/{len(snapshot)} rows; it resumes on the next start.",
+                        style="yellow",
+                        inserted=offset,
+                    )
+                    return
+                end = offset + self.batch_size
+                self.store.bulk_add(
+                    snapshot.ids[offset:end],
+                    snapshot.embeddings[offset:end],
+                    snapshot.documents[offset:end],
+                    snapshot.metadatas[offset:end],
+                    fit_index=end >= len(snapshot),
+                )
+                self.inserted = min(end, len(snapshot))
+                self._save_progress()
+        except BaseException as exc:  # noqa: BLE001 - reported through ``error`` and the log
+            self.error = exc
+            logger.error("memory.snapshot_backfill_failed", f"Snapshot backfill stopped: {exc}")
+            return
+        self.store.overlays.remove(self)
+        if self.marker is not None:
+            self.marker.unlink(missing_ok=True)
+        atexit.unregister(self.close)
+        logger.info(
+            "memory.snapshot_restored",
+            f"Backfilled {len(snapshot)} memories in {time.perf_counter() - started:.1f}s.",
+            style="green",
+            count=len(snapshot),
+        )
+
+    def _save_progress(self) -> None:
+        if self.marker is None:
+            return
+        progress = {"sha256": self.snapshot.manifest["sha256"], "inserted": self.inserted}
+        tmp = self.marker.with_name(self.marker.name + ".tmp")
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(progress), encoding="utf-8")
+        tmp.replace(self.marker)
+
+
+def restore_in_background(
+    store: MemoryStore, path: str | Path, *, verify: bool = True, marker: str | Path | None = None
+) -> SnapshotBackfill:
+    """Make a snapshot searchable in ``store`` immediately and insert it into Chroma on a thread.
+
+    The store must be empty, unless ``marker`` records an unfinished backfill of
+    the same snapshot, which resumes from its last inserted batch. On a backfill
+    error the overlay stays in place, so searches keep covering the rows that
+    were not inserted.
+    """
+    snapshot = load_snapshot(path, verify=verify)
+    start = _resume_offset(store, snapshot, marker, "background restore only warm-starts empty replicas")
+    return SnapshotBackfill(store, snapshot, marker=marker, start=start).start()
+
+
+def warm_start(store: MemoryStore, path: str | Path, *, marker: str | Path | None = None) -> SnapshotBackfill | None:
+    """``restore_in_background`` for an empty store or an unfinished backfill; ``None`` otherwise."""
+    if _read_progress(marker) is None and store.list_memories(limit=1):
+        return None
+    try:
+        return restore_in_background(store, path, marker=marker)
+    except SnapshotError as exc:
+        logger.warning("memory.snapshot_warm_start", f"Not warm-starting from {path}: {exc}")
+        return None
+
+
+def _read_progress(marker: str | Path | None) -> dict | None:
+    if marker is None:
+        return None
+    try:
+        return json.loads(Path(marker).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _resume_offset(store: MemoryStore, snapshot: Snapshot, marker: str | Path | None, hint: str) -> int:
+    """Rows of ``snapshot`` already in ``store``: 0 when it is empty, else the offset an unfinished backfill reached."""
+    if not store.list_memories(limit=1):
+        return 0
+    progress = _read_progress(marker)
+    if progress is None or progress.get("sha256") != snapshot.manifest["sha256"]:
+        raise SnapshotError(f"Memory store is not empty; {hint}")
+    return min(int(progress.get("inserted", 0)), len(snapshot))
+
+
+def _digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    for name in ("embeddings.npy", "records.json"):
+        with (path / name).open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+__all__ = [
+    "Snapshot",
+    "SnapshotBackfill",
+    "SnapshotError",
+    "load_snapshot",
+    "restore_in_background",
+    "restore_snapshot",
+    "warm_start",
+    "write_snapshot",
+]
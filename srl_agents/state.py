@@ -24,12 +24,29 @@ class CriticOutput(BaseModel):
     )
 
 
+class CriticReview(CriticOutput):
+    index: int = Field(description="Number of the reviewed rule as given in the prompt")
+
+
+class CriticBatchOutput(BaseModel):
+    reviews: list[CriticReview] = Field(description="Exactly one review per numbered rule")
+
+
 class LearningContext(BaseModel):
     learning_goal: str = Field(description="Learner's intended capability or understanding target")
     success_criteria: str = Field(description="Observable evidence that the goal has been met")
     prior_knowledge: str = Field(description="Brief assessment of what the learner already knows or misconceptions")
 
 
+class FusedLearningContext(LearningContext):
+    search_query: str = Field(
+        description="Terse semantic search string for retrieving related past reflections from memory"
+    )
+
+    def learning_context(self) -> LearningContext:
+        return LearningContext(**self.model_dump(exclude={"search_query"}))
+
+
 class ActorOutput(BaseModel):
     thoughts: list[str] = Field(
         description="Ordered chain-of-thought style reasoning steps explaining how the answer was derived"
@@ -40,6 +57,7 @@ class ActorOutput(BaseModel):
 class AgentState(TypedDict, total=False):
     query: str
     learning_context: LearningContext
+    refined_query: str
     retrieved_memories: str
     needs_research: bool
     web_results: str
@@ -1,5 +1,14 @@
 """Tool adapters for SRL agents."""
 
+from .providers import DuckDuckGoProvider, LocalIndexProvider, SearchProvider
+from .search_cache import WebSearchCache
 from .web_search import WebSearchResult, WebSearchTool
 
-__all__ = ["WebSearchResult", "WebSearchTool"]
+__all__ = [
+    "DuckDuckGoProvider",
+    "LocalIndexProvider",
+    "SearchProvider",
+    "WebSearchCache",
+    "WebSearchResult",
+    "WebSearchTool",
+]
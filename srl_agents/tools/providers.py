@@ -0,0 +1,181 @@
+"""Search backends behind ``WebSearchTool``: DuckDuckGo and an offline local index.
+
+Providers return raw hit dicts (``title``/``href``/``body``) from both a blocking
+``search`` and an ``asearch`` coroutine, so the tool can be driven from threads
+or an event loop without caring which backend is configured.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Callable, Iterable, Protocol
+
+from duckduckgo_search import DDGS
+
+
+class _SearchSession(Protocol):
+    def text(self, query: str, *, max_results: int) -> Iterable[dict]:
+        ...
+
+
+SessionFactory = Callable[[], AbstractContextManager[_SearchSession]]
+
+
+class SearchProvider(Protocol):
+    name: str
+
+    def search(self, query: str, *, max_results: int) -> list[dict]:
+        ...
+
+    async def asearch(self, query: str, *, max_results: int) -> list[dict]:
+        ...
+
+
+class DuckDuckGoProvider:
+    """DuckDuckGo text search; ``asearch`` runs the blocking client off the event loop."""
+
+    name = "duckduckgo"
+
+    def __init__(self, session_factory: SessionFactory | None = None, *, timeout: int = 10):
+        self._session_factory: SessionFactory = session_factory or (lambda: DDGS(timeout=timeout))
+
+    def search(self, query: str, *, max_results: int) -> list[dict]:
+        with self._session_factory() as session:
+            return list(session.text(query, max_results=max_results) or [])
+
+    async def asearch(self, query: str, *, max_results: int) -> list[dict]:
+        return await asyncio.to_thread(self.search, query, max_results=max_results)
+
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9_+#.-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class LocalIndexProvider:
+    """BM25 search over documents on disk, for tests, load tests and air-gapped sites.
+
+    ``path`` is either a JSONL file of ``{"title", "url", "body"}`` records or a
+    directory whose ``*.md``/``*.txt`` files become documents (first line = title,
+    ``file://`` URL). The index is built on first use. ``latency_ms`` simulates a
+    remote backend (``time.sleep`` for ``search``, ``asyncio.sleep`` for ``asearch``).
+    """
+
+    name = "local"
+
+    def __init__(self, path: str | Path, *, latency_ms: float = 0.0, k1: float = 1.5, b: float = 0.75):
+        self.path = Path(path)
+        self.latency_ms = latency_ms
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._docs: list[dict] | None = None
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._lengths: list[int] = []
+
+    def search(self, query: str, *, max_results: int) -> list[dict]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._rank(query, max_results)
+
+    async def asearch(self, query: str, *, max_results: int) -> list[dict]:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._rank(query, max_results)
+
+    def _rank(self, query: str, max_results: int) -> list[dict]:
+        docs = self._ensure_index()
+        terms = set(_tokenize(query))
+        if not docs or not terms:
+            return []
+        avg_length = sum(self._lengths) / len(self._lengths)
+        scores: dict[int, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (len(docs) - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))[:max_results]
+        return [
+            {"title": docs[doc_id]["title"], "href": docs[doc_id]["url"], "body": _snippet(docs[doc_id]["body"], terms)}
+            for doc_id in ranked
+        ]
+
+    def _ensure_index(self) -> list[dict]:
+        with self._lock:
+            if self._docs is None:
+                docs = list(_load_documents(self.path))
+                postings: dict[str, list[tuple[int, int]]] = {}
+                lengths: list[int] = []
+                for doc_id, doc in enumerate(docs):
+                    counts = Counter(_tokenize(f"{doc['title']} {doc['body']}"))
+                    lengths.append(sum(counts.values()) or 1)
+                    for term, tf in counts.items():
+                        postings.setdefault(term, []).append((doc_id, tf))
+                self._postings, self._lengths, self._docs = postings, lengths, docs
+            return self._docs
+
+
+def _load_documents(path: Path) -> Iterable[dict]:
+    if path.is_dir():
+        for file in sorted(p for p in path.rglob("*") if p.suffix in (".md", ".txt") and p.is_file()):
+            text = file.read_text(encoding="utf-8", errors="replace")
+            first_line = next((line for line in text.splitlines() if line.strip()), file.stem)
+            yield {"title": first_line.strip().lstrip("#").strip(), "url": file.resolve().as_uri(), "body": text}
+        return
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield {
+                "title": str(record.get("title") or "Untitled document"),
+                "url": str(record.get("url") or record.get("href") or ""),
+                "body": str(record.get("body") or record.get("snippet") or ""),
+            }
+
+
+def _snippet(body: str, terms: set[str], width: int = 280) -> str:
+    text = " ".join(body.split())
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in terms if term in lowered]
+    start = max(0, min(positions) - 40) if positions else 0
+    return text[start : start + width]
+
+
+def build_search_provider(
+    kind: str,
+    *,
+    local_index: str | Path | None = None,
+    timeout: int = 10,
+) -> SearchProvider:
+    """Return the provider selected by ``WEB_SEARCH_PROVIDER``: ``duckduckgo`` or ``local``."""
+    kind = kind.lower()
+    if kind == "duckduckgo":
+        return DuckDuckGoProvider(timeout=timeout)
+    if kind == "local":
+        if not local_index:
+            raise ValueError("The local search provider requires WEB_SEARCH_LOCAL_INDEX")
+        return LocalIndexProvider(local_index)
+    raise ValueError(f"Unknown search provider {kind!r}; expected duckduckgo or local")
+
+
+__all__ = [
+    "DuckDuckGoProvider",
+    "LocalIndexProvider",
+    "SearchProvider",
+    "SessionFactory",
+    "build_search_provider",
+]
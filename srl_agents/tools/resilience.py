@@ -0,0 +1,221 @@
+"""Deadline, hedging and circuit-breaker helpers for flaky external tools."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call produced no result before its deadline."""
+
+
+class CircuitBreaker:
+    """Stop calling a failing dependency for ``cooldown_seconds`` after consecutive failures.
+
+    After the cool-down the breaker is half-open: one trial call is let through,
+    and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial call through (0 when not open)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.cooldown_seconds - self._clock())
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed; claims the single half-open trial slot."""
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give back the half-open trial slot of a call that was abandoned without an outcome."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if self._clock() - self._opened_at >= self.cooldown_seconds:
+            return HALF_OPEN
+        return OPEN
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies (seconds)."""
+
+    def __init__(self, window: int = 100, min_samples: int = 10) -> None:
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the ``fraction`` quantile, or ``None`` until ``min_samples`` are recorded."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _in_daemon_thread(fn: Callable[[], T]) -> Future[T]:
+    # Daemon threads: a call stuck past its deadline must not hold up interpreter exit.
+    future: Future[T] = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except BaseException as exc:  # noqa: BLE001 - relayed to the caller
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name="srl-deadline-call", daemon=True).start()
+    return future
+
+
+def call_with_deadline(
+    fn: Callable[[], T],
+    *,
+    deadline: float | None,
+    hedge_after: float | None = None,
+    on_hedge: Callable[[], None] | None = None,
+) -> T:
+    """Run ``fn`` with a hard ``deadline`` (seconds), hedging once after ``hedge_after``.
+
+    The hedge is a second identical call started if the first has not finished;
+    whichever succeeds first wins. Raises ``DeadlineExceeded`` if nothing succeeds
+    in time, or the last error if every attempt failed. Abandoned attempts keep
+    running in the background until the underlying client gives up.
+    """
+    start = time.monotonic()
+    futures = [_in_daemon_thread(fn)]
+    if hedge_after is not None and (deadline is None or hedge_after < deadline):
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done:
+            if on_hedge:
+                on_hedge()
+            futures.append(_in_daemon_thread(fn))
+
+    last_error: BaseException | None = None
+    while futures:
+        remaining = None if deadline is None else deadline - (time.monotonic() - start)
+        if remaining is not None and remaining <= 0:
+            break
+        done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            futures.remove(future)
+            if future.exception() is None:
+                return future.result()
+            last_error = future.exception()
+    if futures or last_error is None:
+        raise DeadlineExceeded(f"no result within {deadline}s")
+    raise last_error
+
+
+async def acall_with_deadline(
+    factory: Callable[[], Awaitable[T]],
+    *,
+    deadline: float | None,
+    hedge_after: float | None = None,
+    on_hedge: Callable[[], None] | None = None,
+) -> T:
+    """Coroutine counterpart of ``call_with_deadline``; ``factory`` creates each attempt.
+
+    Attempts still pending when a result arrives or the deadline passes are cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    tasks = [asyncio.ensure_future(factory())]
+    last_error: BaseException | None = None
+    try:
+        if hedge_after is not None and (deadline is None or hedge_after < deadline):
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                if on_hedge:
+                    on_hedge()
+                tasks.append(asyncio.ensure_future(factory()))
+        while tasks:
+            remaining = None if deadline is None else deadline - (loop.time() - start)
+            if remaining is not None and remaining <= 0:
+                break
+            done, _ = await asyncio.wait(tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                tasks.remove(task)
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+    if tasks or last_error is None:
+        raise DeadlineExceeded(f"no result within {deadline}s")
+    raise last_error
+
+
+__all__ = [
+    "CLOSED",
+    "HALF_OPEN",
+    "OPEN",
+    "CircuitBreaker",
+    "DeadlineExceeded",
+    "LatencyTracker",
+    "acall_with_deadline",
+    "call_with_deadline",
+]
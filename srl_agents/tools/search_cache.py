@@ -0,0 +1,168 @@
+"""TTL + LRU cache of web search results keyed by normalized query."""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from .web_search import WebSearchResult, normalize_query
+
+# Success criteria mentioning these need current information (shorter cache TTL, stricter research routing).
+FRESHNESS_KEYWORDS = ("latest", "current", "recent", "up-to-date", "news", "trend")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS web_search_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+"""
+
+
+def is_time_sensitive(text: str | None) -> bool:
+    """True when ``text`` (typically success criteria) asks for fresh information."""
+    lowered = (text or "").lower()
+    return any(keyword in lowered for keyword in FRESHNESS_KEYWORDS)
+
+
+@dataclass
+class SearchCacheStats:
+    """Snapshot of cache occupancy and effectiveness since the process started."""
+
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    expired: int
+    evictions: int
+    path: str | None
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class WebSearchCache:
+    """In-memory LRU of search results with per-lookup TTLs and optional SQLite persistence.
+
+    Entries remember when they were fetched; ``get(..., fresh=True)`` applies the
+    shorter ``fresh_ttl_seconds`` so time-sensitive goals never see stale results
+    even when the same query was cached for a regular goal.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 3600.0,
+        fresh_ttl_seconds: float = 300.0,
+        max_entries: int = 256,
+        path: str | Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.fresh_ttl_seconds = fresh_ttl_seconds
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, list[WebSearchResult]]] = OrderedDict()
+        self._hits = self._misses = self._expired = self._evictions = 0
+        self._conn: sqlite3.Connection | None = None
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+            self._conn.executescript(_SCHEMA)
+            self._load()
+
+    def get(self, query: str, *, fresh: bool = False) -> list[WebSearchResult] | None:
+        """Return cached results for ``query`` or ``None`` on a miss or expired entry."""
+        key = normalize_query(query)
+        ttl = self.fresh_ttl_seconds if fresh else self.ttl_seconds
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            created_at, results = entry
+            if now - created_at > ttl:
+                self._expired += 1
+                self._misses += 1
+                if now - created_at > max(self.ttl_seconds, self.fresh_ttl_seconds):
+                    self._delete(key)
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            if self._conn:
+                self._conn.execute("UPDATE web_search_cache SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            return list(results)
+
+    def put(self, query: str, results: list[WebSearchResult]) -> None:
+        key = normalize_query(query)
+        now = self._clock()
+        with self._lock:
+            self._entries[key] = (now, list(results))
+            self._entries.move_to_end(key)
+            if self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO web_search_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps([asdict(result) for result in results]), now, now),
+                )
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._delete(oldest)
+                self._evictions += 1
+            if self._conn:
+                self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn:
+                self._conn.execute("DELETE FROM web_search_cache")
+                self._conn.commit()
+
+    def stats(self) -> SearchCacheStats:
+        with self._lock:
+            return SearchCacheStats(
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self._hits,
+                misses=self._misses,
+                expired=self._expired,
+                evictions=self._evictions,
+                path=str(self.path) if self.path else None,
+            )
+
+    def _delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._conn:
+            self._conn.execute("DELETE FROM web_search_cache WHERE key = ?", (key,))
+
+    def _load(self) -> None:
+        assert self._conn is not None
+        cutoff = self._clock() - max(self.ttl_seconds, self.fresh_ttl_seconds)
+        self._conn.execute("DELETE FROM web_search_cache WHERE created_at < ?", (cutoff,))
+        self._conn.commit()
+        rows = self._conn.execute(
+            "SELECT key, value, created_at FROM web_search_cache ORDER BY last_access DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+        for key, value, created_at in reversed(rows):
+            self._entries[key] = (created_at, [WebSearchResult(**item) for item in json.loads(value)])
+
+
+__all__ = [
+    "FRESHNESS_KEYWORDS",
+    "SearchCacheStats",
+    "WebSearchCache",
+    "is_time_sensitive",
+]
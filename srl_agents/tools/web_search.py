@@ -1,13 +1,44 @@
 """Simple web search adapter exposed as an MCP-ready tool."""
 from __future__ import annotations
 
-from contextlib import AbstractContextManager
+import asyncio
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Callable, Iterable, Protocol, Sequence
+from typing import TYPE_CHECKING, Iterable, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-from duckduckgo_search import DDGS
+from ..instrumentation import timed
+from ..logging import logger
+from .providers import DuckDuckGoProvider, SearchProvider, SessionFactory
+from .resilience import OPEN, CircuitBreaker, LatencyTracker, acall_with_deadline, call_with_deadline
 
-from ..logging import console
+if TYPE_CHECKING:
+    from .search_cache import WebSearchCache
+
+_WHITESPACE = re.compile(r"\s+")
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "ref", "ref_src"})
+_TRACKING_PREFIX = "utm_"
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation so trivial variants match."""
+    return _WHITESPACE.sub(" ", query).strip().rstrip("?!.").strip().casefold()
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used to de-duplicate hits: no scheme/``www.``/fragment/tracking params/trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    path = parts.path.rstrip("/")
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query) if not _is_tracking(key)))
+    return urlunsplit(("", host, path, query, "")).lstrip("/")
+
+
+def _is_tracking(key: str) -> bool:
+    key = key.lower()
+    return key in _TRACKING_PARAMS or key.startswith(_TRACKING_PREFIX)
 
 
 @dataclass
@@ -25,33 +56,230 @@ class WebSearchResult:
         return f"- {self.title} ({self.url}): {snippet}"
 
 
-class _SearchSession(Protocol):
-    def text(self, query: str, *, max_results: int) -> Iterable[dict]:
-        ...
+class WebSearchTool:
+    """Search tool for external knowledge over a pluggable provider (DuckDuckGo by default).
 
+    ``session_factory`` is shorthand for a ``DuckDuckGoProvider`` over custom sessions.
+    """
 
-SessionFactory = Callable[[], AbstractContextManager[_SearchSession]]
+    def __init__(
+        self,
+        *,
+        max_results: int = 5,
+        session_factory: SessionFactory | None = None,
+        provider: SearchProvider | None = None,
+        cache: WebSearchCache | None = None,
+        deadline: float | None = None,
+        hedge_percentile: float | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.max_results = max_results
+        self.provider: SearchProvider = provider or DuckDuckGoProvider(session_factory)
+        self.cache = cache
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.breaker = breaker
+        self.latency = LatencyTracker()
 
+    def available(self) -> bool:
+        """False while the circuit breaker is open, i.e. searches would be short-circuited."""
+        return self.breaker is None or self.breaker.state != OPEN
 
-class WebSearchTool:
-    """Lightweight wrapper around DuckDuckGo search for external knowledge."""
+    def search(self, query: str, *, fresh: bool = False) -> list[WebSearchResult]:
+        """Return a list of structured web search results.
 
-    def __init__(self, *, max_results: int = 5, session_factory: SessionFactory | None = None):
-        self.max_results = max_results
-        self._session_factory: SessionFactory = session_factory or (lambda: DDGS())
+        With a ``cache``, repeated queries are served from it; ``fresh`` applies the
+        cache's shorter TTL for time-sensitive goals. Failed searches are not cached.
+        A ``deadline`` bounds each backend call; once enough latency samples exist, a
+        hedged duplicate is sent after the ``hedge_percentile`` latency. Failures and
+        timeouts feed the ``breaker``, which skips the backend while open.
+        """
+        query = query.strip()
+        if not query:
+            return []
+        cached = self._cached(query, fresh)
+        if cached is not None:
+            return cached
+        if self._circuit_open():
+            return []
+        start = time.monotonic()
+        try:
+            with timed("web_search"):
+                raw_results = self._fetch(query)
+        except Exception as exc:  # network failure is best-effort
+            return self._failed(exc)
+        return self._succeeded(query, raw_results, time.monotonic() - start)
 
-    def search(self, query: str) -> list[WebSearchResult]:
-        """Return a list of structured web search results."""
+    async def asearch(self, query: str, *, fresh: bool = False) -> list[WebSearchResult]:
+        """Coroutine version of ``search`` using the provider's ``asearch``."""
         query = query.strip()
         if not query:
             return []
+        cached = self._cached(query, fresh)
+        if cached is not None:
+            return cached
+        if self._circuit_open():
+            return []
+        start = time.monotonic()
         try:
-            with self._session_factory() as session:
-                raw_results = list(session.text(query, max_results=self.max_results) or [])
-        except Exception as exc:  # pragma: no cover - network failure is best-effort
-            console.print(f"[yellow]Web search failed:[/yellow] {exc}")
+            with timed("web_search"):
+                raw_results = await self._afetch(query)
+        except asyncio.CancelledError:
+            # e.g. abandoned by ``asearch_many``'s timeout; a half-open trial must not stay claimed.
+            if self.breaker is not None:
+                self.breaker.release()
+            raise
+        except Exception as exc:  # network failure is best-effort
+            return self._failed(exc)
+        return self._succeeded(query, raw_results, time.monotonic() - start)
+
+    def _cached(self, query: str, fresh: bool) -> list[WebSearchResult] | None:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(query, fresh=fresh)
+        if cached is not None:
+            logger.debug("web_search.cache_hit", f"Web search cache hit for: {query}", style="dim")
+        return cached
+
+    def _circuit_open(self) -> bool:
+        if self.breaker is None or self.breaker.allow():
+            return False
+        logger.debug(
+            "web_search.circuit_open",
+            f"Web search circuit open; skipping for {self.breaker.retry_in():.0f}s.",
+            style="dim",
+        )
+        return True
+
+    def _failed(self, exc: Exception) -> list[WebSearchResult]:
+        if self.breaker is not None:
+            self.breaker.record_failure()
+        logger.warning("web_search.failed", f"Web search failed: {type(exc).__name__}: {exc}")
+        return []
+
+    def _succeeded(self, query: str, raw_results: list[dict], elapsed: float) -> list[WebSearchResult]:
+        self.latency.record(elapsed)
+        if self.breaker is not None:
+            self.breaker.record_success()
+        results = self._parse(raw_results)
+        if self.cache is not None and results:
+            self.cache.put(query, results)
+        return results
+
+    def _hedge_after(self) -> float | None:
+        return self.latency.percentile(self.hedge_percentile) if self.hedge_percentile else None
+
+    def _on_hedge(self) -> None:
+        logger.debug("web_search.hedged", "Hedging slow web search with a duplicate request", style="dim")
+
+    def _fetch(self, query: str) -> list[dict]:
+        def call() -> list[dict]:
+            return self.provider.search(query, max_results=self.max_results)
+
+        hedge_after = self._hedge_after()
+        if self.deadline is None and hedge_after is None:
+            return call()
+        return call_with_deadline(call, deadline=self.deadline, hedge_after=hedge_after, on_hedge=self._on_hedge)
+
+    async def _afetch(self, query: str) -> list[dict]:
+        def attempt():
+            return self.provider.asearch(query, max_results=self.max_results)
+
+        hedge_after = self._hedge_after()
+        if self.deadline is None and hedge_after is None:
+            return await attempt()
+        return await acall_with_deadline(
+            attempt, deadline=self.deadline, hedge_after=hedge_after, on_hedge=self._on_hedge
+        )
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        *,
+        fresh: bool = False,
+        timeout: float | None = None,
+    ) -> list[WebSearchResult]:
+        """Search several query variants concurrently and merge their hits.
+
+        Duplicate variants are searched once. Hits are de-duplicated by
+        ``normalize_url`` and ranked by how many variants returned them, then by
+        their best position. Variants still running after ``timeout`` seconds are
+        abandoned, so latency is bounded by the slowest useful query, not the sum.
+        """
+        variants = self._variants(queries)
+        if not variants:
             return []
+        if len(variants) == 1:
+            return self.search(variants[0], fresh=fresh)
 
+        executor = ThreadPoolExecutor(max_workers=len(variants), thread_name_prefix="srl-web-search")
+        try:
+            with timed("web_search"):
+                futures = [executor.submit(self.search, variant, fresh=fresh) for variant in variants]
+                done, pending = wait(futures, timeout=timeout)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if pending:
+            logger.warning(
+                "web_search.timeout",
+                f"{len(pending)} of {len(variants)} web search variants exceeded {timeout}s; using partial results.",
+                pending=len(pending),
+            )
+        return self.merge_results([future.result() for future in futures if future in done])
+
+    async def asearch_many(
+        self,
+        queries: Sequence[str],
+        *,
+        fresh: bool = False,
+        timeout: float | None = None,
+    ) -> list[WebSearchResult]:
+        """Coroutine version of ``search_many``; variants run as tasks on the current loop."""
+        variants = self._variants(queries)
+        if not variants:
+            return []
+        tasks = [asyncio.ensure_future(self.asearch(variant, fresh=fresh)) for variant in variants]
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(
+                "web_search.timeout",
+                f"{len(pending)} of {len(variants)} web search variants exceeded {timeout}s; using partial results.",
+                pending=len(pending),
+            )
+        return self.merge_results([task.result() for task in tasks if task in done])
+
+    @staticmethod
+    def _variants(queries: Sequence[str]) -> list[str]:
+        unique: dict[str, str] = {}
+        for query in queries:
+            if query and query.strip():
+                unique.setdefault(normalize_query(query), query.strip())
+        return list(unique.values())
+
+    @staticmethod
+    def merge_results(result_lists: Sequence[Sequence[WebSearchResult]]) -> list[WebSearchResult]:
+        """Merge per-query hits by normalized URL, most frequently returned first."""
+        merged: dict[str, WebSearchResult] = {}
+        frequency: dict[str, int] = {}
+        best_rank: dict[str, int] = {}
+        for results in result_lists:
+            seen_here: set[str] = set()
+            for rank, result in enumerate(results):
+                key = normalize_url(result.url)
+                if key in seen_here:
+                    continue
+                seen_here.add(key)
+                merged.setdefault(key, result)
+                frequency[key] = frequency.get(key, 0) + 1
+                best_rank[key] = min(best_rank.get(key, rank), rank)
+        order = {key: index for index, key in enumerate(merged)}
+        ranked = sorted(merged, key=lambda key: (-frequency[key], best_rank[key], order[key]))
+        return [merged[key] for key in ranked]
+
+    @staticmethod
+    def _parse(raw_results: Iterable[object]) -> list[WebSearchResult]:
         results: list[WebSearchResult] = []
         for item in raw_results:
             if not isinstance(item, dict):
@@ -74,4 +302,4 @@ class WebSearchTool:
         return "\n".join(bullets)
 
 
-__all__ = ["WebSearchResult", "WebSearchTool"]
+__all__ = ["WebSearchResult", "WebSearchTool", "normalize_query", "normalize_url"]
@@ -0,0 +1,90 @@
+"""HNSW index settings for the memory collection and per-space similarity conversion.
+
+Chroma fixes a collection's distance ``space``, ``max_neighbors`` (HNSW ``M``)
+and ``ef_construction`` when the collection is created; only ``ef_search`` can
+be changed afterwards. Distances returned by a query are converted back to a
+``[-1, 1]``-ish similarity according to the space the collection really uses:
+
+- ``cosine``: ``1 - cos`` -> ``1 - d``
+- ``ip``: ``1 - dot`` -> ``1 - d`` (cosine for unit-length embeddings)
+- ``l2``: squared euclidean; for unit vectors ``d = 2 - 2 cos`` -> ``1 - d / 2``
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import numpy as np
+
+SPACES = ("cosine", "l2", "ip")
+_LEGACY_METADATA = {
+    "hnsw:space": "space",
+    "hnsw:M": "max_neighbors",
+    "hnsw:construction_ef": "ef_construction",
+    "hnsw:search_ef": "ef_search",
+}
+
+
+@dataclass(frozen=True)
+class HnswSettings:
+    """Distance space and HNSW graph parameters for a Chroma collection."""
+
+    space: str = "cosine"
+    max_neighbors: int = 16
+    ef_construction: int = 100
+    ef_search: int = 100
+
+    def __post_init__(self) -> None:
+        if self.space not in SPACES:
+            raise ValueError(f"Unknown HNSW space {self.space!r}; expected one of {', '.join(SPACES)}")
+        for field in ("max_neighbors", "ef_construction", "ef_search"):
+            if getattr(self, field) < 1:
+                raise ValueError(f"HNSW {field} must be positive")
+
+    def configuration(self) -> dict[str, Any]:
+        """Return the ``configuration`` argument for ``get_or_create_collection``."""
+        return {
+            "hnsw": {
+                "space": self.space,
+                "max_neighbors": self.max_neighbors,
+                "ef_construction": self.ef_construction,
+                "ef_search": self.ef_search,
+            }
+        }
+
+
+def collection_hnsw(collection: Any) -> dict[str, Any]:
+    """Return the HNSW parameters a collection was built with (empty when unknown)."""
+    configuration = getattr(collection, "configuration", None)
+    if isinstance(configuration, dict) and isinstance(configuration.get("hnsw"), dict):
+        return dict(configuration["hnsw"])
+    # Older Chroma releases kept these as ``hnsw:*`` collection metadata.
+    metadata = getattr(collection, "metadata", None) or {}
+    if not isinstance(metadata, dict):
+        return {}
+    return {field: metadata[key] for key, field in _LEGACY_METADATA.items() if key in metadata}
+
+
+def distance_to_similarity(distance: Any, space: str) -> float | None:
+    """Convert a Chroma query distance in ``space`` to a cosine-like similarity."""
+    if not isinstance(distance, (int, float)):
+        return None
+    if space == "l2":
+        return float(1 - distance / 2)
+    return float(1 - distance)
+
+
+def embedding_distances(query: Sequence[float], vectors: Any, space: str) -> np.ndarray:
+    """Distances from ``query`` to each row of ``vectors`` as Chroma computes them in ``space``."""
+    query = np.asarray(query, dtype=np.float32)
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, len(query))
+    if space == "l2":
+        return np.sum((vectors - query) ** 2, axis=1)
+    dots = vectors @ query
+    if space == "ip":
+        return 1 - dots
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+    return 1 - dots / np.where(norms == 0, 1.0, norms)
+
+
+__all__ = ["SPACES", "HnswSettings", "collection_hnsw", "distance_to_similarity", "embedding_distances"]
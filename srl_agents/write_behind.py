@@ -0,0 +1,172 @@
+"""Write-behind buffer that batches memory writes behind an append-only journal.
+
+``MemoryStore.add`` appends a ``PendingWrite`` instead of embedding and writing
+immediately. The buffer flushes when ``max_batch`` entries are waiting or
+``max_delay`` seconds after the first one arrived, and on interpreter exit; the
+store turns each flush into one ``embed_documents`` call and one collection write.
+
+Every entry is appended (and fsynced) to ``journal_path`` before ``append``
+returns, and the journal is rewritten with only the unflushed entries after each
+successful flush. Entries still in the journal at start-up are replayed, so a
+crash loses nothing that was acknowledged. Use one writer process per journal.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .logging import logger
+
+
+@dataclass
+class PendingWrite:
+    """A reflection accepted by ``MemoryStore.add`` but not yet in Chroma."""
+
+    id: str
+    text: str
+    embed_text: str
+    metadata: dict
+    embedding: list[float] | None = field(default=None, compare=False)
+
+
+# Persists a batch and returns how many entries were written (duplicates may be skipped).
+FlushFn = Callable[[list[PendingWrite]], int]
+
+
+class WriteBehindBuffer:
+    """Thread-safe pending-write queue with size/time flush triggers and a JSONL journal."""
+
+    def __init__(
+        self,
+        *,
+        max_batch: int = 16,
+        max_delay: float = 2.0,
+        journal_path: str | Path | None = None,
+    ) -> None:
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.journal_path = Path(journal_path) if journal_path else None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: list[PendingWrite] = []
+        self._timer: threading.Timer | None = None
+        self._flush_fn: FlushFn | None = None
+        self._closed = False
+        if self.journal_path:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._pending = list(self._replay())
+        atexit.register(self.close)
+
+    def bind(self, flush_fn: FlushFn) -> None:
+        """Attach the callback that persists a batch; replayed entries are flushed right away."""
+        self._flush_fn = flush_fn
+        if self._pending:
+            logger.info(
+                "memory.journal_replay",
+                f"Replaying {len(self._pending)} unflushed memory writes from {self.journal_path}.",
+                style="yellow",
+                pending=len(self._pending),
+            )
+            self.flush()
+
+    def append(self, entry: PendingWrite) -> None:
+        with self._lock:
+            if self.journal_path:
+                with self.journal_path.open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(self._record(entry)) + "\n")
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            self._pending.append(entry)
+            full = len(self._pending) >= self.max_batch
+            if not full and self._timer is None and not self._closed:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def pending(self) -> list[PendingWrite]:
+        """Snapshot of entries not yet persisted (including any batch currently being flushed)."""
+        with self._lock:
+            return list(self._pending)
+
+    def discard(self, predicate: Callable[[PendingWrite], bool]) -> int:
+        """Drop pending entries matching ``predicate``; returns how many were dropped."""
+        with self._flush_lock, self._lock:
+            kept = [entry for entry in self._pending if not predicate(entry)]
+            dropped = len(self._pending) - len(kept)
+            if dropped:
+                self._pending = kept
+                self._rewrite_journal(kept)
+            return dropped
+
+    def flush(self) -> int:
+        """Persist every pending entry through the bound callback; returns how many were written.
+
+        Entries stay pending (and journaled) if the callback raises, and are retried on the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                batch = list(self._pending)
+            if not batch or self._flush_fn is None:
+                return 0
+            try:
+                written = self._flush_fn(batch)
+            except Exception as exc:  # noqa: BLE001 - keep the entries for the next attempt
+                logger.error(
+                    "memory.flush_failed",
+                    f"Write-behind flush of {len(batch)} memories failed: {exc}",
+                    pending=len(batch),
+                )
+                return 0
+            flushed = {id(entry) for entry in batch}
+            with self._lock:
+                self._pending = [entry for entry in self._pending if id(entry) not in flushed]
+                self._rewrite_journal(self._pending)
+            return written
+
+    def close(self) -> None:
+        """Flush what is pending and stop scheduling timed flushes (also runs at exit)."""
+        self._closed = True
+        self.flush()
+
+    def _rewrite_journal(self, entries: Iterable[PendingWrite]) -> None:
+        if not self.journal_path:
+            return
+        tmp = self.journal_path.with_suffix(self.journal_path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            for entry in entries:
+                handle.write(json.dumps(self._record(entry)) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, self.journal_path)
+
+    def _replay(self) -> Iterable[PendingWrite]:
+        assert self.journal_path is not None
+        if not self.journal_path.exists():
+            return
+        with self.journal_path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append was never acknowledged.
+                    continue
+                yield PendingWrite(**record)
+
+    @staticmethod
+    def _record(entry: PendingWrite) -> dict:
+        record = asdict(entry)
+        record.pop("embedding")
+        return record
+
+
+__all__ = ["PendingWrite", "WriteBehindBuffer"]
@@ -0,0 +1,108 @@
+"""Tests for the deferred interaction journal and batch reflection."""
+from __future__ import annotations
+
+from collections import Counter
+
+from chromadb import PersistentClient
+
+from benchmarks.fakes import FakeChatModel, FakeSearchSession, HashingEmbedder
+from srl_agents.batch_reflection import reflect_batch
+from srl_agents.graph import create_app
+from srl_agents.memory import MemoryStore
+from srl_agents.reflection_journal import Interaction, InteractionJournal
+from srl_agents.tools.web_search import WebSearchTool
+
+CALLS: Counter[str] = Counter()
+
+
+class CountingModel(FakeChatModel):
+    """Fake model that counts calls per schema, fails reflections on "broken" queries
+    and asks for one revision before approving."""
+
+    def _respond(self, schema, user_text):
+        CALLS[schema or "text"] += 1
+        if schema == "ReflectionOutput" and "broken" in user_text:
+            raise TimeoutError("reflector timed out")
+        if schema == "CriticBatchOutput" and CALLS[schema] == 1:
+            return super()._respond(schema, user_text).replace('"APPROVE"', '"REVISE"')
+        return super()._respond(schema, user_text)
+
+
+def _store(tmp_path) -> MemoryStore:
+    return MemoryStore(embedder=HashingEmbedder(64), client=PersistentClient(path=str(tmp_path / "chroma")))
+
+
+def _interaction(query: str) -> Interaction:
+    return Interaction(query=query, response=f"Answer to {query}", success_criteria="I can explain it")
+
+
+def test_journal_keeps_claimed_entries_until_completed(tmp_path):
+    journal = InteractionJournal(tmp_path / "journal.jsonl")
+    for query in ("first", "second", "third"):
+        journal.append(_interaction(query))
+    with journal.path.open("a", encoding="utf-8") as handle:
+        handle.write('{"query": "torn')
+
+    claimed = journal.claim(limit=2)
+    journal.append(_interaction("fourth"))
+
+    assert [entry.query for entry in claimed] == ["first", "second"]
+    assert journal.pending() == 4
+    journal.complete(entry.id for entry in claimed)
+    assert [entry.query for entry in journal.claim()] == ["third", "fourth"]
+    assert InteractionJournal(tmp_path / "missing.jsonl").claim() == []
+
+
+def test_reflect_batch_groups_critic_calls_and_stores_once(tmp_path, monkeypatch):
+    journal = InteractionJournal(tmp_path / "journal.jsonl")
+    for idx in range(7):
+        journal.append(_interaction(f"How do I solve exercise {idx} about sorting lists?"))
+    store = _store(tmp_path)
+    writes = []
+    write = store._write
+    monkeypatch.setattr(store, "_write", lambda ids, *args: (writes.append(len(ids)), write(ids, *args)))
+    llm = FakeChatModel()
+
+    result = reflect_batch(journal, store, llm, llm, concurrency=3, critic_batch_size=3)
+
+    assert (result.interactions, result.stored, result.failed) == (7, 7, 0)
+    assert (result.reflector_calls, result.critic_calls) == (7, 3)
+    assert writes == [7]
+    assert journal.pending() == 0
+    assert {record["success_criteria"] for record in store.list_memories(limit=10)} == {"I can explain it"}
+
+
+def test_failed_interactions_stay_journaled_and_revisions_retry(tmp_path):
+    CALLS.clear()
+    journal = InteractionJournal(tmp_path / "journal.jsonl")
+    for query in ("How do I reset git?", "This broken query times out", "How do I rebase git?"):
+        journal.append(_interaction(query))
+    store = _store(tmp_path)
+    llm = CountingModel()
+
+    result = reflect_batch(journal, store, llm, llm)
+
+    assert (result.stored, result.failed, result.discarded) == (2, 1, 0)
+    assert CALLS["CriticBatchOutput"] == result.critic_calls == 2
+    assert result.reflector_calls == 5  # three first drafts, two revisions
+    assert [entry.query for entry in journal.claim()] == ["This broken query times out"]
+
+
+def test_deferred_graph_journals_instead_of_reflecting(tmp_path):
+    CALLS.clear()
+    journal = InteractionJournal(tmp_path / "journal.jsonl")
+    store = _store(tmp_path)
+    app = create_app(
+        memory_store=store,
+        llm=CountingModel(),
+        web_search_tool=WebSearchTool(session_factory=FakeSearchSession),
+        reflection_journal=journal,
+    )
+
+    final = app.invoke({"query": "How do I undo local git changes?", "retry_count": 0})
+
+    assert final["response"]
+    assert CALLS["ReflectionOutput"] == CALLS["CriticOutput"] == 0
+    assert store.list_memories(limit=5) == []
+    [entry] = journal.claim()
+    assert entry.query == "How do I undo local git changes?" and entry.response == final["response"]
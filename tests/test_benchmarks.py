@@ -0,0 +1,53 @@
+"""Smoke tests for the offline benchmark harness."""
+from __future__ import annotations
+
+from benchmarks.compare import compare
+from benchmarks.fakes import FakeChatModel, HashingEmbedder
+from benchmarks.hnsw_sweep import sweep
+from benchmarks.run import bench_graph
+from srl_agents.state import CriticOutput
+
+
+def test_fake_chat_model_returns_structured_outputs():
+    llm = FakeChatModel(decision="REVISE", impact_score=2)
+
+    result = llm.with_structured_output(CriticOutput).invoke("Rule to review: [SQL] use indexes")
+
+    assert result.decision == "REVISE"
+    assert result.impact_score == 2
+
+
+def test_hashing_embedder_is_deterministic_and_lexical():
+    embedder = HashingEmbedder(dimensions=64)
+
+    first = embedder.embed_query("reset git repository")
+    second = embedder.embed_query("reset git repository")
+    unrelated = embedder.embed_query("photosynthesis in plants")
+
+    assert first == second
+    assert sum(a * b for a, b in zip(first, second)) > sum(a * b for a, b in zip(first, unrelated))
+
+
+def test_bench_graph_runs_full_pipeline_offline():
+    result = bench_graph(iterations=2, llm_latency_ms=0)
+
+    assert result["run"]["count"] == 2
+    assert {"learning_context", "forethought", "actor", "critic", "store"} <= set(result["nodes"])
+
+
+def test_compare_flags_latency_and_throughput_regressions():
+    base = {"results": {"graph": {"runs_per_second": 10.0, "run": {"p50_ms": 100.0}}}}
+    head = {"results": {"graph": {"runs_per_second": 8.0, "run": {"p50_ms": 105.0}}}}
+
+    rows = {metric: regressed for metric, *_, regressed in compare(base, head, threshold=0.1)}
+
+    assert rows == {"graph.runs_per_second": True, "graph.run.p50_ms": False}
+
+
+def test_hnsw_sweep_reports_recall_per_ef_search():
+    rows = sweep(size=600, queries=20, dimensions=16, k=3, ef_search_values=(5, 100))
+
+    assert [row["ef_search"] for row in rows] == [5, 100]
+    assert rows[1]["recall_at_3"] >= rows[0]["recall_at_3"]
+    assert rows[1]["recall_at_3"] > 0.9
+    assert rows[0]["query"]["count"] == 20
@@ -0,0 +1,56 @@
+"""Tests for resuming checkpointed graph runs."""
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+from chromadb import PersistentClient
+
+from benchmarks.fakes import FakeChatModel, FakeSearchSession, HashingEmbedder
+from srl_agents.checkpointing import latest_thread_id, open_sqlite_checkpointer, thread_config
+from srl_agents.graph import create_app
+from srl_agents.memory import MemoryStore
+from srl_agents.tools.web_search import WebSearchTool
+
+CALLS: Counter[str] = Counter()
+
+
+class FlakyCriticModel(FakeChatModel):
+    """Fake model whose first critic call times out."""
+
+    def _respond(self, schema, user_text):
+        CALLS[schema or "text"] += 1
+        if schema == "CriticOutput" and CALLS[schema] == 1:
+            raise TimeoutError("critic timed out")
+        return super()._respond(schema, user_text)
+
+
+def test_failed_run_resumes_from_last_completed_node(tmp_path):
+    CALLS.clear()
+    checkpointer = open_sqlite_checkpointer(tmp_path / "checkpoints.sqlite")
+    store = MemoryStore(
+        embedder=HashingEmbedder(64),
+        client=PersistentClient(path=str(tmp_path / "chroma")),
+    )
+    app = create_app(
+        memory_store=store,
+        llm=FlakyCriticModel(),
+        web_search_tool=WebSearchTool(session_factory=FakeSearchSession),
+        checkpointer=checkpointer,
+    )
+    config = thread_config("thread-1")
+
+    with pytest.raises(TimeoutError):
+        app.invoke({"query": "How do I undo local git changes?", "retry_count": 0}, config)
+
+    assert app.get_state(config).next == ("critic",)
+    assert latest_thread_id(checkpointer) == "thread-1"
+
+    final = app.invoke(None, config)
+
+    assert final["review_decision"] == "APPROVE"
+    assert CALLS["LearningContext"] == 1
+    assert CALLS["ActorOutput"] == 1
+    assert CALLS["ReflectionOutput"] == 1
+    assert CALLS["CriticOutput"] == 2
+    assert app.get_state(config).next == ()
@@ -0,0 +1,64 @@
+"""Tests for the token-budgeted context packer."""
+from __future__ import annotations
+
+from srl_agents.context_packer import (
+    ContextItem,
+    ContextPacker,
+    approximate_tokens,
+    memory_items,
+    trace_items,
+    web_items,
+)
+
+
+def _word_counter(text: str) -> int:
+    return len(text.split())
+
+
+def test_approximate_tokens_counts_ascii_and_cjk():
+    assert approximate_tokens("") == 0
+    assert approximate_tokens("abcdefgh") == 2
+    assert approximate_tokens("复习计划") == 4
+
+
+def test_pack_without_budget_keeps_everything():
+    items = [ContextItem("one two", "memory"), ContextItem("three", "web")]
+
+    packed = ContextPacker(None).pack(items)
+
+    assert packed.dropped == []
+    assert [item.text for item in packed.kept] == ["one two", "three"]
+
+
+def test_pack_prefers_high_similarity_memories_and_keeps_order():
+    memories = (
+        "- [SQL] low relevance tip (score: 0.40)\n"
+        "- [SQL] Use indexes for joins (score: 0.90) | impact: 4\n"
+        "- [SQL] Analyze query plans (score: 0.80)"
+    )
+    packer = ContextPacker(18, token_counter=_word_counter)
+
+    packed = packer.pack(memory_items(memories))
+
+    assert packed.items("memory") == [
+        "- [SQL] Use indexes for joins (score: 0.90) | impact: 4",
+        "- [SQL] Analyze query plans (score: 0.80)",
+    ]
+    assert [item.text for item in packed.dropped] == ["- [SQL] low relevance tip (score: 0.40)"]
+    assert "1 memory" in packed.describe_dropped()
+
+
+def test_pack_favours_trace_over_memories_and_web():
+    items = (
+        trace_items(["step one", "step two"])
+        + memory_items("- [Git] Use git status (score: 0.70)")
+        + web_items("- Result A (https://a): snippet\n- Result B (https://b): snippet")
+    )
+    packer = ContextPacker(11, token_counter=_word_counter)
+
+    packed = packer.pack(items)
+
+    assert packed.items("trace") == ["step one", "step two"]
+    assert packed.text("memory") == "- [Git] Use git status (score: 0.70)"
+    assert packed.items("web") == []
+    assert packed.tokens <= 11
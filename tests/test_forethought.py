@@ -1,35 +1,85 @@
-"""Tests for the forethought helper logic."""
+"""Tests for forethought's similarity-driven research routing."""
 from __future__ import annotations
 
-from srl_agents.nodes.forethought import _should_research
+from benchmarks.fakes import HashingEmbedder
+from benchmarks.research_eval import (
+    evaluate_router,
+    legacy_should_research,
+    load_fixture,
+    policy_router,
+    retrieve_cases,
+)
+from srl_agents.memory import Retrieval
+from srl_agents.nodes.forethought import build_forethought_node
+from srl_agents.research_policy import ResearchPolicy
 from srl_agents.state import LearningContext
 
 
-def test_should_research_when_no_memories():
-    context = LearningContext(
-        learning_goal="Understand git cleanup",
-        success_criteria="I can explain the correct command",
-        prior_knowledge="Knows git basics",
+def _context(success_criteria: str = "I can explain the correct command") -> LearningContext:
+    return LearningContext(
+        learning_goal="Understand git cleanup", success_criteria=success_criteria, prior_knowledge="Knows git basics"
     )
 
-    assert _should_research("No relevant past experience.", context) is True
 
+def test_research_when_memories_are_missing_or_weak():
+    policy = ResearchPolicy(min_similarity=0.5)
 
-def test_should_research_when_success_criteria_requires_fresh_data():
-    context = LearningContext(
-        learning_goal="Track the latest numpy version",
-        success_criteria="I cite the latest current release",
-        prior_knowledge="Understands pip",
-    )
+    assert policy.decide([], _context()).reason == "no_memories"
+    weak = policy.decide([({"topic": "Git", "insight": "Use git status"}, "doc", 0.31)], _context())
+    assert weak.needs_research and weak.reason == "weak_match" and weak.top_similarity == 0.31
 
-    assert _should_research("- [Python] Some cached tip", context) is True
 
+def test_strong_match_skips_research_unless_low_impact():
+    policy = ResearchPolicy(min_similarity=0.5, min_impact=2)
+    strong = ({"topic": "Git", "insight": "Use git reset --hard", "impact_score": 4}, "doc", 0.72)
+    low = ({"topic": "Git", "insight": "Try git stash", "impact_score": 1}, "doc", 0.7)
+    legacy = ({"topic": "Git", "insight": "Use git status"}, "doc", 0.6)
 
-def test_should_not_research_when_memories_suffice():
-    context = LearningContext(
-        learning_goal="Handle git resets",
-        success_criteria="I can run reset safely",
-        prior_knowledge="Some CLI knowledge",
-    )
+    decision = policy.decide([strong, low], _context())
+    assert not decision.needs_research and decision.reason == "strong_match" and decision.top_impact == 4
+    assert policy.decide([low], _context()).reason == "low_impact"
+    assert not policy.decide([low, legacy], _context()).needs_research  # unscored memories are trusted
+
+
+def test_time_sensitive_goals_need_a_near_duplicate_memory():
+    policy = ResearchPolicy(min_similarity=0.5, fresh_similarity=0.8)
+    fresh = _context("I cite the latest current release")
+    hit = ({"topic": "Python", "insight": "Check python.org for releases", "impact_score": 3}, "doc", 0.65)
+
+    assert policy.decide([hit], fresh).reason == "stale_match"
+    assert policy.decide([hit[:2] + (0.9,)], fresh).reason == "fresh_match"
+
+
+def test_node_routes_on_retrieved_scores():
+    class Store:
+        def retrieve(self, query, *, refined_query=None):
+            hit = ({"topic": "Git", "insight": "Use git reset --hard"}, "doc", 0.4)
+            return Retrieval("- [Git] Use git reset --hard (score: 0.40)", (hit,))
+
+    state = {"query": "How do I reset git?", "learning_context": _context()}
+
+    assert build_forethought_node(Store(), policy=ResearchPolicy(min_similarity=0.5))(state)["needs_research"]
+    assert not build_forethought_node(Store(), policy=ResearchPolicy(min_similarity=0.35))(state)["needs_research"]
+
+
+def test_node_passes_on_the_refined_query_it_searched_with():
+    class Store:
+        def retrieve(self, query, *, refined_query=None):
+            return Retrieval("No relevant past experience.", refined_query=refined_query or f"{query} in git")
+
+    node = build_forethought_node(Store())
+
+    assert node({"query": "How do I reset?"})["refined_query"] == "How do I reset? in git"
+    assert node({"query": "How do I reset?", "refined_query": "git reset"})["refined_query"] == "git reset"
+
+
+def test_research_eval_policy_beats_keyword_heuristic_offline():
+    retrieved = retrieve_cases(load_fixture(), HashingEmbedder())
+
+    legacy = evaluate_router(legacy_should_research, retrieved)
+    policy = evaluate_router(policy_router(ResearchPolicy(min_similarity=0.4, fresh_similarity=0.7)), retrieved)
 
-    assert _should_research("- [Git] Use git status", context) is False
+    assert policy["cases"] == legacy["cases"] == len(load_fixture()["cases"])
+    assert policy["accuracy"] > legacy["accuracy"]
+    assert policy["missed_searches"] < legacy["missed_searches"]
+    assert policy["unnecessary_searches"] <= legacy["unnecessary_searches"]
@@ -0,0 +1,142 @@
+"""Shared keep-alive OpenAI transport against a local stub of the API."""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from srl_agents.http_transport import TransportSettings, build_async_http_client, build_http_client
+
+
+class _StubOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.connections.add(self.client_address)
+        time.sleep(self.server.delay)
+        if self.path.endswith("/embeddings"):
+            payload = {
+                "object": "list",
+                "model": body["model"],
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": [0.1, 0.2, 0.3]}
+                    for i in range(len(body["input"]))
+                ],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+        else:
+            payload = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}
+                ],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4},
+            }
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOpenAIHandler)
+    server.daemon_threads = True
+    server.connections = set()
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _clients(server, settings: TransportSettings | None = None):
+    settings = settings or TransportSettings()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    sync_client, async_client = build_http_client(settings), build_async_http_client(settings)
+    common = {
+        "api_key": "test",
+        "base_url": base_url,
+        "http_client": sync_client,
+        "http_async_client": async_client,
+        "request_timeout": settings.timeout,
+        "max_retries": 0,
+    }
+    llm = ChatOpenAI(model="stub", **common)
+    embeddings = OpenAIEmbeddings(model="stub-embed", check_embedding_ctx_length=False, **common)
+    return llm, embeddings
+
+
+def test_chat_and_embeddings_reuse_one_connection(stub_server):
+    llm, embeddings = _clients(stub_server)
+
+    for _ in range(3):
+        assert llm.invoke("hi").content == "ok"
+    assert embeddings.embed_query("hello") == [0.1, 0.2, 0.3]
+    assert len(embeddings.embed_documents(["a", "b"])) == 2
+
+    assert len(stub_server.connections) == 1
+
+
+def test_async_clients_share_pool(stub_server):
+    llm, embeddings = _clients(stub_server)
+
+    async def run():
+        for _ in range(3):
+            await llm.ainvoke("hi")
+        await embeddings.aembed_query("hello")
+
+    asyncio.run(run())
+    assert len(stub_server.connections) == 1
+
+
+def test_max_connections_caps_concurrent_connections(stub_server):
+    stub_server.delay = 0.05
+    _, embeddings = _clients(stub_server, TransportSettings(max_connections=2, max_keepalive_connections=2))
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        vectors = list(pool.map(embeddings.embed_query, [f"text {idx}" for idx in range(6)]))
+
+    assert vectors == [[0.1, 0.2, 0.3]] * 6
+    assert len(stub_server.connections) == 2
+
+
+def test_settings_map_to_client_timeouts():
+    settings = TransportSettings(read_timeout=12)
+
+    client = build_http_client(settings)
+
+    assert client.timeout.read == 12
+    assert client.timeout.connect == settings.connect_timeout
+
+
+def test_http2_falls_back_without_h2(monkeypatch, stub_server):
+    warnings = []
+    monkeypatch.setattr("srl_agents.http_transport.http2_available", lambda: False)
+    monkeypatch.setattr(
+        "srl_agents.http_transport.logger.warning", lambda event, *args, **kwargs: warnings.append(event)
+    )
+
+    client = build_http_client(TransportSettings(http2=True))
+    response = client.post(
+        f"http://127.0.0.1:{stub_server.server_address[1]}/v1/embeddings", json={"model": "stub", "input": ["a"]}
+    )
+
+    assert response.status_code == 200 and response.http_version == "HTTP/1.1"
+    assert warnings == ["http.http2_unavailable"]
@@ -0,0 +1,100 @@
+"""Tests for per-node profiling."""
+from __future__ import annotations
+
+import json
+from typing import TypedDict
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+
+from srl_agents.instrumentation import Profiler, timed
+
+
+class _State(TypedDict, total=False):
+    query: str
+    answer: str
+
+
+def _build_graph(profiler: Profiler, llm):
+    def lookup(state: _State):
+        with timed("chroma_query"):
+            pass
+        with timed("embedding"):
+            pass
+        return {}
+
+    def answer(state: _State):
+        return {"answer": llm.invoke(state["query"]).content}
+
+    workflow = StateGraph(_State)
+    workflow.add_node("lookup", profiler.wrap_node("lookup", lookup))
+    workflow.add_node("answer", profiler.wrap_node("answer", answer))
+    workflow.add_edge(START, "lookup")
+    workflow.add_edge("lookup", "answer")
+    workflow.add_edge("answer", END)
+    return workflow.compile()
+
+
+def _fake_llm():
+    message = AIMessage(
+        content="done",
+        usage_metadata={"input_tokens": 12, "output_tokens": 5, "total_tokens": 17},
+    )
+    return GenericFakeChatModel(messages=iter([message]))
+
+
+def test_profiler_records_node_timings_and_token_usage():
+    profiler = Profiler()
+    app = _build_graph(profiler, _fake_llm())
+
+    with profiler.run("scenario-1"):
+        app.invoke({"query": "hi"})
+
+    summary = {row["node"]: row for row in profiler.summary()}
+    assert summary["lookup"]["calls"] == 1
+    assert summary["lookup"]["chroma_query_calls"] == 1
+    assert summary["lookup"]["embedding_calls"] == 1
+    assert summary["lookup"]["llm_calls"] == 0
+    assert summary["answer"]["llm_calls"] == 1
+    assert summary["answer"]["input_tokens"] == 12
+    assert summary["answer"]["output_tokens"] == 5
+    assert {span.run for span in profiler.spans} == {"scenario-1"}
+
+
+def test_profiler_exports_trace_and_prometheus(tmp_path):
+    profiler = Profiler()
+    app = _build_graph(profiler, _fake_llm())
+    app.invoke({"query": "hi"})
+
+    trace_path = tmp_path / "trace.json"
+    profiler.write_trace(trace_path)
+    metrics = profiler.prometheus_text()
+
+    trace = json.loads(trace_path.read_text())
+    assert [span["node"] for span in trace["spans"]] == ["lookup", "answer"]
+    assert 'srl_llm_tokens_total{node="answer",direction="input"} 12' in metrics
+    assert 'srl_dependency_calls_total{node="lookup",dependency="chroma_query"} 1' in metrics
+
+
+def test_profiler_marks_failed_nodes():
+    profiler = Profiler()
+
+    def broken(state):
+        raise RuntimeError("critic timed out")
+
+    wrapped = profiler.wrap_node("critic", broken)
+
+    with pytest.raises(RuntimeError):
+        wrapped({})
+
+    assert profiler.spans[0].error == "RuntimeError: critic timed out"
+    assert profiler.summary()[0]["errors"] == 1
+
+
+def test_timed_is_noop_outside_profiled_nodes():
+    with timed("web_search"):
+        value = 1
+
+    assert value == 1
@@ -0,0 +1,169 @@
+"""Two-stage centroid index and its MemoryStore integration."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from chromadb import PersistentClient
+
+from benchmarks.fakes import HashingEmbedder
+from benchmarks.hnsw_sweep import exact_neighbours, synthetic_vectors
+from benchmarks.ivf_bench import bench_ivf
+from srl_agents.ivf_index import IVFIndex
+from srl_agents.memory import MemoryStore
+from srl_agents.state import ReflectionOutput
+from srl_agents.vector_index import HnswSettings
+
+
+def test_search_matches_exact_neighbours_when_probing_enough_clusters():
+    corpus, probes = synthetic_vectors(2000, 20, 32)
+    index = IVFIndex(n_clusters=20, nprobe=6)
+    index.build([str(idx) for idx in range(len(corpus))], corpus)
+
+    truth = exact_neighbours(corpus, probes, 3)
+    found = sum(
+        len(expected & {int(mem_id) for mem_id, _ in index.search(vector, 3)})
+        for vector, expected in zip(probes, truth)
+    )
+
+    assert len(index.centroids) == 20
+    assert found / (3 * len(probes)) > 0.9
+    assert index.search(probes[0], 3, nprobe=20)[0][1] <= 1.0
+
+
+def test_incremental_add_remove_and_rebuild_threshold():
+    rng = np.random.default_rng(1)
+    index = IVFIndex(n_clusters=4, rebuild_growth=0.5)
+    index.build([f"m{idx}" for idx in range(8)], rng.standard_normal((8, 8)))
+    vector = rng.standard_normal(8)
+
+    index.add("new", vector)
+    assert index.search(vector, 1, nprobe=4)[0][0] == "new"
+    assert not index.needs_rebuild
+
+    index.remove(["new"])
+    assert "new" not in {mem_id for mem_id, _ in index.search(vector, 9, nprobe=4)}
+    for idx in range(5):
+        index.add(f"extra{idx}", rng.standard_normal(8))
+    assert index.needs_rebuild
+
+
+def test_store_builds_persists_and_reloads_index(tmp_path):
+    def store():
+        return MemoryStore(
+            embedder=HashingEmbedder(),
+            client=PersistentClient(path=str(tmp_path / "chroma")),
+            min_similarity=None,
+            ivf=IVFIndex(n_clusters=2, nprobe=2, min_records=3, path=tmp_path / "ivf.npz"),
+        )
+
+    first = store()
+    for topic, insight in [
+        ("SQL", "Add an index on join columns"),
+        ("Git", "Use git reset --hard to restore a clean repository"),
+        ("Python", "Prefer pathlib over os.path"),
+    ]:
+        first.add(
+            ReflectionOutput(topic=topic, insight=insight, reasoning="", should_store=True, source_query=insight)
+        )
+    assert first.ivf.ready and (tmp_path / "ivf.npz").exists()
+
+    reopened = store()
+    result = reopened.search("restore git repository")
+
+    assert len(reopened.ivf) == 3
+    assert result.startswith("- [Git] Use git reset --hard")
+
+
+def test_search_after_reset_or_external_reset_falls_back_to_hnsw(tmp_path):
+    def store():
+        return MemoryStore(
+            embedder=HashingEmbedder(),
+            client=PersistentClient(path=str(tmp_path / "chroma")),
+            min_similarity=None,
+            ivf=IVFIndex(n_clusters=2, nprobe=2, min_records=3, path=tmp_path / "ivf.npz"),
+        )
+
+    first = store()
+    for idx in range(4):
+        first.add(
+            ReflectionOutput(
+                topic="SQL", insight=f"Index join column {idx}", reasoning="", should_store=True, source_query=""
+            )
+        )
+    assert first.ivf.ready
+    first.search("join column")
+
+    first.reset_memory()
+
+    assert not first.ivf.ready and not (tmp_path / "ivf.npz").exists()
+    assert first.search("join column") == "No relevant past experience."
+
+    # Centroids persisted by one process over a collection another process emptied.
+    first.ivf.centroids = np.eye(2, HashingEmbedder().dimensions, dtype=np.float32)
+    first.ivf.save()
+    assert store().search("join column") == "No relevant past experience."
+
+
+def test_search_picks_up_memories_written_and_deleted_by_another_process(tmp_path, monkeypatch):
+    monkeypatch.setattr("srl_agents.memory._COUNT_TTL_SECONDS", 0.0)
+
+    def store():
+        return MemoryStore(
+            embedder=HashingEmbedder(),
+            client=PersistentClient(path=str(tmp_path / "chroma")),
+            min_similarity=None,
+            ivf=IVFIndex(n_clusters=2, nprobe=2, min_records=3, rebuild_growth=100, path=tmp_path / "ivf.npz"),
+        )
+
+    def reflection(topic: str, insight: str) -> ReflectionOutput:
+        return ReflectionOutput(topic=topic, insight=insight, reasoning="", should_store=True, source_query=insight)
+
+    server, batch_job = store(), store()
+    assert server.ivf is not None
+    for idx in range(3):
+        server.add(reflection("SQL", f"Index join column {idx}"))
+    assert server.ivf.ready
+
+    # Same count afterwards, so only the shared write generation reveals the change.
+    batch_job.add(reflection("Git", "Use git reset --hard to restore a clean repository"))
+    batch_job.delete_memory(server.list_memories(limit=1)[0].get("id", ""))
+
+    assert server.search("restore git repository").startswith("- [Git] Use git reset --hard")
+    assert server.ivf.ids() == {record.get("id") for record in server.list_memories()}
+
+
+class _ScaledEmbedder(HashingEmbedder):
+    """Embeddings that are not unit length, where L2 and cosine similarity differ."""
+
+    def _embed(self, text: str) -> list[float]:
+        return [3.0 * value for value in super()._embed(text)]
+
+
+def test_ivf_scores_match_the_hnsw_path_in_an_l2_collection(tmp_path):
+    def store(name: str, ivf: IVFIndex | None) -> MemoryStore:
+        return MemoryStore(
+            embedder=_ScaledEmbedder(64),
+            client=PersistentClient(path=str(tmp_path / name)),
+            min_similarity=None,
+            hnsw=HnswSettings(space="l2"),
+            ivf=ivf,
+        )
+
+    flat, indexed = store("flat", None), store("ivf", IVFIndex(n_clusters=1, nprobe=1, min_records=1))
+    for memory in (flat, indexed):
+        for insight in ("Add an index on join columns", "Prefer pathlib over os.path"):
+            memory.add(ReflectionOutput(topic="Tips", insight=insight, reasoning="", should_store=True))
+    assert indexed.ivf is not None and indexed.ivf.ready
+
+    expected = [score for _, _, score in flat.retrieve("index join columns").hits]
+    found = [score or 0.0 for _, _, score in indexed.retrieve("index join columns").hits]
+
+    assert found == pytest.approx(expected, abs=1e-4)
+    assert found[0] < 0.9  # 1 - d / 2 on scaled vectors, not their cosine
+
+
+def test_ivf_benchmark_reports_recall_against_flat():
+    result = bench_ivf(size=1000, queries=10, dimensions=16, nprobe_values=(32,), hnsw=False)
+
+    assert result["flat"]["recall_at_3"] == 1.0
+    assert result["ivf"]["32"]["recall_at_3"] == 1.0
@@ -0,0 +1,39 @@
+"""Tests for the learning context node, including fused search-query extraction."""
+from __future__ import annotations
+
+from benchmarks.fakes import FakeChatModel
+from srl_agents.memory import Retrieval
+from srl_agents.nodes.forethought import build_forethought_node
+from srl_agents.nodes.learning_context import build_learning_context_node
+from srl_agents.state import LearningContext
+
+
+class RecordingStore:
+    def __init__(self):
+        self.calls = []
+
+    def retrieve(self, query, *, refined_query=None):
+        self.calls.append((query, refined_query))
+        return Retrieval("No relevant past experience.")
+
+
+def test_default_mode_returns_only_learning_context():
+    node = build_learning_context_node(FakeChatModel())
+
+    update = node({"query": "How do I reset git?"})
+
+    assert type(update["learning_context"]) is LearningContext
+    assert "refined_query" not in update
+
+
+def test_fused_mode_feeds_search_query_to_forethought():
+    node = build_learning_context_node(FakeChatModel(), fused=True)
+    store = RecordingStore()
+
+    update = node({"query": "How do I reset git?"})
+    build_forethought_node(store)({"query": "How do I reset git?", **update})
+
+    # Plain LearningContext keeps checkpoints and downstream prompts unchanged.
+    assert type(update["learning_context"]) is LearningContext
+    assert update["refined_query"]
+    assert store.calls == [("How do I reset git?", update["refined_query"])]
@@ -0,0 +1,58 @@
+"""Tests for the SQLite-backed LLM response cache."""
+from __future__ import annotations
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from srl_agents.llm_cache import SQLiteLLMCache
+
+
+def _generation(text: str) -> list[ChatGeneration]:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def test_lookup_round_trips_generations(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "cache.sqlite")
+
+    assert cache.lookup("prompt", "model-a") is None
+    cache.update("prompt", "model-a", _generation("cached answer"))
+
+    hit = cache.lookup("prompt", "model-a")
+    assert hit is not None
+    assert hit[0].message.content == "cached answer"
+    assert cache.lookup("prompt", "model-b") is None
+    stats = cache.stats()
+    assert (stats.entries, stats.hits, stats.misses) == (1, 1, 2)
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    SQLiteLLMCache(path).update("prompt", "model", _generation("persisted"))
+
+    reopened = SQLiteLLMCache(path)
+
+    assert reopened.lookup("prompt", "model")[0].message.content == "persisted"
+
+
+def test_max_entries_evicts_least_recently_used(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "cache.sqlite", max_entries=2)
+    cache.update("first", "model", _generation("1"))
+    cache.update("second", "model", _generation("2"))
+    cache.lookup("first", "model")
+    cache.update("third", "model", _generation("3"))
+
+    assert cache.lookup("second", "model") is None
+    assert cache.lookup("first", "model") is not None
+    assert cache.stats().entries == 2
+
+
+def test_chat_model_skips_call_on_cache_hit(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "cache.sqlite")
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="only once")]), cache=cache)
+
+    first = model.invoke("same prompt")
+    second = model.invoke("same prompt")
+
+    assert first.content == second.content == "only once"
+    assert cache.stats().hits == 1
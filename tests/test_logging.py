@@ -0,0 +1,91 @@
+"""Tests for leveled logging sinks."""
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from srl_agents.logging import DEBUG, INFO, WARNING, JsonLineSink, Logger, configure_logging, logger
+
+
+def _records(buffer: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in buffer.getvalue().splitlines()]
+
+
+def test_json_sink_writes_structured_records_after_flush():
+    buffer = io.StringIO()
+    sink = JsonLineSink(buffer, flush_interval=0.01)
+    log = Logger(INFO, [sink])
+
+    log.rule("3. Actor")
+    log.info("actor.answer", "Use git stash", style="green", thoughts=2)
+    sink.flush()
+
+    stage, answer = _records(buffer)
+    assert stage["event"] == "stage" and stage["message"] == "3. Actor"
+    assert answer["level"] == "INFO"
+    assert answer["event"] == "actor.answer"
+    assert answer["message"] == "Use git stash"
+    assert answer["thoughts"] == 2
+    assert "style" not in answer
+    sink.close()
+
+
+def test_logger_filters_below_level():
+    buffer = io.StringIO()
+    sink = JsonLineSink(buffer, flush_interval=0.01)
+    log = Logger(WARNING, [sink])
+
+    log.debug("memory.refined", "dropped")
+    log.info("forethought.memories", "dropped")
+    log.warning("web_search.failed", "kept")
+    sink.close()
+
+    assert [record["event"] for record in _records(buffer)] == ["web_search.failed"]
+    assert log.is_enabled(DEBUG) is False
+
+
+def test_json_sink_drops_instead_of_blocking_when_queue_full():
+    class SlowStream(io.StringIO):
+        def write(self, text):
+            import time
+
+            time.sleep(0.05)
+            return super().write(text)
+
+    sink = JsonLineSink(SlowStream(), max_queue=1, flush_interval=0.01)
+    log = Logger(INFO, [sink])
+
+    for idx in range(50):
+        log.info("burst", str(idx))
+    sink.close()
+
+    assert sink.dropped > 0
+
+
+def test_configure_logging_none_sink_disables_output():
+    try:
+        configured = configure_logging(sink="none")
+        assert configured is logger
+        assert logger.sinks == []
+        assert logger.is_enabled(WARNING) is False
+        with pytest.raises(ValueError):
+            configure_logging(sink="syslog")
+    finally:
+        configure_logging()
+
+
+def test_json_sink_starts_writer_on_first_record(tmp_path):
+    path = tmp_path / "events.jsonl"
+    try:
+        configure_logging(sink="json", level="INFO", path=str(path))
+        assert not path.exists()
+        assert logger.sinks[0]._thread is None
+
+        logger.info("actor.answer", "Use git stash")
+        logger.flush()
+
+        assert json.loads(path.read_text())["event"] == "actor.answer"
+    finally:
+        configure_logging()
@@ -1,8 +1,11 @@
 """Unit tests for the in-memory Chroma adapter."""
 from __future__ import annotations
 
-from srl_agents.memory import MemoryStore
+import pytest
+
+from srl_agents.memory import MemoryStore, content_id
 from srl_agents.state import ReflectionOutput
+from srl_agents.vector_index import HnswSettings, distance_to_similarity
 
 
 class DummyEmbedder:
@@ -49,7 +52,8 @@ class FakeCollection:
         self.items = [item for item in self.items if item["id"] not in ids]
         return before - len(self.items)
 
-    def add(self, *, ids, embeddings=None, metadatas=None, documents=None):
+    def upsert(self, *, ids, embeddings=None, metadatas=None, documents=None):
+        self.items = [item for item in self.items if item["id"] not in ids]
         for idx, metadata, document in zip(ids, metadatas or [], documents or []):
             self.items.append({"id": idx, "metadata": metadata, "document": document})
 
@@ -58,7 +62,8 @@ class FakeClient:
     def __init__(self, collection):
         self.collection = collection
 
-    def get_or_create_collection(self, name: str):
+    def get_or_create_collection(self, name: str, **kwargs):
+        self.kwargs = kwargs
         return self.collection
 
 
@@ -183,9 +188,30 @@ def test_search_uses_refined_query_for_embedding():
         query_refiner=lambda q: f"{q} refined",
     )
 
-    store.search("initial question")
+    retrieval = store.retrieve("initial question")
 
     assert embedder.last_query == "initial question refined"
+    assert retrieval.refined_query == "initial question refined"
+
+
+def test_search_with_precomputed_refinement_skips_refiner():
+    embedder = DummyEmbedder()
+    collection = FakeCollection(
+        {
+            "metadatas": [[{"topic": "General", "insight": "Practice estimation"}]],
+            "documents": [["General doc"]],
+            "distances": [[0.2]],
+        }
+    )
+
+    def refiner(text):
+        raise AssertionError("refiner should not run when a refined query is supplied")
+
+    store = MemoryStore(embedder=embedder, client=FakeClient(collection), query_refiner=refiner)
+
+    store.search("initial question", refined_query="estimation practice")
+
+    assert embedder.last_query == "estimation practice"
 
 
 def test_add_uses_same_refiner_path_as_search():
@@ -294,6 +320,38 @@ def test_add_memory_with_empty_reasoning():
     assert memories[0]["reasoning"] == ""
 
 
+def test_repeated_reflections_keep_one_content_addressed_record():
+    embedder = DummyEmbedder()
+    embedder.embed_documents = lambda texts: [[0.0] for _ in texts]
+    refined = []
+    collection = FakeCollection()
+    store = MemoryStore(
+        embedder=embedder,
+        client=FakeClient(collection),
+        query_refiner=lambda text: refined.append(text) or text,
+    )
+    reflection = ReflectionOutput(
+        topic="Git",
+        insight="Stash before switching branches",
+        reasoning="Keeps work in progress safe",
+        should_store=True,
+        source_query="How do I switch branches?",
+    )
+    replay = reflection.model_copy(update={"insight": "stash  before switching   branches"})
+    other = reflection.model_copy(update={"insight": "Commit before rebasing"})
+
+    store.add(reflection)
+    store.add(replay)
+    written = store.add_many([replay, other, other])
+
+    assert written == 1
+    assert len(refined) == 2  # the duplicates were skipped before refinement and embedding
+    assert [item["id"] for item in collection.items] == [
+        content_id("Git. Stash before switching branches. Keeps work in progress safe. How do I switch branches?"),
+        content_id("Git. Commit before rebasing. Keeps work in progress safe. How do I switch branches?"),
+    ]
+
+
 def test_search_finds_relevant_added_memory():
     """Test that searching finds memories that were previously added."""
     embedder = DummyEmbedder()
@@ -431,3 +489,34 @@ def test_add_and_search_integration():
     assert "Testing" in result
     assert "Write tests before fixing bugs" in result
     assert "0.85" in result  # similarity = 1 - 0.15 = 0.85
+
+
+def test_new_collection_uses_configured_hnsw_settings(tmp_path):
+    from chromadb import PersistentClient
+
+    settings = HnswSettings(space="cosine", max_neighbors=32, ef_construction=200, ef_search=40)
+    store = MemoryStore(embedder=None, client=PersistentClient(path=str(tmp_path)), hnsw=settings)
+
+    hnsw = store.collection.configuration["hnsw"]
+    assert hnsw["space"] == "cosine"
+    assert (hnsw["max_neighbors"], hnsw["ef_construction"], hnsw["ef_search"]) == (32, 200, 40)
+    assert store.space == "cosine"
+
+
+def test_existing_l2_collection_keeps_its_space_and_scores_accordingly(tmp_path, monkeypatch):
+    from chromadb import PersistentClient
+
+    client = PersistentClient(path=str(tmp_path))
+    client.get_or_create_collection("srl-memory")  # Chroma default: L2 space, ef_search 100
+    warnings = []
+    monkeypatch.setattr("srl_agents.memory.logger.warning", lambda event, *args, **kwargs: warnings.append(event))
+
+    store = MemoryStore(embedder=None, client=client, hnsw=HnswSettings(ef_search=30))
+
+    assert store.space == "l2"
+    assert warnings == ["memory.hnsw_mismatch"]
+    assert store.collection.configuration["hnsw"]["ef_search"] == 30
+    # Unit vectors at cosine 0.9 are 0.2 apart in squared L2.
+    assert distance_to_similarity(0.2, store.space) == pytest.approx(0.9)
+    assert distance_to_similarity(0.2, "cosine") == pytest.approx(0.8)
+    assert distance_to_similarity(None, "l2") is None
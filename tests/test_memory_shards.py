@@ -0,0 +1,108 @@
+"""Topic-sharded memory store against a real local Chroma client."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from chromadb import PersistentClient
+
+from benchmarks.fakes import HashingEmbedder
+from srl_agents.memory import MemoryStore
+from srl_agents.memory_shards import ShardedMemoryStore, topic_slug
+from srl_agents.state import ReflectionOutput
+
+
+def _reflection(topic: str, insight: str) -> ReflectionOutput:
+    return ReflectionOutput(topic=topic, insight=insight, reasoning="", should_store=True, source_query=insight)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ShardedMemoryStore(
+        embedder=HashingEmbedder(),
+        client=PersistentClient(path=str(tmp_path)),
+        route_shards=1,
+        min_similarity=None,
+    )
+    store.add(_reflection("SQL", "Add an index on join columns of large tables"))
+    store.add(_reflection("SQL", "Read the query plan before rewriting a slow join"))
+    store.add(_reflection("Git", "Use git reset --hard to restore a clean repository"))
+    return store
+
+
+def test_topic_slug_is_collection_safe_and_collision_free():
+    assert topic_slug("Git / Version Control").startswith("git-version-control-")
+    assert topic_slug("  ") == topic_slug(None) == topic_slug("General")
+    assert len(topic_slug("x" * 200)) == 49
+    assert len({topic_slug("C"), topic_slug("C++"), topic_slug("C#")}) == 3
+
+
+def test_topics_that_slug_alike_keep_separate_shards(tmp_path):
+    store = ShardedMemoryStore(
+        embedder=HashingEmbedder(), client=PersistentClient(path=str(tmp_path)), min_similarity=None
+    )
+    for topic in ("C", "C++", "C#"):
+        store.add(_reflection(topic, f"Compile {topic} with warnings enabled"))
+
+    assert sorted(row["topic"] for row in store.topics()) == ["C", "C#", "C++"]
+    assert store.reset_memory(topic="C#") == 1
+    assert sorted(row["topic"] for row in store.topics()) == ["C", "C++"]
+
+
+def test_migrate_legacy_moves_unsharded_memories_into_shards(tmp_path):
+    client = PersistentClient(path=str(tmp_path))
+    legacy = MemoryStore(embedder=HashingEmbedder(), client=client, min_similarity=None)
+    legacy.add(_reflection("SQL", "Add an index on join columns of large tables"))
+    legacy.add(_reflection("Git", "Use git reset --hard to restore a clean repository"))
+    ids = {row["id"] for row in legacy.list_memories()}
+
+    store = ShardedMemoryStore(embedder=HashingEmbedder(), client=client, min_similarity=None)
+
+    assert store.migrate_legacy(batch_size=1) == 2
+    assert {row["id"] for row in store.list_memories()} == ids
+    assert "srl-memory" not in {collection.name for collection in client.list_collections()}
+    assert store.search("restore git repository").startswith("- [Git] Use git reset --hard")
+    assert store.migrate_legacy() == 0
+
+
+def test_add_writes_to_topic_shards_and_search_routes(store):
+    assert {row["topic"]: row["count"] for row in store.topics()} == {"SQL": 2, "Git": 1}
+    assert store.client.get_collection(f"srl-memory-t-{topic_slug('SQL')}").count() == 2
+
+    result = store.search("restore my git repository to a clean state")
+
+    assert result.startswith("- [Git] Use git reset --hard")
+    assert "[SQL]" not in result  # only the closest shard was queried
+
+
+def test_delete_and_per_topic_reset_keep_routing_consistent(store):
+    git_id = next(row["id"] for row in store.list_memories() if row["topic"] == "Git")
+
+    assert store.delete_memory(git_id) is True
+    assert [row["topic"] for row in store.topics()] == ["SQL"]
+    assert f"srl-memory-t-{topic_slug('Git')}" not in {collection.name for collection in store.client.list_collections()}
+
+    assert store.reset_memory(topic="SQL") == 2
+    assert store.topics() == []
+    assert store.search("slow join") == "No relevant past experience."
+
+
+def test_bulk_writes_update_each_centroid_once_from_new_rows_only(store):
+    batches = list(store.export_batches())
+    ids = [mem_id for batch in batches for mem_id in batch["ids"]]
+    embeddings = np.vstack([np.asarray(batch["embeddings"]) for batch in batches])
+    documents = [doc for batch in batches for doc in batch["documents"]]
+    metadatas = [meta for batch in batches for meta in batch["metadatas"]]
+    extra = HashingEmbedder().embed_query("Squash fixup commits before merging")
+
+    store.bulk_add(
+        [*ids, "git-extra"],
+        np.vstack([embeddings, extra]),
+        [*documents, "Squash fixup commits before merging"],
+        [*metadatas, {"topic": "Git", "insight": "Squash fixup commits before merging"}],
+    )
+
+    assert {row["topic"]: row["count"] for row in store.topics()} == {"SQL": 2, "Git": 2}
+    git_shard = store.client.get_collection(f"srl-memory-t-{topic_slug('Git')}")
+    registry = store.collection.get(ids=[topic_slug("Git")], include=["embeddings"])
+    assert registry["embeddings"] is not None and git_shard.count() == 2
+    assert np.allclose(registry["embeddings"][0], np.mean(git_shard.get(include=["embeddings"])["embeddings"], axis=0))
@@ -0,0 +1,76 @@
+"""Per-node model tiers: config file, environment overrides and cached clients."""
+from __future__ import annotations
+
+import pytest
+
+from srl_agents import config
+from srl_agents.model_tiers import ModelSettings, load_model_config, resolve_model_settings
+
+DEFAULTS = ModelSettings(model="gpt-4o", temperature=0.0)
+
+
+def _write_config(tmp_path):
+    path = tmp_path / "models.toml"
+    path.write_text(
+        """
+[default]
+timeout = 45
+
+[nodes.critic]
+model = "gpt-4o-mini"
+timeout = 15
+
+[nodes.query_refiner]
+model = "gpt-4o-mini"
+temperature = 0.2
+""",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_file_tiers_override_defaults_per_node(tmp_path):
+    file_config = load_model_config(_write_config(tmp_path))
+
+    assert resolve_model_settings(None, DEFAULTS, file_config) == ModelSettings("gpt-4o", 0.0, 45.0)
+    assert resolve_model_settings("actor", DEFAULTS, file_config) == ModelSettings("gpt-4o", 0.0, 45.0)
+    assert resolve_model_settings("critic", DEFAULTS, file_config) == ModelSettings("gpt-4o-mini", 0.0, 15.0)
+    assert resolve_model_settings("query_refiner", DEFAULTS, file_config).temperature == 0.2
+
+
+def test_env_overrides_take_precedence_over_file(tmp_path):
+    file_config = load_model_config(_write_config(tmp_path))
+    environ = {"SRL_CRITIC_MODEL": "gpt-4.1-nano", "SRL_ACTOR_TEMPERATURE": "0.7", "SRL_ACTOR_TIMEOUT": "90"}
+
+    assert resolve_model_settings("critic", DEFAULTS, file_config, environ).model == "gpt-4.1-nano"
+    assert resolve_model_settings("actor", DEFAULTS, file_config, environ) == ModelSettings("gpt-4o", 0.7, 90.0)
+
+
+def test_unknown_nodes_are_rejected(tmp_path):
+    path = tmp_path / "bad.toml"
+    path.write_text('[nodes.critc]\nmodel = "gpt-4o-mini"\n', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="critc"):
+        load_model_config(path)
+    with pytest.raises(ValueError, match="critc"):
+        resolve_model_settings("critc", DEFAULTS)
+
+
+def test_get_llm_builds_one_client_per_distinct_tier(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("SRL_CRITIC_MODEL", "gpt-4o-mini")
+    monkeypatch.setenv("SRL_CRITIC_TIMEOUT", "12")
+    for cached in (config.get_llm, config.get_model_settings, config._build_llm):
+        cached.cache_clear()
+    try:
+        critic, actor, reflector = config.get_llm("critic"), config.get_llm("actor"), config.get_llm("reflector")
+
+        assert critic.model_name == "gpt-4o-mini"
+        assert critic.request_timeout.read == 12
+        assert actor.model_name == config.DEFAULT_MODEL
+        assert actor is reflector
+        assert critic is not actor
+        assert critic.http_client is actor.http_client
+    finally:
+        for cached in (config.get_llm, config.get_model_settings, config._build_llm):
+            cached.cache_clear()
@@ -0,0 +1,50 @@
+"""Rule-based local query refiner, refiner selection and the offline refiner evaluation."""
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.fakes import FakeChatModel, HashingEmbedder
+from benchmarks.refiner_eval import evaluate_refiner, load_fixture
+from srl_agents.query_refiner import LLMQueryRefiner, LocalQueryRefiner, build_query_refiner
+
+
+def test_local_refiner_keeps_errors_and_entities_first():
+    refined = LocalQueryRefiner()(
+        "Why does pandas raise KeyError: 'user_id' when I merge two DataFrames? The merge fails."
+    )
+
+    terms = refined.split()
+    assert terms[0] == "KeyError"
+    assert {"user_id", "DataFrames", "pandas", "merge"} <= set(terms)
+    assert terms.count("merge") == 1
+    assert not {"why", "does", "when", "the"} & {term.lower() for term in terms}
+
+
+def test_local_refiner_detects_multiword_error_patterns_once():
+    refined = LocalQueryRefiner()("I keep getting permission denied, permission denied when running docker compose")
+
+    assert refined.startswith("permission denied")
+    assert refined.count("permission") == 1
+    assert LocalQueryRefiner()("   ") == "   "
+    assert LocalQueryRefiner()("how do I") == "how do I"
+
+
+def test_build_query_refiner_selects_mode():
+    assert isinstance(build_query_refiner("local"), LocalQueryRefiner)
+    assert isinstance(build_query_refiner("LLM", FakeChatModel()), LLMQueryRefiner)
+    assert build_query_refiner("none") is None
+    with pytest.raises(ValueError):
+        build_query_refiner("llm")
+    with pytest.raises(ValueError):
+        build_query_refiner("regex")
+
+
+def test_refiner_eval_reports_hit_rates_offline():
+    fixture = load_fixture()
+
+    baseline = evaluate_refiner(None, HashingEmbedder(), fixture)
+    local = evaluate_refiner(LocalQueryRefiner(), HashingEmbedder(), fixture)
+
+    assert baseline["queries"] == len(fixture["queries"])
+    assert baseline["refine_mean_ms"] == 0.0
+    assert local["hit_at_3"] >= baseline["hit_at_3"]
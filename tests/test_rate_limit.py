@@ -0,0 +1,134 @@
+"""Tests for the shared OpenAI rate limiter."""
+from __future__ import annotations
+
+import threading
+import time
+from uuid import uuid4
+
+import httpx
+import pytest
+from langchain_core.caches import InMemoryCache
+from langchain_core.language_models import FakeListChatModel
+
+from srl_agents.rate_limit import (
+    ChatRateLimiter,
+    Priority,
+    RateLimitCallbackHandler,
+    RateLimitedEmbeddings,
+    RateLimiter,
+    http_event_hooks,
+    priority,
+)
+
+
+def test_waiters_are_served_by_priority_class():
+    # 1200 rpm with a single-request bucket: one request every 50 ms.
+    limiter = RateLimiter(requests_per_minute=1200, burst_seconds=0.05)
+    limiter.acquire()
+    served: list[str] = []
+
+    def request(name: str, level: Priority) -> None:
+        limiter.acquire(level=level)
+        served.append(name)
+
+    background = threading.Thread(target=request, args=("critic", Priority.BACKGROUND))
+    actor = threading.Thread(target=request, args=("actor", Priority.ACTOR))
+    background.start()
+    time.sleep(0.01)
+    actor.start()
+    background.join(timeout=2)
+    actor.join(timeout=2)
+
+    assert served == ["actor", "critic"]
+    stats = limiter.stats()
+    assert stats["actor"]["requests"] == 1
+    assert stats["background"]["requests"] == 1
+    assert stats["background"]["max_wait_s"] > 0
+
+
+def test_priority_context_sets_default_level():
+    limiter = RateLimiter(requests_per_minute=6000)
+
+    with priority(Priority.BACKGROUND):
+        limiter.acquire()
+
+    assert limiter.stats()["background"]["requests"] == 1
+    assert limiter.stats()["interactive"]["requests"] == 0
+
+
+def test_throttle_halves_rate_and_pauses_requests():
+    limiter = RateLimiter(requests_per_minute=6000, base_backoff=0.1)
+
+    limiter.throttled()
+    waited = limiter.acquire()
+
+    assert limiter.rate_factor == 0.5
+    assert waited >= 0.08
+    limiter.succeeded()
+    assert limiter.rate_factor == pytest.approx(0.55)
+
+
+def test_token_budget_blocks_until_refilled():
+    # 60k tpm refills 1000 tokens per second; the burst bucket holds 100 tokens.
+    limiter = RateLimiter(tokens_per_minute=60_000, burst_seconds=0.1)
+
+    assert limiter.acquire(tokens=100) < 0.01
+    assert limiter.acquire(tokens=50) >= 0.04
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+
+class _ThrottledEmbedder:
+    def embed_query(self, text):
+        raise _RateLimitError("slow down")
+
+    def embed_documents(self, texts):
+        return [[0.0] for _ in texts]
+
+
+def test_rate_limited_embeddings_report_throttling():
+    limiter = RateLimiter(requests_per_minute=6000, base_backoff=0.01)
+    embeddings = RateLimitedEmbeddings(_ThrottledEmbedder(), limiter)
+
+    with pytest.raises(_RateLimitError):
+        embeddings.embed_query("hello")
+
+    assert limiter.throttle_events == 1
+    assert embeddings.embed_documents(["a", "b"]) == [[0.0], [0.0]]
+
+
+def test_cache_hits_are_not_reconciled_as_successes():
+    limiter = RateLimiter(requests_per_minute=6000, base_backoff=0.01)
+    model = FakeListChatModel(responses=["ok"], cache=InMemoryCache(), rate_limiter=ChatRateLimiter(limiter))
+    handler = RateLimitCallbackHandler(limiter)
+    limiter.throttled()
+
+    model.invoke("hello", config={"callbacks": [handler]})
+    assert limiter.rate_factor == pytest.approx(0.55)
+    model.invoke("hello", config={"callbacks": [handler]})
+
+    assert limiter.stats()["interactive"]["requests"] == 1
+    assert limiter.rate_factor == pytest.approx(0.55)
+
+
+def test_http_hooks_admit_sdk_retries_and_report_each_429_once():
+    limiter = RateLimiter(requests_per_minute=6000, base_backoff=0.01)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("x-stainless-retry-count") == "0":
+            return httpx.Response(429, headers={"retry-after": "0"})
+        return httpx.Response(200)
+
+    with httpx.Client(transport=httpx.MockTransport(handler), event_hooks=http_event_hooks(limiter)) as client:
+        first = client.get("https://api.test/", headers={"x-stainless-retry-count": "0"})
+        client.get("https://api.test/", headers={"x-stainless-retry-count": "1"})
+
+    # The SDK raises the final 429 with the same response; the callback must not count it again.
+    error = _RateLimitError("slow down")
+    error.response = first  # type: ignore[attr-defined]
+    RateLimitCallbackHandler(limiter).on_llm_error(error, run_id=uuid4())
+
+    assert limiter.throttle_events == 1
+    assert limiter.stats()["interactive"]["requests"] == 1
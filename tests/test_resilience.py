@@ -0,0 +1,104 @@
+"""Tests for web search deadlines, hedging and the circuit breaker."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from srl_agents.memory import Retrieval
+from srl_agents.nodes.forethought import build_forethought_node
+from srl_agents.tools.resilience import CircuitBreaker, DeadlineExceeded, call_with_deadline
+from srl_agents.tools.web_search import WebSearchTool
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowSession:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def text(self, query: str, *, max_results: int):
+        self.calls += 1
+        time.sleep(self.delay)
+        return [{"title": "Doc", "href": "https://example.com", "body": "Summary"}]
+
+
+def test_breaker_opens_after_failures_and_half_opens_after_cooldown():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow() and not breaker.allow()  # only one trial call
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_call_with_deadline_times_out_and_hedges():
+    with pytest.raises(DeadlineExceeded):
+        call_with_deadline(lambda: time.sleep(1), deadline=0.1)
+
+    # First attempt stalls, the hedged duplicate returns quickly.
+    attempts = []
+    lock = threading.Lock()
+
+    def flaky():
+        with lock:
+            attempts.append(len(attempts))
+            first = len(attempts) == 1
+        time.sleep(1.0 if first else 0.01)
+        return "first" if first else "hedge"
+
+    hedges = []
+    start = time.perf_counter()
+    result = call_with_deadline(flaky, deadline=0.8, hedge_after=0.05, on_hedge=lambda: hedges.append(1))
+
+    assert result == "hedge"
+    assert hedges == [1]
+    assert time.perf_counter() - start < 0.5
+
+
+def test_stalled_backend_costs_deadline_then_trips_breaker_for_forethought():
+    session = SlowSession(delay=1.0)
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=60)
+    tool = WebSearchTool(session_factory=lambda: session, deadline=0.05, breaker=breaker)
+
+    start = time.perf_counter()
+    assert tool.search("first") == []
+    assert tool.search("second") == []
+    assert time.perf_counter() - start < 0.5
+    assert not tool.available()
+
+    assert tool.search("third") == []
+    assert session.calls == 2  # open circuit short-circuits the backend
+
+    class Store:
+        def retrieve(self, query, *, refined_query=None):
+            return Retrieval("No relevant past experience.")
+
+    node = build_forethought_node(Store(), research_available=tool.available)
+    assert node({"query": "anything"})["needs_research"] is False
@@ -0,0 +1,68 @@
+"""Generation-invalidated retrieval cache in front of MemoryStore.search."""
+from __future__ import annotations
+
+from chromadb import PersistentClient
+
+from benchmarks.fakes import HashingEmbedder
+from srl_agents.memory import MemoryStore
+from srl_agents.retrieval_cache import RetrievalCache
+from srl_agents.state import ReflectionOutput
+
+
+def _reflection(topic: str, insight: str) -> ReflectionOutput:
+    return ReflectionOutput(topic=topic, insight=insight, reasoning="", should_store=True, source_query=insight)
+
+
+def _store(path, embedder) -> MemoryStore:
+    return MemoryStore(
+        embedder=embedder,
+        client=PersistentClient(path=str(path)),
+        min_similarity=None,
+        cache=RetrievalCache(max_entries=2),
+    )
+
+
+def test_repeated_search_skips_embedding_until_a_write(tmp_path):
+    embedder = HashingEmbedder()
+    store = _store(tmp_path / "chroma", embedder)
+    store.add(_reflection("Git", "Use git reset --hard to restore a clean repository"))
+    embedder.calls = 0
+
+    first = store.search("Restore git repository?")
+    assert store.search("restore  git repository") == first
+    assert embedder.calls == 1
+
+    store.add(_reflection("Git", "Use git stash before switching branches"))
+    store.search("restore git repository")
+    assert embedder.calls == 3  # the new reflection, then the query again
+
+    stats = store.cache.stats()
+    assert (stats.hits, stats.misses, stats.invalidations) == (1, 2, 2)
+
+
+def test_delete_and_reset_invalidate_cached_results(tmp_path):
+    store = _store(tmp_path / "chroma", HashingEmbedder())
+    store.add(_reflection("SQL", "Add an index on join columns"))
+    store.add(_reflection("Git", "Use git reset --hard to restore a clean repository"))
+
+    assert "[Git]" in store.search("restore git repository")
+    git_id = next(row["id"] for row in store.list_memories() if row["topic"] == "Git")
+    assert store.delete_memory(git_id)
+    assert "[Git]" not in store.search("restore git repository")
+
+    store.reset_memory()
+    assert store.search("restore git repository") == "No relevant past experience."
+
+
+def test_results_computed_across_a_write_are_not_cached():
+    cache = RetrievalCache(max_entries=2)
+    key = cache.key("Query", None, 3)
+    stale_generation = cache.generation
+    cache.invalidate()
+
+    cache.put(key, "stale", stale_generation)
+    assert cache.get(key) is None
+
+    for query in ("a", "b", "c"):
+        cache.put(cache.key(query), query, cache.generation)
+    assert cache.get(cache.key("a")) is None and cache.get(cache.key("c")) == "c"
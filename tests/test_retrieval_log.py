@@ -0,0 +1,73 @@
+"""Retrieval log, its summary statistics, and MemoryStore.stats."""
+from __future__ import annotations
+
+from chromadb import PersistentClient
+
+from benchmarks.fakes import HashingEmbedder
+from srl_agents.memory import MemoryStore
+from srl_agents.retrieval_cache import RetrievalCache
+from srl_agents.retrieval_log import RetrievalLog, summarize
+from srl_agents.state import ReflectionOutput
+
+
+def test_store_logs_each_retrieval_outcome(tmp_path):
+    log = RetrievalLog(tmp_path / "retrieval.jsonl")
+    store = MemoryStore(
+        embedder=HashingEmbedder(),
+        client=PersistentClient(path=str(tmp_path / "chroma")),
+        min_similarity=0.5,
+        cache=RetrievalCache(),
+        retrieval_log=log,
+    )
+    store.search("anything at all")
+    for topic, insight, impact in [
+        ("Git", "Use git reset --hard to restore a clean repository", 4),
+        ("Git", "Use git stash before switching branches", None),
+        ("SQL", "Add an index on join columns", 2),
+    ]:
+        store.add(
+            ReflectionOutput(topic=topic, insight=insight, reasoning="", should_store=True, source_query=insight),
+            impact_score=impact,
+        )
+    store.search("restore git repository clean")
+    store.search("restore  git repository clean")
+    store.search("write a haiku about autumn leaves")
+
+    records = log.read()
+    assert [record["outcome"] for record in records] == ["empty", "hit", "hit", "fallback"]
+    assert [record["cached"] for record in records] == [False, False, True, False]
+    assert len(records[1]["similarities"]) == 3
+
+    stats = store.stats()
+    assert (stats.records, stats.pending, stats.dimensions) == (3, 0, 384)
+    assert stats.topics == {"Git": 2, "SQL": 1}
+    assert stats.impact == {4: 1, None: 1, 2: 1}
+
+
+def test_summary_reports_percentiles_rates_and_histogram():
+    records = [
+        {"ts": 10.0 + idx, "ms": float(idx + 1), "cached": idx == 0, "outcome": outcome, "similarities": sims}
+        for idx, (outcome, sims) in enumerate(
+            [("hit", [0.82, 0.4]), ("hit", [0.61]), ("fallback", [0.22]), ("empty", []), ("hit", [1.0])]
+        )
+    ]
+
+    stats = summarize(records)
+
+    assert (stats.searches, stats.hits, stats.fallbacks, stats.empty, stats.cached) == (5, 3, 1, 1, 1)
+    assert stats.hit_rate == 0.6 and stats.fallback_rate == 0.2
+    assert stats.latency_ms == {"p50": 3.0, "p95": 5.0, "p99": 5.0}
+    assert stats.top_similarity[0.9] == 1 and stats.top_similarity[0.7] == 1 and stats.top_similarity[0.3] == 1
+    assert stats.top_similarity[1.0] == 1  # a perfect match lands in the last bucket
+    assert (stats.first_ts, stats.last_ts) == (10.0, 14.0)
+
+
+def test_log_compacts_to_the_newest_entries(tmp_path):
+    log = RetrievalLog(tmp_path / "retrieval.jsonl", max_entries=3)
+    for idx in range(7):
+        log.record(latency_ms=float(idx), outcome="hit", similarities=[0.9])
+
+    lines = (tmp_path / "retrieval.jsonl").read_text().splitlines()
+    assert len(lines) == 4  # compacted to 3 at the sixth record, then one more appended
+    assert [record["ms"] for record in log.read()] == [4.0, 5.0, 6.0]
+    assert RetrievalLog(tmp_path / "missing.jsonl").stats().searches == 0
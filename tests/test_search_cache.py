@@ -0,0 +1,90 @@
+"""Tests for the web search result cache."""
+from __future__ import annotations
+
+from srl_agents.tools.search_cache import WebSearchCache, is_time_sensitive
+from srl_agents.tools.web_search import WebSearchResult, WebSearchTool
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingSession:
+    def __init__(self, payload=None, fail=False):
+        self.payload = payload or [{"title": "Doc", "href": "https://example.com", "body": "Summary"}]
+        self.fail = fail
+        self.queries: list[str] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def text(self, query: str, *, max_results: int):
+        self.queries.append(query)
+        if self.fail:
+            raise RuntimeError("ratelimited")
+        return self.payload
+
+
+RESULT = [WebSearchResult(title="Doc", url="https://example.com", snippet="Summary")]
+
+
+def test_cache_normalizes_queries_and_honours_fresh_ttl():
+    clock = Clock()
+    cache = WebSearchCache(ttl_seconds=600, fresh_ttl_seconds=60, clock=clock)
+    cache.put("What is  Python packaging?", RESULT)
+
+    clock.now += 120
+    assert cache.get("what is python packaging") == RESULT
+    assert cache.get("what is python packaging", fresh=True) is None
+    clock.now += 600
+    assert cache.get("What is Python packaging?") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expired, stats.entries) == (1, 2, 2, 0)
+    assert is_time_sensitive("Cite the latest release") and not is_time_sensitive("Explain joins")
+
+
+def test_cache_evicts_least_recently_used():
+    cache = WebSearchCache(max_entries=2)
+    cache.put("a", RESULT)
+    cache.put("b", RESULT)
+    cache.get("a")
+    cache.put("c", RESULT)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == RESULT
+    assert cache.stats().evictions == 1
+
+
+def test_cache_persists_to_disk(tmp_path):
+    path = tmp_path / "web.sqlite"
+    WebSearchCache(path=path).put("git reset", RESULT)
+
+    reloaded = WebSearchCache(path=path)
+
+    assert reloaded.get("git reset") == RESULT
+
+
+def test_tool_serves_repeats_from_cache_and_skips_failures():
+    cache = WebSearchCache()
+    session = CountingSession()
+    tool = WebSearchTool(session_factory=lambda: session, cache=cache)
+
+    first = tool.search("python news")
+    second = tool.search("Python news?")
+
+    assert first == second
+    assert session.queries == ["python news"]
+
+    failing = CountingSession(fail=True)
+    flaky_tool = WebSearchTool(session_factory=lambda: failing, cache=cache)
+    assert flaky_tool.search("rust news") == []
+    assert flaky_tool.search("rust news") == []
+    assert failing.queries == ["rust news", "rust news"]
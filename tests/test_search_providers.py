@@ -0,0 +1,112 @@
+"""Tests for pluggable search providers and the async search path."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+from srl_agents.tools.providers import DuckDuckGoProvider, LocalIndexProvider, build_search_provider
+from srl_agents.tools.resilience import CircuitBreaker
+from srl_agents.tools.web_search import WebSearchTool
+
+DOCS = [
+    {
+        "title": "Git reset guide",
+        "url": "https://docs.example/git-reset",
+        "body": "Use git reset --hard to discard commits.",
+    },
+    {
+        "title": "SQL indexes",
+        "url": "https://docs.example/sql-index",
+        "body": "Add an index to speed up slow joins.",
+    },
+    {
+        "title": "Git stash",
+        "url": "https://docs.example/git-stash",
+        "body": "Stash uncommitted changes before switching branches.",
+    },
+]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _write_index(tmp_path):
+    path = tmp_path / "index.jsonl"
+    path.write_text("\n".join(json.dumps(doc) for doc in DOCS), encoding="utf-8")
+    return path
+
+
+def test_local_index_ranks_documents_with_bm25(tmp_path):
+    provider = LocalIndexProvider(_write_index(tmp_path))
+
+    hits = provider.search("how do I git reset my commits", max_results=2)
+
+    assert [hit["href"] for hit in hits] == ["https://docs.example/git-reset", "https://docs.example/git-stash"]
+    assert "reset" in hits[0]["body"]
+    assert provider.search("photosynthesis", max_results=3) == []
+
+
+def test_local_index_reads_markdown_directory(tmp_path):
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "notes" / "joins.md").write_text("# Slow SQL joins\nIndex the join columns.\n", encoding="utf-8")
+
+    hits = build_search_provider("local", local_index=tmp_path / "notes").search("sql join", max_results=5)
+
+    assert hits[0]["title"] == "Slow SQL joins"
+    assert hits[0]["href"].startswith("file://")
+
+
+def test_async_fan_out_keeps_event_loop_free(tmp_path):
+    class CountingProvider(LocalIndexProvider):
+        active = peak = 0
+
+        async def asearch(self, query, *, max_results):
+            CountingProvider.active += 1
+            CountingProvider.peak = max(CountingProvider.peak, CountingProvider.active)
+            try:
+                return await super().asearch(query, max_results=max_results)
+            finally:
+                CountingProvider.active -= 1
+
+    tool = WebSearchTool(provider=CountingProvider(_write_index(tmp_path), latency_ms=50))
+
+    results = asyncio.run(tool.asearch_many(["git reset", "sql index", "git stash"]))
+
+    assert len(results) == 3
+    assert CountingProvider.peak == 3  # all variants in flight at once, not one after another
+
+
+def test_cancelled_half_open_trial_releases_the_breaker(tmp_path):
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 30
+    tool = WebSearchTool(provider=LocalIndexProvider(_write_index(tmp_path), latency_ms=1000), breaker=breaker)
+
+    results = asyncio.run(tool.asearch_many(["git reset", "sql index"], timeout=0.1))
+
+    assert results == []
+    assert breaker.state == "half_open" and breaker.allow()
+
+
+def test_duckduckgo_adapter_runs_sessions_off_loop():
+    class Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def text(self, query, *, max_results):
+            return [{"title": query, "href": "https://example.com", "body": ""}]
+
+    tool = WebSearchTool(provider=DuckDuckGoProvider(lambda: Session()), deadline=1.0)
+
+    results = asyncio.run(tool.asearch("python news"))
+
+    assert [result.title for result in results] == ["python news"]
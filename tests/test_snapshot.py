@@ -0,0 +1,149 @@
+"""Binary memory snapshots: round-trip, memory-mapped reads, corruption checks and background restore."""
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+from chromadb import PersistentClient
+
+from benchmarks.fakes import HashingEmbedder
+from srl_agents.ivf_index import IVFIndex
+from srl_agents.memory import MemoryStore
+from srl_agents.snapshot import (
+    SnapshotBackfill,
+    SnapshotError,
+    load_snapshot,
+    restore_in_background,
+    restore_snapshot,
+    warm_start,
+    write_snapshot,
+)
+from srl_agents.state import ReflectionOutput
+
+
+def _store(path, **kwargs) -> MemoryStore:
+    return MemoryStore(
+        embedder=HashingEmbedder(64), client=PersistentClient(path=str(path)), min_similarity=None, **kwargs
+    )
+
+
+@pytest.fixture
+def source(tmp_path):
+    store = _store(tmp_path / "source")
+    for topic, insight, impact in [
+        ("SQL", "Add an index on join columns", 4),
+        ("Git", "Use git reset --hard to restore a clean repository", None),
+        ("Python", "Prefer pathlib over os.path", 3),
+    ]:
+        reflection = ReflectionOutput(
+            topic=topic, insight=insight, reasoning="", should_store=True, source_query=insight
+        )
+        store.add(reflection, impact_score=impact)
+    return store
+
+
+def test_snapshot_round_trip_preserves_records_and_search(source, tmp_path):
+    manifest = write_snapshot(source, tmp_path / "snap")
+    replica = _store(tmp_path / "replica", ivf=IVFIndex(n_clusters=2, nprobe=2, min_records=1))
+
+    assert manifest["count"] == 3 and manifest["dimensions"] == 64
+    assert restore_snapshot(replica, tmp_path / "snap") == 3
+
+    assert sorted(replica.list_memories(), key=lambda row: row.get("id", "")) == sorted(
+        source.list_memories(), key=lambda row: row.get("id", "")
+    )
+    assert replica.ivf is not None and replica.ivf.ready and len(replica.ivf) == 3
+    assert replica.search("restore git repository").startswith("- [Git] Use git reset --hard")
+
+
+def test_snapshot_is_memory_mapped_and_columnar(source, tmp_path):
+    write_snapshot(source, tmp_path / "snap", dtype="float16")
+
+    snapshot = load_snapshot(tmp_path / "snap")
+
+    assert isinstance(snapshot.embeddings, np.memmap)
+    assert snapshot.embeddings.dtype == np.float16 and snapshot.embeddings.shape == (3, 64)
+    by_topic = {meta["topic"]: meta for meta in snapshot.metadatas}
+    assert by_topic["SQL"]["impact_score"] == 4
+    assert "impact_score" not in by_topic["Git"]
+
+
+def test_restore_rejects_corrupt_snapshots_and_non_empty_stores(source, tmp_path):
+    write_snapshot(source, tmp_path / "snap")
+    with pytest.raises(SnapshotError, match="not empty"):
+        restore_snapshot(source, tmp_path / "snap")
+    assert restore_snapshot(source, tmp_path / "snap", replace=True) == 3
+
+    records = tmp_path / "snap" / "records.json"
+    records.write_text(records.read_text().replace("pathlib", "pathlab"))
+    with pytest.raises(SnapshotError, match="checksum"):
+        load_snapshot(tmp_path / "snap")
+    with pytest.raises(FileExistsError):
+        write_snapshot(source, tmp_path / "snap")
+
+
+def test_background_restore_is_searchable_before_backfill_finishes(source, tmp_path):
+    write_snapshot(source, tmp_path / "snap")
+    replica = _store(tmp_path / "replica", ivf=IVFIndex(n_clusters=2, nprobe=2, min_records=1))
+
+    backfill = restore_in_background(replica, tmp_path / "snap")
+    assert replica.search("restore git repository").startswith("- [Git] Use git reset --hard")
+
+    assert backfill.wait(timeout=30) and backfill.error is None
+    assert replica.overlays == [] and replica.collection.count() == 3
+    assert replica.ivf is not None and replica.ivf.ready and len(replica.ivf) == 3
+    assert replica.search("restore git repository").startswith("- [Git] Use git reset --hard")
+    with pytest.raises(SnapshotError, match="not empty"):
+        restore_in_background(replica, tmp_path / "snap")
+
+
+def test_interrupted_background_restore_resumes_from_its_marker(source, tmp_path, monkeypatch):
+    write_snapshot(source, tmp_path / "snap")
+    marker = tmp_path / "replica" / "snapshot-backfill.json"
+    replica = _store(tmp_path / "replica")
+    interrupted = SnapshotBackfill(replica, load_snapshot(tmp_path / "snap"), batch_size=2, marker=marker)
+    bulk_add = replica.bulk_add
+
+    def bulk_add_then_exit(*args, **kwargs) -> int:
+        interrupted.close()  # as the atexit hook would, between batches
+        return bulk_add(*args, **kwargs)
+
+    monkeypatch.setattr(replica, "bulk_add", bulk_add_then_exit)
+    assert interrupted.start().wait(timeout=30)
+    monkeypatch.undo()
+    assert replica.collection.count() == 2
+    assert json.loads(marker.read_text())["inserted"] == 2
+
+    restarted = _store(tmp_path / "replica")
+    backfill = warm_start(restarted, tmp_path / "snap", marker=marker)
+    assert backfill is not None and backfill.wait(timeout=30) and backfill.error is None
+
+    assert restarted.collection.count() == 3 and not marker.exists()
+    assert warm_start(restarted, tmp_path / "snap", marker=marker) is None
+
+
+def test_writes_during_a_bulk_load_are_still_indexed(source, tmp_path, monkeypatch):
+    replica = _store(tmp_path / "replica", ivf=IVFIndex(n_clusters=2, nprobe=2, min_records=1, rebuild_growth=100))
+    assert replica.ivf is not None
+    replica.add(ReflectionOutput(topic="Go", insight="Run go vet", reasoning="", should_store=True))
+    assert replica.ivf.ready
+    live = [ReflectionOutput(topic="Rust", insight="Run cargo clippy", reasoning="", should_store=True)]
+    write = replica._write
+
+    def write_then_add(
+        ids: list[str], embeddings: list, texts: list[str], metadatas: list[dict], *, index_ivf: bool = True
+    ) -> None:
+        # A live writer adding a reflection between bulk batches, as during a backfill.
+        write(ids, embeddings, texts, metadatas, index_ivf=index_ivf)
+        if not index_ivf and live:
+            replica.add(live.pop())
+
+    monkeypatch.setattr(replica, "_write", write_then_add)
+    batch = next(source.export_batches())
+
+    replica.bulk_add(
+        batch["ids"], np.asarray(batch["embeddings"]), batch["documents"], batch["metadatas"], fit_index=False
+    )
+
+    assert len(replica.ivf) == 2  # the live writes, not the bulk rows awaiting the final fit
@@ -1,7 +1,9 @@
 """Tests for the DuckDuckGo-backed web search tool."""
 from __future__ import annotations
 
-from srl_agents.tools.web_search import WebSearchResult, WebSearchTool
+import time
+
+from srl_agents.tools.web_search import WebSearchResult, WebSearchTool, normalize_url
 
 
 class DummySession:
@@ -58,3 +60,73 @@ def test_format_results_produces_bullets():
 
     assert summary.startswith("- Result A (https://a): ")
     assert summary.endswith("...")
+
+
+class KeyedSession:
+    """Returns per-query payloads, optionally sleeping to simulate a slow backend."""
+
+    def __init__(self, payloads, delays=None):
+        self.payloads = payloads
+        self.delays = delays or {}
+        self.queries: list[str] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def text(self, query: str, *, max_results: int):
+        self.queries.append(query)
+        time.sleep(self.delays.get(query, 0))
+        return self.payloads.get(query, [])
+
+
+def _hit(url: str, title: str = "Hit"):
+    return {"title": title, "href": url, "body": f"About {url}"}
+
+
+def test_search_many_dedupes_urls_and_ranks_by_frequency():
+    session = KeyedSession(
+        {
+            "git reset": [_hit("https://a.example/x"), _hit("https://www.b.example/docs/?utm_source=ddg")],
+            "undo git commit": [_hit("https://b.example/docs"), _hit("https://c.example")],
+            "Understand git history": [_hit("https://b.example/docs#intro"), _hit("https://a.example/x/")],
+        }
+    )
+    tool = WebSearchTool(session_factory=lambda: session)
+
+    results = tool.search_many(["git reset", "undo git commit", "Understand git history", "Git reset?"])
+
+    # b appears in all three variants, a in two, c in one.
+    assert [result.url for result in results] == [
+        "https://www.b.example/docs/?utm_source=ddg",
+        "https://a.example/x",
+        "https://c.example",
+    ]
+    assert sorted(session.queries) == ["Understand git history", "git reset", "undo git commit"]
+
+
+def test_normalize_url_strips_only_tracking_params():
+    assert normalize_url("https://x.example/p?ref=hn&utm_medium=x&fbclid=1&id=2") == "x.example/p?id=2"
+    assert normalize_url("https://x.example/p?reference=1") != normalize_url("https://x.example/p?reference=2")
+    assert normalize_url("https://x.example/p?refresh=1&ref_id=3") == "x.example/p?ref_id=3&refresh=1"
+
+
+def test_search_many_runs_concurrently_and_drops_slow_variants():
+    session = KeyedSession(
+        {
+            "fast one": [_hit("https://fast.example")],
+            "fast two": [_hit("https://two.example")],
+            "slow": [_hit("https://slow.example")],
+        },
+        delays={"fast one": 0.2, "fast two": 0.2, "slow": 2.0},
+    )
+    tool = WebSearchTool(session_factory=lambda: session)
+
+    start = time.perf_counter()
+    results = tool.search_many(["fast one", "fast two", "slow"], timeout=0.5)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5 + 0.2
+    assert {result.url for result in results} == {"https://fast.example", "https://two.example"}
@@ -0,0 +1,107 @@
+"""Write-behind buffering of MemoryStore.add: batching, read-your-writes and journal replay."""
+from __future__ import annotations
+
+import time
+
+from chromadb import PersistentClient
+
+from benchmarks.fakes import HashingEmbedder
+from srl_agents.memory import MemoryStore
+from srl_agents.state import ReflectionOutput
+from srl_agents.write_behind import PendingWrite, WriteBehindBuffer
+
+
+def _reflection(topic: str, insight: str) -> ReflectionOutput:
+    return ReflectionOutput(topic=topic, insight=insight, reasoning="", should_store=True, source_query=insight)
+
+
+def _store(path, buffer: WriteBehindBuffer, embedder=None) -> MemoryStore:
+    return MemoryStore(
+        embedder=embedder or HashingEmbedder(),
+        client=PersistentClient(path=str(path)),
+        min_similarity=None,
+        write_buffer=buffer,
+    )
+
+
+def test_adds_are_batched_and_visible_before_flush(tmp_path):
+    embedder = HashingEmbedder()
+    store = _store(tmp_path / "chroma", WriteBehindBuffer(max_batch=3, max_delay=60), embedder)
+
+    store.add(_reflection("Git", "Use git reset --hard to restore a clean repository"))
+    store.add(_reflection("SQL", "Add an index on join columns"))
+    embedder.calls = 0
+
+    assert store.collection.count() == 0
+    assert store.search("restore git repository").startswith("- [Git] Use git reset --hard")
+    assert embedder.calls == 2  # the query, plus one batch for both queued reflections
+
+    store.add(_reflection("Python", "Prefer pathlib over os.path"))
+
+    assert store.collection.count() == 3
+    assert embedder.calls == 3  # only the third reflection still needed an embedding
+    assert store.write_buffer is not None and store.write_buffer.pending() == []
+
+
+def test_time_threshold_flushes_in_background(tmp_path):
+    store = _store(tmp_path / "chroma", WriteBehindBuffer(max_batch=100, max_delay=0.05))
+
+    store.add(_reflection("SQL", "Read the query plan first"))
+    deadline = time.monotonic() + 5
+    while store.collection.count() == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert store.collection.count() == 1
+
+
+def test_journal_replays_unflushed_writes_once(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    crashed = WriteBehindBuffer(max_batch=100, max_delay=60, journal_path=journal)
+    metadata = {"topic": "SQL", "insight": "Add an index on join columns"}
+    crashed.append(PendingWrite("mem-1", "SQL. Add an index", "SQL. Add an index", metadata))
+    crashed.append(PendingWrite("mem-2", "Git. Reset hard", "Git. Reset hard", {"topic": "Git", "insight": "Reset"}))
+    # Simulate a crash after mem-1 reached Chroma but before the journal was rewritten.
+    client = PersistentClient(path=str(tmp_path / "chroma"))
+    client.get_or_create_collection("srl-memory").add(
+        ids=["mem-1"], embeddings=[HashingEmbedder().embed_query("SQL. Add an index")], metadatas=[metadata]
+    )
+
+    store = _store(tmp_path / "chroma", WriteBehindBuffer(max_batch=100, max_delay=60, journal_path=journal))
+
+    assert sorted(row.get("id", "") for row in store.list_memories()) == ["mem-1", "mem-2"]
+    assert journal.read_text() == ""
+
+
+def test_queued_duplicates_are_embedded_and_stored_once(tmp_path):
+    embedder = HashingEmbedder()
+    store = _store(tmp_path / "chroma", WriteBehindBuffer(max_batch=100, max_delay=60), embedder)
+    for _ in range(3):
+        store.add(_reflection("Git", "Use git reset --hard to restore a clean repository"))
+
+    assert store.flush() == 1
+    assert store.collection.count() == 1
+    assert embedder.calls == 1
+
+    store.add(_reflection("Git", "Use git reset --hard to restore a clean repository"))
+    assert store.flush() == 0
+    assert (store.collection.count(), embedder.calls) == (1, 1)
+
+
+def test_failed_flush_keeps_entries_for_retry(tmp_path):
+    buffer = WriteBehindBuffer(max_batch=100, max_delay=60, journal_path=tmp_path / "journal.jsonl")
+    attempts = []
+
+    def flaky(batch):
+        attempts.append(len(batch))
+        if len(attempts) == 1:
+            raise RuntimeError("database is locked")
+        return len(batch)
+
+    buffer.bind(flaky)
+    buffer.append(PendingWrite("a", "text", "text", {"topic": "T"}))
+
+    assert buffer.flush() == 0
+    assert len(buffer.pending()) == 1
+    assert buffer.flush() == 1
+    assert attempts == [1, 1]
+    assert buffer.pending() == []